@@ -1,11 +1,19 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import json
-from pathlib import Path
-import os
-import re
-from datetime import datetime
+from types import MappingProxyType
+
+from cache_policy import cache_stats, cached, release
+from competitor_graph import CompetitorGraph
+from figure_cache import FigureCache
+from keyword_index import DEFAULT_SEARCH_LIMIT, KeywordIndex
+from opportunity_scores import OPPORTUNITY_THRESHOLD
+from perf_trace import RerunProfiler, profiling_enabled, section_percentiles
+from table_view import DEFAULT_PAGE_SIZE, PAGE_SIZES, bar_limits, query_table
+from seo_report import keyword_table, oportunidades_table, ranking_table, top_concorrentes_table
+from seo_snapshot import Snapshot
+from seo_views import DashboardCube, ShardCatalog, dashboard_frame, fact_rows, take_labels
+from seo_watcher import LiveDataset
 
 # =========================
 # CONFIG
@@ -391,6 +399,9 @@ if "ui_theme" not in st.session_state:
 
 apply_theme(st.session_state.ui_theme)
 
+# Perfil do rerun: desligado por padrão (SEO_PROFILE=1 ou ?profile=1 na URL)
+prof = RerunProfiler(profiling_enabled(st.query_params.get("profile")))
+
 # =========================
 # UI HELPERS
 # =========================
@@ -429,9 +440,6 @@ def format_int_br(x):
     except Exception:
         return "0"
 
-def numeric(series):
-    return pd.to_numeric(series, errors="coerce").fillna(0)
-
 def futuristic_plotly(fig, theme_name: str, title=None):
     if theme_name == "Claro":
         fig.update_layout(
@@ -487,156 +495,117 @@ def futuristic_plotly(fig, theme_name: str, title=None):
         fig.update_yaxes(showgrid=True, gridcolor="rgba(234,240,255,0.10)", zeroline=False)
     return fig
 
-def download_csv_button(df: pd.DataFrame, filename: str, label: str, key: str):
-    csv = df.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label=label,
-        data=csv,
-        file_name=filename,
-        mime="text/csv",
-        use_container_width=True,
-        key=key,
-    )
+@cached("recursos")
+def load_figure_cache():
+    return FigureCache()
 
-def style_table(df: pd.DataFrame, gradient_cols=None, theme_name="Claro"):
-    gradient_cols = gradient_cols or []
-    sty = df.style
+def cached_figure(kind, df, build, theme_name=None):
+    # px.* + futuristic_plotly só rodam quando (kind, dados, tema) mudam
+    theme_name = theme_name or st.session_state.ui_theme
+    return load_figure_cache().get_or_build(kind, df, theme_name, lambda d: futuristic_plotly(build(d), theme_name))
 
-    # Hover row
-    sty = sty.set_table_styles(
-        [{"selector": "tbody tr:hover", "props": [("filter", "brightness(0.96)"), ("transition", "all .12s ease")]}],
-        overwrite=False,
-    )
+def show_chart(kind, df, build, theme_name=None):
+    with prof.section(f"grafico:{kind}"):
+        st.plotly_chart(cached_figure(kind, df, build, theme_name), use_container_width=True)
 
-    # Gradient cols
-    for c in gradient_cols:
-        if c in df.columns:
-            try:
-                sty = sty.background_gradient(subset=[c], cmap="Blues" if theme_name == "Claro" else "PuBuGn")
-            except Exception:
-                pass
+def download_csv_button(df: pd.DataFrame, filename: str, label: str, key: str):
+    # CSV gerado só no clique (callable), sem rerun do script
+    with prof.section(f"csv:{key}"):
+        st.download_button(
+            label=label,
+            data=lambda: df.to_csv(index=False).encode("utf-8"),
+            file_name=filename,
+            mime="text/csv",
+            use_container_width=True,
+            key=key,
+            on_click="ignore",
+        )
 
-    return sty
+@st.fragment
+def data_table(df: pd.DataFrame, key: str, bar_cols=None, search_cols=None, height=420, page_size=DEFAULT_PAGE_SIZE):
+    # Busca, ordenação e paginação no servidor: o navegador recebe só a página visível,
+    # com barras por coluna (column_config) em vez de CSS por célula
+    with prof.fragment(f"tabela:{key}"):
+        column_config = {
+            col: st.column_config.ProgressColumn(col, min_value=lo, max_value=hi, format=fmt)
+            for col, (lo, hi, fmt) in bar_limits(df, bar_cols or []).items()
+        }
+        if len(df) <= page_size and not search_cols:
+            st.dataframe(df, column_config=column_config, use_container_width=True, hide_index=True, height=height)
+            return
+
+        c1, c2, c3, c4 = st.columns([2.0, 1.6, 0.8, 0.9])
+        with c1:
+            search = st.text_input("Buscar", key=f"{key}_busca", placeholder="Filtrar linhas...") if search_cols else ""
+        with c2:
+            sort_by = st.selectbox("Ordenar por", ["—"] + list(df.columns), key=f"{key}_ordem")
+        with c3:
+            ascending = st.toggle("Crescente", key=f"{key}_asc")
+        with c4:
+            page_size = st.selectbox("Por página", PAGE_SIZES, index=PAGE_SIZES.index(page_size), key=f"{key}_tam")
+
+        page_key = f"{key}_pagina"
+        result = query_table(
+            df,
+            search=search,
+            search_cols=search_cols,
+            sort_by=None if sort_by == "—" else sort_by,
+            ascending=ascending,
+            page=st.session_state.get(page_key, 1),
+            page_size=page_size,
+        )
+        # Página fora do intervalo (ex.: após uma busca) volta para o limite válido
+        st.session_state[page_key] = result.page
+
+        st.dataframe(result.rows, column_config=column_config, use_container_width=True, hide_index=True, height=height)
+
+        c1, c2 = st.columns([0.8, 0.2])
+        with c1:
+            if result.total:
+                st.caption(f"Linhas {format_int_br(result.start + 1)}–{format_int_br(result.start + len(result.rows))} de {format_int_br(result.total)}")
+            else:
+                st.caption("Nenhuma linha encontrada.")
+        with c2:
+            st.number_input("Página", min_value=1, max_value=result.n_pages, step=1, key=page_key)
 
 # =========================
 # DATA EXTRACTION
 # =========================
-def extract_seo_metrics(json_path):
-    try:
-        with open(json_path, "r", encoding="utf-8") as file:
-            data = json.load(file)
-            conteudo = data.get("conteudo", "")
-
-            path_parts = str(Path(json_path)).split(os.sep)
-            grupo = path_parts[-3] if len(path_parts) > 2 else ""
-            marca = path_parts[-2] if len(path_parts) > 1 else ""
-
-            def extract_number(text):
-                numbers = re.findall(r"[\d,.]+", text)
-                if numbers:
-                    return float(numbers[0].replace(".", "").replace(",", "."))
-                return 0
-
-            metrics = {
-                "grupo": grupo.replace("grupo-", ""),
-                "marca": marca,
-                "dominio": "",
-                "trafego_organico": 0,
-                "trafego_pago": 0,
-                "palavras_chave_organicas": 0,
-                "palavras_chave_pagas": 0,
-                "backlinks": 0,
-                "dominos_referencia": 0,
-                "posicao_media": 0,
-                "ctr": 0,
-                "intencao_palavras_chave": {},
-                "distribuicao_paises": {},
-                "top_palavras": [],
-            }
-
-            domain_match = re.search(r"domínio: ([\w\.]+)", conteudo)
-            if domain_match:
-                metrics["dominio"] = domain_match.group(1)
-
-            for line in conteudo.split("\n"):
-                if "Tráfego estimado:" in line and "Resumo da Busca Orgânica" in conteudo.split(line)[0][-50:]:
-                    metrics["trafego_organico"] = extract_number(line)
-                elif "Palavras-chave orgânicas:" in line:
-                    metrics["palavras_chave_organicas"] = extract_number(line)
-                elif "Total:" in line and "Backlinks" in conteudo.split(line)[0][-20:]:
-                    metrics["backlinks"] = extract_number(line)
-                elif "Domínios de referência:" in line:
-                    metrics["dominos_referencia"] = extract_number(line)
-                elif "Posição no ranking" in line:
-                    metrics["posicao_media"] = extract_number(line)
-
-            paises_section = re.search(
-                r"Distribuição das Palavras-chave por País \(Busca Orgânica\):(.*?)(?=\n\n)",
-                conteudo,
-                re.DOTALL,
-            )
-            if paises_section:
-                for line in paises_section.group(1).split("\n"):
-                    if ":" in line:
-                        pais, percentual = line.split(":")
-                        pais = pais.replace("-", "").strip()
-                        metrics["distribuicao_paises"][pais] = extract_number(percentual)
-
-            intencao_section = re.search(r"Intenção das Palavras-chave:(.*?)(?=\n\n)", conteudo, re.DOTALL)
-            if intencao_section:
-                for line in intencao_section.group(1).split("\n"):
-                    if ":" in line and "palavras" in line.lower():
-                        tipo, resto = line.split(":", 1)
-                        tipo = tipo.replace("-", "").strip()
-                        palavras = extract_number(resto.split("palavras")[0])
-                        trafego = extract_number(resto.split("tráfego")[1]) if "tráfego" in resto else 0
-                        percentual = extract_number(resto.split("(")[-1]) if "(" in resto else 0
-                        metrics["intencao_palavras_chave"][tipo] = {
-                            "palavras": int(palavras),
-                            "trafego": int(trafego),
-                            "percentual": percentual,
-                        }
-
-            palavras_section = re.search(
-                r"Principais Palavras-chave Orgânicas:(.*?)(?=\n\nDistribuição das Posições)",
-                conteudo,
-                re.DOTALL,
-            )
-            metrics["top_palavras"] = []
-            if palavras_section:
-                for line in palavras_section.group(1).split("\n"):
-                    if '"' in line and "–" in line:
-                        partes = line.split("–")
-                        if len(partes) >= 3:
-                            palavra = partes[0].replace('"', "").strip()
-                            volume = extract_number(partes[2])
-                            trafego = extract_number(partes[3]) if len(partes) > 3 else 0
-                            if palavra and volume > 0:
-                                metrics["top_palavras"].append(
-                                    {"palavra": palavra, "volume": int(volume), "trafego": trafego}
-                                )
-
-            return metrics
-
-    except Exception as e:
-        print(f"Erro ao processar {json_path}: {str(e)}")
-        return None
-
-@st.cache_data(show_spinner=False)
-def load_seo_data(base_dir="analise-performance"):
-    all_data = []
-    file_count = 0
-
-    for root, _, files in os.walk(base_dir):
-        for file in files:
-            if file.endswith(".json") and "analise_detalhada" in file:
-                file_count += 1
-                json_path = os.path.join(root, file)
-                metrics = extract_seo_metrics(json_path)
-                if metrics:
-                    all_data.append(metrics)
-
-    return pd.DataFrame(all_data), file_count
+@cached("recursos", on_evict=release)
+def load_live_dataset(base_dir="analise-performance"):
+    # Snapshot colunar (.npy memory-mapped) + watcher que reprocessa só os relatórios alterados
+    dataset = LiveDataset(base_dir)
+    dataset.start()
+    return dataset
+
+@cached("catalogo")
+def load_shard_catalog(dataset, version, _snapshot):
+    # Marcas e totais por grupo lidos do manifesto: nenhum shard é aberto para montar o filtro
+    return ShardCatalog(_snapshot.manifest["shards"])
+
+@cached("dados")
+def load_seo_data(dataset, version, groups, _snapshot):
+    # Só os shards dos grupos que o recorte precisa; schema tipado aplicado uma vez por (versão, grupos)
+    tables = _snapshot.load(groups)
+    tables["dominios"] = dashboard_frame(tables["dominios"])
+    # Uma instância por processo, lida por todas as sessões: mapeamento somente leitura
+    # (e arrays somente leitura pelo copy-on-write do pandas); recortes usam máscaras/posições
+    return Snapshot(_snapshot.path, _snapshot.manifest, MappingProxyType(tables))
+
+@cached("grafo")
+def load_competitor_graph(dataset, version, _snapshot):
+    # Grafo do corpus inteiro: lê só `dominios` e `concorrentes` de cada shard
+    return CompetitorGraph.from_tables(_snapshot.table("dominios"), _snapshot.table("concorrentes"))
+
+@cached("indice_termos")
+def load_keyword_index(dataset, version, groups, _tables):
+    # Índice invertido (orgânicas, pagas, anúncios) montado uma vez por versão do dataset
+    return KeywordIndex.from_tables(_tables)
+
+@cached("cubos")
+def load_dashboard_cube(dataset, version, groups, _df_seo):
+    # Um cubo por (versão do dataset, shards carregados); o LRU de recortes filtrados vive dentro dele
+    return DashboardCube(_df_seo)
 
 # =========================
 # HEADER
@@ -652,20 +621,19 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-df_seo, json_files = load_seo_data()
-if df_seo is None or df_seo.empty:
+live_dataset = load_live_dataset()
+# Identidade do dataset nos caches: uma versão nova só invalida as entradas do mesmo base_dir
+dataset_id, live_snapshot = live_dataset.base_dir, live_dataset.snapshot
+catalog = load_shard_catalog(dataset_id, live_snapshot.version, live_snapshot)
+if not catalog.groups:
     st.warning("Nenhum dado de SEO encontrado. Verifique se os arquivos JSON estão no diretório correto.")
     st.stop()
-
-df_seo["is_lider"] = df_seo["grupo"].astype(str).str.lower().str.contains("lider")
-df_seo["marca_display"] = df_seo.apply(
-    lambda x: f"{x['marca']} (Grupo Líder)" if x["is_lider"] else x["marca"], axis=1
-)
+prof.watch_cache("figuras", load_figure_cache().stats)
 
 # =========================
 # FILTER BAR (REAL CONTAINER)
 # =========================
-with st.container(border=True):
+with st.container(border=True), prof.section("filtros"):
     c1, c2, c3, c4, c5 = st.columns([1.25, 2.0, 1.05, 1.25, 0.9])
 
     # with c1:
@@ -696,10 +664,9 @@ with st.container(border=True):
         )
     
     with c4:
-        marcas = sorted(df_seo["marca_display"].dropna().unique().tolist())
         sel_marcas = st.multiselect(
             "Marcas",
-            options=marcas,
+            options=catalog.marcas,
             default=[],
             help="Opcional"
         )
@@ -715,35 +682,36 @@ with st.container(border=True):
     #         unsafe_allow_html=True,
     #     )
 
-# Apply filters
-df_view = df_seo.copy()
-if modo == "Só Grupo Líder":
-    df_view = df_view[df_view["is_lider"]]
-elif modo == "Só Concorrentes":
-    df_view = df_view[~df_view["is_lider"]]
+# Shards por grupo: só os grupos que o recorte precisa são abertos (memory-map) e cacheados
+groups = catalog.groups_for(modo, sel_marcas)
+with prof.section("carregamento"):
+    snapshot = load_seo_data(dataset_id, live_snapshot.version, groups, live_snapshot)
+    tables, json_files = snapshot.tables, snapshot.file_count
+    df_seo = tables["dominios"]
+    df_palavras = tables["palavras"]
+
+with prof.section("cubo"):
+    cube = load_dashboard_cube(dataset_id, snapshot.version, groups, df_seo)
+prof.watch_cache("recortes", cube.stats)
 
-if sel_marcas:
-    df_view = df_view[df_view["marca_display"].isin(sel_marcas)]
+# Apply filters (recorte memoizado por (modo, marcas, top_n))
+with prof.section("recorte"):
+    recorte = cube.view(modo, sel_marcas, top_n)
+df_view = recorte.frame
 
-if df_view.empty:
+if recorte.empty:
     st.info("Nenhum dado disponível com os filtros selecionados.")
     st.stop()
 
 # =========================
 # RESUMO EXECUTIVO
 # =========================
-with st.container(border=True):
-    section_header("Resumo Executivo", "Indicadores + oportunidades (autoridade alta / tráfego baixo)")
-
-    tmp = df_view.copy()
-    tmp["trafego_organico"] = numeric(tmp["trafego_organico"])
-    tmp["palavras_chave_organicas"] = numeric(tmp["palavras_chave_organicas"])
-    tmp["backlinks"] = numeric(tmp["backlinks"])
-    tmp["dominos_referencia"] = numeric(tmp["dominos_referencia"])
+with st.container(border=True), prof.section("Resumo Executivo"):
+    section_header("Resumo Executivo", "Indicadores + oportunidades (score por coorte de marca)")
 
-    best_traf = tmp.loc[tmp["trafego_organico"].idxmax()] if not tmp.empty else None
-    best_kw = tmp.loc[tmp["palavras_chave_organicas"].idxmax()] if not tmp.empty else None
-    best_back = tmp.loc[tmp["backlinks"].idxmax()] if not tmp.empty else None
+    best_traf = recorte.destaques.get("trafego_organico")
+    best_kw = recorte.destaques.get("palavras_chave_organicas")
+    best_back = recorte.destaques.get("backlinks")
 
     st.markdown("<div class='metric-grid'>", unsafe_allow_html=True)
     metric_card(
@@ -769,29 +737,22 @@ with st.container(border=True):
     )
     metric_card(
         "Total (recorte)",
-        format_int_br(tmp["trafego_organico"].sum()),
-        f"{format_int_br(tmp['palavras_chave_organicas'].sum())} keywords • {format_int_br(tmp['backlinks'].sum())} backlinks",
+        format_int_br(recorte.totais["trafego_organico"]),
+        f"{format_int_br(recorte.totais['palavras_chave_organicas'])} keywords • {format_int_br(recorte.totais['backlinks'])} backlinks",
         hint="Mercado filtrado",
         tooltip="Soma dos indicadores no recorte atual",
     )
     st.markdown("</div>", unsafe_allow_html=True)
 
-    # Quadrantes de oportunidade
-    q = tmp[["marca_display", "is_lider", "trafego_organico", "backlinks", "palavras_chave_organicas", "dominio"]].copy()
-    traf_med = q["trafego_organico"].median() if not q.empty else 0
-    back_med = q["backlinks"].median() if not q.empty else 0
-
-    q["quadrante"] = ""
-    q.loc[(q["backlinks"] >= back_med) & (q["trafego_organico"] < traf_med), "quadrante"] = "Oportunidade"
-    q.loc[(q["backlinks"] >= back_med) & (q["trafego_organico"] >= traf_med), "quadrante"] = "Líderes"
-    q.loc[(q["backlinks"] < back_med) & (q["trafego_organico"] >= traf_med), "quadrante"] = "Alto tráfego"
-    q.loc[(q["backlinks"] < back_med) & (q["trafego_organico"] < traf_med), "quadrante"] = "Em desenvolvimento"
-
-    top_op = q[q["quadrante"] == "Oportunidade"].sort_values("backlinks", ascending=False).head(5)
+    # Oportunidades: top-k do score pré-calculado na ingestão (recorte memoizado)
+    top_op = recorte.oportunidades
 
     st.markdown("<br>", unsafe_allow_html=True)
-    chip("🎯 Oportunidades", primary=True, tooltip="Backlinks alto + tráfego baixo")
-    chip("📌 Quadrante por mediana", tooltip="Heurística: mediana de backlinks e tráfego no recorte")
+    chip("🎯 Oportunidades", primary=True, tooltip="Autoridade alta + desempenho orgânico baixo")
+    chip(
+        "📌 Score por coorte de marca",
+        tooltip=f"Percentis de backlinks, domínios ref., tráfego, keywords e share TOP 3 entre domínios da mesma montadora; acima de {OPPORTUNITY_THRESHOLD:.0f} = oportunidade",
+    )
 
     if top_op.empty:
         st.caption("Nenhuma oportunidade identificada com os filtros atuais.")
@@ -799,57 +760,46 @@ with st.container(border=True):
         left, right = st.columns([0.62, 0.38])
 
         with left:
-            df_op = top_op[["marca_display", "dominio", "backlinks", "trafego_organico", "palavras_chave_organicas"]].copy()
-            df_op = df_op.rename(
-                columns={
-                    "marca_display": "Marca",
-                    "dominio": "Domínio",
-                    "backlinks": "Backlinks",
-                    "trafego_organico": "Tráfego",
-                    "palavras_chave_organicas": "Palavras-chave",
-                }
-            )
-            st.dataframe(
-                style_table(df_op, gradient_cols=["Backlinks", "Tráfego", "Palavras-chave"], theme_name=st.session_state.ui_theme),
-                use_container_width=True,
-                hide_index=True,
-                height=260,
+            df_op = oportunidades_table(recorte)
+            data_table(df_op, "tbl_oportunidades", bar_cols=["Score", "Backlinks", "Tráfego", "Palavras-chave"], height=260)
+            download_csv_button(
+                ranking_table(cube.ranking_oportunidades(modo, sel_marcas)),
+                "ranking_oportunidades.csv",
+                "⬇️ Ranking completo",
+                key="dl_ranking_oportunidades",
             )
 
         with right:
-            fig_op = px.bar(
-                df_op.sort_values("Backlinks", ascending=True),
-                x="Backlinks",
-                y="Marca",
-                orientation="h",
-                title="Oportunidades (Backlinks)",
+            show_chart(
+                "oportunidades",
+                df_op,
+                lambda d: px.bar(
+                    d.sort_values("Score", ascending=True),
+                    x="Score",
+                    y="Marca",
+                    orientation="h",
+                    title="Oportunidades (Score)",
+                ),
             )
-            fig_op = futuristic_plotly(fig_op, st.session_state.ui_theme)
-            st.plotly_chart(fig_op, use_container_width=True)
 
 # =========================
 # TABS
 # =========================
-tab1, tab2 = st.tabs(["Visão Geral", "Análise Competitiva"])
+# Com on_change="rerun" a aba ativa fica no estado (tab.open): a Análise Competitiva só é montada quando aberta
+tab1, tab2 = st.tabs(["Visão Geral", "Análise Competitiva"], key="aba_ativa", on_change="rerun")
 
 # =========================
 # TAB 1
 # =========================
-with tab1:
+with tab1, prof.section("Visão Geral"):
     # KPIs do Grupo Líder
-    df_lider = df_seo[df_seo["is_lider"]].copy()
-    df_lider["trafego_organico"] = numeric(df_lider["trafego_organico"])
-    df_lider["palavras_chave_organicas"] = numeric(df_lider["palavras_chave_organicas"])
-    df_lider["dominos_referencia"] = numeric(df_lider["dominos_referencia"])
-
-    trafego_lider = float(df_lider["trafego_organico"].sum())
-    palavras_lider = float(df_lider["palavras_chave_organicas"].sum())
-    dominios_lider = float(df_lider["dominos_referencia"].sum())
-
-    trafego_total_all = float(numeric(df_seo["trafego_organico"]).sum())
-    share_lider = (trafego_lider / trafego_total_all * 100) if trafego_total_all > 0 else 0
+    kpis = catalog.lider_kpis()
+    trafego_lider = kpis["trafego_organico"]
+    palavras_lider = kpis["palavras_chave_organicas"]
+    dominios_lider = kpis["dominos_referencia"]
+    share_lider = kpis["share"]
 
-    with st.container(border=True):
+    with st.container(border=True), prof.section("Indicadores do Grupo Líder"):
         section_header("Indicadores do Grupo Líder", "Cards interativos + leitura rápida")
 
         st.markdown("<div class='metric-grid'>", unsafe_allow_html=True)
@@ -859,234 +809,381 @@ with tab1:
         metric_card("Market Share", f"{share_lider:.1f}%".replace(".", ","), "vs mercado", tooltip="Share estimado do tráfego orgânico do Grupo Líder")
         st.markdown("</div>", unsafe_allow_html=True)
 
-        g = df_seo.copy()
-        g["trafego_organico"] = numeric(g["trafego_organico"])
-        by_brand = g.groupby("marca_display")["trafego_organico"].sum().sort_values(ascending=False).head(12).reset_index()
-
-        fig_micro = px.line(
-            by_brand[::-1],
-            x="trafego_organico",
-            y="marca_display",
-            title="Top 12 marcas por tráfego (visão rápida)",
-            labels={"trafego_organico": "Tráfego", "marca_display": "Marca"},
+        by_brand = catalog.por_marca_total.head(12).reset_index()
+
+        show_chart(
+            "top_marcas",
+            by_brand,
+            lambda d: px.line(
+                d[::-1],
+                x="trafego_organico",
+                y="marca_display",
+                title="Top 12 marcas por tráfego (visão rápida)",
+                labels={"trafego_organico": "Tráfego", "marca_display": "Marca"},
+            ),
         )
-        fig_micro = futuristic_plotly(fig_micro, st.session_state.ui_theme)
-        st.plotly_chart(fig_micro, use_container_width=True)
 
     # Palavras-chave principais
-    with st.container(border=True):
+    with st.container(border=True), prof.section("Principais Palavras-chave (Grupo Líder)"):
         section_header("Principais Palavras-chave (Grupo Líder)", "Tabela mais visual + export + mini gráfico")
 
-        keywords_data = {"Palavra-chave": [], "Volume": [], "Tráfego": [], "Marca": []}
-        for _, row in df_lider.iterrows():
-            for kw in row.get("top_palavras", []) or []:
-                keywords_data["Palavra-chave"].append(kw.get("palavra", ""))
-                keywords_data["Volume"].append(kw.get("volume", 0))
-                keywords_data["Tráfego"].append(kw.get("trafego", 0))
-                keywords_data["Marca"].append(row.get("marca", ""))
-
-        df_keywords = pd.DataFrame(keywords_data)
+        # Fato de palavras-chave do snapshot: filtro + ordenação vetorizados
+        df_keywords = keyword_table(df_palavras, cube.lider_index)
         if df_keywords.empty:
             st.info("Dados de palavras-chave não disponíveis.")
         else:
-            df_keywords["Volume"] = numeric(df_keywords["Volume"])
-            df_keywords["Tráfego"] = numeric(df_keywords["Tráfego"])
-            df_keywords = df_keywords.sort_values("Volume", ascending=False)
-
             left, right = st.columns([0.70, 0.30])
 
             with right:
                 download_csv_button(df_keywords, "palavras_chave_grupo_lider.csv", "⬇️ Exportar CSV", key="dl_kw")
-                topkw = df_keywords.head(10).copy()
-                fig_kw = px.bar(
-                    topkw.sort_values("Volume", ascending=True),
-                    x="Volume",
-                    y="Palavra-chave",
-                    orientation="h",
-                    title="Top 10 por volume",
+                topkw = df_keywords.head(10).astype({"Palavra-chave": str, "Marca": str})
+                show_chart(
+                    "top_palavras",
+                    topkw,
+                    lambda d: px.bar(
+                        d.sort_values("Volume", ascending=True),
+                        x="Volume",
+                        y="Palavra-chave",
+                        orientation="h",
+                        title="Top 10 por volume",
+                    ),
                 )
-                fig_kw = futuristic_plotly(fig_kw, st.session_state.ui_theme)
-                st.plotly_chart(fig_kw, use_container_width=True)
 
             with left:
-                show_n = st.slider(
-                    "Linhas na tabela",
-                    20,
-                    min(300, len(df_keywords)),
-                    min(80, len(df_keywords)),
-                    10,
-                    key="kw_rows",
-                )
-                view = df_keywords.head(show_n).copy()
-                st.dataframe(
-                    style_table(view, gradient_cols=["Volume", "Tráfego"], theme_name=st.session_state.ui_theme),
-                    use_container_width=True,
-                    hide_index=True,
+                data_table(
+                    df_keywords,
+                    "tbl_kw",
+                    bar_cols=["Volume", "Tráfego"],
+                    search_cols=["Palavra-chave", "Marca"],
                     height=430,
                 )
 
+    # Busca no índice invertido de termos (fragmento: digitar reroda só este bloco)
+    @st.fragment
+    def busca_termo(version, groups, tables, dominios, domain_ids):
+        with st.container(border=True), prof.fragment("Quem rankeia para um termo"):
+            section_header("Quem rankeia para um termo", "Palavras-chave orgânicas, pagas e títulos de anúncios • sem acentos, por prefixo")
+
+            termo = st.text_input("Termo", key="kw_index_busca", placeholder='ex.: strada 2024, fiat azzurra, consórcio...')
+            if termo.strip():
+                kw_index = load_keyword_index(dataset_id, version, groups, tables)
+                achados = kw_index.search(termo, dominios, domain_ids=domain_ids, limit=DEFAULT_SEARCH_LIMIT)
+                if achados.empty:
+                    sugestoes = kw_index.suggest(termo.split()[-1])
+                    st.caption("Nenhuma ocorrência no recorte atual." + (f" Termos parecidos: {', '.join(sugestoes)}" if sugestoes else ""))
+                else:
+                    st.caption(
+                        f"{format_int_br(achados['Domínio'].nunique())} domínios • {format_int_br(len(achados))} ocorrências"
+                        + (f" (as {DEFAULT_SEARCH_LIMIT} de maior volume)" if len(achados) == DEFAULT_SEARCH_LIMIT else "")
+                    )
+                    data_table(achados, "tbl_busca_termo", bar_cols=["Volume", "Tráfego (%)"], height=360)
+
+    busca_termo(snapshot.version, groups, tables, df_seo, df_view.index)
+
     # Top Concorrentes (recorte atual)
-    df_concorrentes = df_view[~df_view["is_lider"]].copy()
-    df_concorrentes["trafego_organico"] = numeric(df_concorrentes["trafego_organico"])
-    df_concorrentes["palavras_chave_organicas"] = numeric(df_concorrentes["palavras_chave_organicas"])
-    df_concorrentes["backlinks"] = numeric(df_concorrentes["backlinks"])
-    df_concorrentes["dominos_referencia"] = numeric(df_concorrentes["dominos_referencia"])
+    df_top = recorte.top_concorrentes
 
-    with st.container(border=True):
+    with st.container(border=True), prof.section("Top concorrentes"):
         section_header(f"Top {top_n} Concorrentes (recorte atual)", "Tabela + gráfico futurista")
 
-        if df_concorrentes.empty:
+        if df_top.empty:
             st.info("Sem concorrentes para exibir com os filtros atuais.")
         else:
-            df_top = df_concorrentes.nlargest(top_n, "trafego_organico").copy()
-
-            tbl = pd.DataFrame(
-                {
-                    "Marca": df_top["marca_display"],
-                    "Domínio": df_top["dominio"],
-                    "Tráfego": df_top["trafego_organico"].round(0).astype(int),
-                    "Palavras-chave": df_top["palavras_chave_organicas"].round(0).astype(int),
-                    "Backlinks": df_top["backlinks"].round(0).astype(int),
-                    "Domínios Ref.": df_top["dominos_referencia"].round(0).astype(int),
-                }
-            )
+            tbl = top_concorrentes_table(recorte)
 
             left, right = st.columns([0.62, 0.38])
 
             with right:
                 download_csv_button(tbl, "top_concorrentes.csv", "⬇️ Exportar CSV", key="dl_top_conc")
-                fig_traf = px.bar(
-                    df_top.sort_values("trafego_organico", ascending=True),
-                    x="trafego_organico",
-                    y="marca_display",
-                    orientation="h",
-                    title="Tráfego orgânico (Top concorrentes)",
-                    labels={"trafego_organico": "Tráfego", "marca_display": "Marca"},
+                show_chart(
+                    "top_concorrentes",
+                    df_top,
+                    lambda d: px.bar(
+                        d.sort_values("trafego_organico", ascending=True),
+                        x="trafego_organico",
+                        y="marca_display",
+                        orientation="h",
+                        title="Tráfego orgânico (Top concorrentes)",
+                        labels={"trafego_organico": "Tráfego", "marca_display": "Marca"},
+                    ),
                 )
-                fig_traf = futuristic_plotly(fig_traf, st.session_state.ui_theme)
-                st.plotly_chart(fig_traf, use_container_width=True)
 
             with left:
-                st.dataframe(
-                    style_table(tbl, gradient_cols=["Tráfego", "Palavras-chave", "Backlinks"], theme_name=st.session_state.ui_theme),
-                    use_container_width=True,
-                    hide_index=True,
-                    height=320,
-                )
-
-    # Participação por marca
-    with st.container(border=True):
-        section_header("Participação por marca (tráfego × keywords)", "Comparativo com barras agrupadas")
-
-        grouped = (
-            df_view.assign(
-                trafego_organico=numeric(df_view["trafego_organico"]),
-                palavras_chave_organicas=numeric(df_view["palavras_chave_organicas"]),
+                data_table(tbl, "tbl_top_conc", bar_cols=["Tráfego", "Palavras-chave", "Backlinks"], height=320)
+
+    # Participação por marca (fragmento: o slider reroda só este bloco)
+    @st.fragment
+    def participacao_por_marca(grouped):
+        with st.container(border=True), prof.fragment("Participação por marca (tráfego × keywords)"):
+            section_header("Participação por marca (tráfego × keywords)", "Comparativo com barras agrupadas")
+
+            max_brands = min(25, len(grouped))
+            n_brands = st.slider(
+                "Marcas no gráfico",
+                5,
+                max_brands if max_brands >= 5 else 5,
+                min(12, max_brands) if max_brands >= 5 else 5,
+                1,
+                key="brands_chart",
+            )
+            grouped_plot = grouped.head(n_brands)
+
+            show_chart(
+                "marcas_mix",
+                grouped_plot,
+                lambda d: px.bar(
+                    d,
+                    x="marca_display",
+                    y=["trafego_organico", "palavras_chave_organicas"],
+                    barmode="group",
+                    title="Tráfego e Keywords por Marca",
+                    labels={"value": "Volume", "variable": "Métrica", "marca_display": "Marca"},
+                ),
             )
-            .groupby("marca_display")[["trafego_organico", "palavras_chave_organicas"]]
-            .sum()
-            .reset_index()
-            .sort_values("trafego_organico", ascending=False)
-        )
 
-        max_brands = min(25, len(grouped))
-        n_brands = st.slider(
-            "Marcas no gráfico",
-            5,
-            max_brands if max_brands >= 5 else 5,
-            min(12, max_brands) if max_brands >= 5 else 5,
-            1,
-            key="brands_chart",
-        )
-        grouped_plot = grouped.head(n_brands)
-
-        fig_mix = px.bar(
-            grouped_plot,
-            x="marca_display",
-            y=["trafego_organico", "palavras_chave_organicas"],
-            barmode="group",
-            title="Tráfego e Keywords por Marca",
-            labels={"value": "Volume", "variable": "Métrica", "marca_display": "Marca"},
-        )
-        fig_mix = futuristic_plotly(fig_mix, st.session_state.ui_theme)
-        st.plotly_chart(fig_mix, use_container_width=True)
+    participacao_por_marca(recorte.por_marca)
 
 # =========================
 # TAB 2
 # =========================
-with tab2:
-    with st.container(border=True):
-        section_header("Mapa Competitivo", "Backlinks × posição média (bolha = tráfego) • Escala log")
-
-        df_plot = df_view.copy()
-        df_plot["backlinks"] = numeric(df_plot["backlinks"])
-        df_plot["posicao_media"] = numeric(df_plot["posicao_media"])
-        df_plot["trafego_organico"] = numeric(df_plot["trafego_organico"])
-        df_plot["palavras_chave_organicas"] = numeric(df_plot["palavras_chave_organicas"])
-
-        fig_scatter = px.scatter(
-            df_plot,
-            x="backlinks",
-            y="posicao_media",
-            size="trafego_organico",
-            color="is_lider",
-            hover_data=["marca_display", "dominio", "trafego_organico", "palavras_chave_organicas"],
-            title="Autoridade (Backlinks) vs Ranking (Posição Média)",
-            labels={"backlinks": "Backlinks (log)", "posicao_media": "Posição média (↓ melhor)", "is_lider": "Grupo"},
-            color_discrete_map={
-                True: "#5469d4" if st.session_state.ui_theme == "Claro" else "#7c7cff",
-                False: "#f59e0b" if st.session_state.ui_theme == "Claro" else "#fbbf24",
-            },
-        )
-        fig_scatter.update_xaxes(type="log")
-        fig_scatter = futuristic_plotly(fig_scatter, st.session_state.ui_theme)
-        st.plotly_chart(fig_scatter, use_container_width=True)
-
-    with st.container(border=True):
-        section_header("Tabela agregada por marca", "Resumo auditável com export + destaque visual")
-
-        metricas = (
-            df_view.assign(
-                trafego_organico=numeric(df_view["trafego_organico"]),
-                palavras_chave_organicas=numeric(df_view["palavras_chave_organicas"]),
-                backlinks=numeric(df_view["backlinks"]),
-                dominos_referencia=numeric(df_view["dominos_referencia"]),
-                posicao_media=numeric(df_view["posicao_media"]),
+with tab2, prof.section("Análise Competitiva"):
+    if tab2.open:
+        with st.container(border=True), prof.section("Mapa Competitivo"):
+            section_header("Mapa Competitivo", "Backlinks × posição média (bolha = tráfego) • Escala log")
+
+            df_plot = recorte.frame
+
+            def build_scatter(d):
+                fig = px.scatter(
+                    d,
+                    x="backlinks",
+                    y="posicao_media",
+                    size="trafego_organico",
+                    color="is_lider",
+                    hover_data=["marca_display", "dominio", "trafego_organico", "palavras_chave_organicas"],
+                    title="Autoridade (Backlinks) vs Ranking (Posição Média)",
+                    labels={"backlinks": "Backlinks (log)", "posicao_media": "Posição média (↓ melhor)", "is_lider": "Grupo"},
+                    color_discrete_map={
+                        True: "#5469d4" if st.session_state.ui_theme == "Claro" else "#7c7cff",
+                        False: "#f59e0b" if st.session_state.ui_theme == "Claro" else "#fbbf24",
+                    },
+                )
+                fig.update_xaxes(type="log")
+                return fig
+
+            show_chart("mapa_competitivo", df_plot, build_scatter)
+
+        with st.container(border=True), prof.section("Tabela agregada por marca"):
+            section_header("Tabela agregada por marca", "Resumo auditável com export + destaque visual")
+
+            metricas = recorte.metricas
+
+            c1, c2 = st.columns([0.78, 0.22])
+            with c2:
+                download_csv_button(metricas, "metricas_competitivas.csv", "⬇️ Exportar CSV", key="dl_metricas")
+
+            data_table(metricas, "tbl_metricas", bar_cols=["Tráfego Orgânico", "Palavras-chave", "Backlinks"], height=420)
+
+            chip("📌 Posição média: menor = melhor", primary=True, tooltip="Quanto menor, melhor o posicionamento")
+            chip("🧠 Score: autoridade alta + desempenho baixo na coorte = oportunidade", tooltip="Ranking completo no Resumo Executivo")
+
+        # Busca paga (agregados pré-calculados no snapshot)
+        with st.container(border=True), prof.section("Busca Paga"):
+            section_header("Busca Paga", "Tráfego pago, CPC e anúncios • agregados por grupo")
+
+            # Agregados de todos os grupos (tabela pequena, lida sem abrir os outros shards)
+            pago = live_snapshot.table("pago_grupos")
+            pago_lider = pago["grupo"].astype(str).str.lower().str.contains("lider")
+            if modo == "Só Grupo Líder":
+                pago = pago[pago_lider]
+            elif modo == "Só Concorrentes":
+                pago = pago[~pago_lider]
+
+            df_pago = (
+                pago.rename(
+                    columns={
+                        "grupo": "Grupo",
+                        "dominios": "Domínios",
+                        "trafego_organico": "Tráfego Orgânico",
+                        "trafego_pago": "Tráfego Pago",
+                        "share_pago": "Share Pago (%)",
+                        "palavras_chave_pagas": "Palavras-chave Pagas",
+                        "custo_trafego_pago": "Custo Tráfego Pago (R$)",
+                        "custo_por_visita": "Custo/Visita (R$)",
+                        "cpc_medio": "CPC Médio (R$)",
+                        "custo_palavras_top": "Custo Top Palavras (R$)",
+                    }
+                )
+                .assign(Grupo=lambda d: d["Grupo"].astype(str))
+                .sort_values("Tráfego Pago", ascending=False)
+                .round(2)
             )
-            .groupby("marca_display")
-            .agg(
+
+            c1, c2 = st.columns([0.78, 0.22])
+            with c2:
+                download_csv_button(df_pago, "busca_paga_grupos.csv", "⬇️ Exportar CSV", key="dl_pago")
+
+            data_table(df_pago, "tbl_pago", bar_cols=["Tráfego Pago", "Share Pago (%)", "CPC Médio (R$)"], height=320)
+
+            # Tabela compartilhada lida por posições do recorte (sem filtrar/copiar o fato inteiro)
+            kw_pagas = tables["palavras_pagas"]
+            rows = fact_rows(kw_pagas, df_view.index, order_by="volume")
+            posicao = kw_pagas["posicao"].to_numpy()[rows]
+            df_kw_pagas = pd.DataFrame(
                 {
-                    "trafego_organico": "sum",
-                    "palavras_chave_organicas": "sum",
-                    "backlinks": "sum",
-                    "dominos_referencia": "sum",
-                    "posicao_media": "mean",
+                    "Palavra-chave": take_labels(kw_pagas["palavra"], rows),
+                    "Marca": take_labels(kw_pagas["marca"], rows),
+                    "Posição": pd.Series(posicao).where(posicao > 0).astype("Int32").to_numpy(),
+                    "Volume": kw_pagas["volume"].to_numpy()[rows],
+                    "CPC (R$)": kw_pagas["cpc"].to_numpy()[rows],
+                    "Tráfego (%)": kw_pagas["trafego"].to_numpy()[rows],
                 }
             )
-            .reset_index()
-            .rename(
-                columns={
-                    "marca_display": "Marca",
-                    "trafego_organico": "Tráfego Orgânico",
-                    "palavras_chave_organicas": "Palavras-chave",
-                    "backlinks": "Backlinks",
-                    "dominos_referencia": "Domínios Referência",
-                    "posicao_media": "Posição Média",
-                }
-            )
-            .sort_values("Tráfego Orgânico", ascending=False)
-        )
 
-        c1, c2 = st.columns([0.78, 0.22])
-        with c2:
-            download_csv_button(metricas, "metricas_competitivas.csv", "⬇️ Exportar CSV", key="dl_metricas")
+            if df_kw_pagas.empty:
+                st.caption("Nenhuma palavra-chave paga no recorte atual.")
+            else:
+                left, right = st.columns([0.62, 0.38])
+
+                with left:
+                    data_table(
+                        df_kw_pagas,
+                        "tbl_kw_pagas",
+                        bar_cols=["Volume", "CPC (R$)"],
+                        search_cols=["Palavra-chave", "Marca"],
+                        height=360,
+                    )
+
+                with right:
+                    download_csv_button(df_kw_pagas, "palavras_chave_pagas.csv", "⬇️ Exportar CSV", key="dl_kw_pagas")
+                    show_chart(
+                        "top_cpc",
+                        df_kw_pagas.nlargest(10, "CPC (R$)"),
+                        lambda d: px.bar(
+                            d.sort_values("CPC (R$)", ascending=True),
+                            x="CPC (R$)",
+                            y="Palavra-chave",
+                            orientation="h",
+                            title="Top 10 palavras pagas por CPC",
+                            hover_data=["Marca", "Volume"],
+                        ),
+                    )
+
+            anuncios = tables["anuncios"]
+            rows = fact_rows(anuncios, df_view.index)
+            if len(rows):
+                with st.expander(f"Exemplos de Anúncios ({len(rows)})"):
+                    st.dataframe(
+                        pd.DataFrame(
+                            {
+                                "Marca": take_labels(df_seo["marca"], df_seo.index.get_indexer(anuncios["domain_id"].to_numpy()[rows])),
+                                "Título": take_labels(anuncios["titulo"], rows),
+                                "Descrição": take_labels(anuncios["descricao"], rows),
+                                "URL": take_labels(anuncios["url"], rows),
+                            }
+                        ),
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={"URL": st.column_config.LinkColumn("URL")},
+                    )
+
+            chip("💰 Custo top palavras = Σ CPC × cliques estimados", primary=True, tooltip="Cliques = % de tráfego da palavra × tráfego pago do domínio")
+
+        # Grafo de concorrência orgânica (CSR, construído uma vez por versão do dataset)
+        # Fragmento: os seletores de domínio/caminho rerodam só o grafo
+        @st.fragment
+        def grafo_concorrentes(version, snapshot, dominios):
+            with st.container(border=True), prof.fragment("Grafo de Concorrentes Orgânicos"):
+                section_header("Grafo de Concorrentes Orgânicos", "Quem concorre com quem • concorrentes comuns às marcas Líder")
+
+                graph = load_competitor_graph(dataset_id, version, snapshot)
+                dominios_view = sorted(d for d in dominios["dominio"].astype(str).unique() if graph.node_id(d) is not None)
+
+                if not dominios_view:
+                    st.caption("Nenhum concorrente orgânico listado no recorte atual.")
+                else:
+                    dominio_sel = st.selectbox("Domínio", options=dominios_view, key="graph_domain")
+                    left, right = st.columns(2)
+                    with left:
+                        st.caption("Concorrentes listados no relatório")
+                        st.dataframe(graph.competitors(dominio_sel), use_container_width=True, hide_index=True, height=240)
+                    with right:
+                        st.caption("Citado como concorrente por")
+                        st.dataframe(graph.competed_by(dominio_sel), use_container_width=True, hide_index=True, height=240)
+
+                comuns = graph.shared_competitors(pd.Series(graph.grupo).str.lower().str.contains("lider").to_numpy())
+                st.caption("Concorrentes que aparecem em várias marcas do Grupo Líder")
+                if comuns.empty:
+                    st.caption("Nenhum concorrente comum a duas ou mais marcas Líder.")
+                else:
+                    df_comuns = comuns.rename(
+                        columns={
+                            "concorrente": "Concorrente",
+                            "marcas": "Marcas Líder",
+                            "citacoes": "Citações",
+                            "similaridade_media": "Similaridade média (%)",
+                            "palavras_comuns": "Palavras em comum",
+                            "lista_marcas": "Marcas",
+                        }
+                    ).round(1)
+                    data_table(df_comuns, "tbl_comuns", bar_cols=["Marcas Líder", "Similaridade média (%)"], height=280)
+
+                with st.expander("Caminho de sobreposição entre dois domínios"):
+                    # Só os domínios do recorte: o grafo inteiro em dois selectbox pesa a cada rerun
+                    c1, c2 = st.columns(2)
+                    with c1:
+                        origem = st.selectbox("Origem", options=dominios_view, key="graph_from")
+                    with c2:
+                        destino = st.selectbox(
+                            "Destino", options=dominios_view, index=min(1, max(len(dominios_view) - 1, 0)), key="graph_to"
+                        )
+                    if origem is None or destino is None:
+                        st.caption("Nenhum domínio do recorte atual está no grafo.")
+                        return
+                    caminho, custo = graph.shortest_path(origem, destino)
+                    if caminho:
+                        st.markdown(" → ".join(f"`{d}`" for d in caminho))
+                        st.caption(f"{len(caminho) - 1} salto(s) • custo {custo:.2f} (soma de 1 − similaridade)")
+                    else:
+                        st.caption("Sem caminho de sobreposição entre os domínios escolhidos.")
+
+        grafo_concorrentes(snapshot.version, live_snapshot, df_view)
 
+# =========================
+# PERFIL DO RERUN (SEO_PROFILE=1 ou ?profile=1)
+# =========================
+if prof.enabled:
+    registro = prof.finish(versao=snapshot.version)
+    with st.expander(f"⏱️ Perfil do rerun • {registro['total_ms']:.0f} ms"):
+        c1, c2 = st.columns([1.4, 1.0])
+        with c1:
+            st.caption("Seções deste rerun")
+            secoes = pd.DataFrame(registro["secoes"])
+            secoes["secao"] = ["\u2003" * n + s for n, s in zip(secoes["nivel"], secoes["secao"])]
+            st.dataframe(
+                secoes[["secao", "ms"]].rename(columns={"secao": "Seção", "ms": "Tempo (ms)"}).round(1),
+                use_container_width=True,
+                hide_index=True,
+                height=360,
+            )
+        with c2:
+            st.caption("Caches neste rerun (hits / misses)")
+            st.dataframe(
+                pd.DataFrame.from_dict(registro["caches"], orient="index").rename_axis("Cache").reset_index(),
+                use_container_width=True,
+                hide_index=True,
+            )
+            st.caption("Histórico do processo (p50 / p95)")
+            st.dataframe(section_percentiles(), use_container_width=True, hide_index=True, height=240)
+        st.caption("Caches do processo (política em cache_policy.POLICIES)")
+        caches = cache_stats()
         st.dataframe(
-            style_table(metricas, gradient_cols=["Tráfego Orgânico", "Palavras-chave", "Backlinks"], theme_name=st.session_state.ui_theme),
+            caches.assign(
+                bytes=(caches["bytes"] / 2**20).round(1),
+                max_bytes=(caches["max_bytes"] / 2**20).round(0),
+                hit_rate=(caches["hit_rate"] * 100).round(1),
+            ).rename(columns={"bytes": "MB", "max_bytes": "Limite (MB)", "hit_rate": "Acerto (%)"}),
             use_container_width=True,
             hide_index=True,
-            height=420,
         )
-
-        chip("📌 Posição média: menor = melhor", primary=True, tooltip="Quanto menor, melhor o posicionamento")
-        chip("🧠 Heurística: autoridade alta + tráfego baixo = oportunidade", tooltip="Regra simples para priorização")
+        st.caption(f"Log JSONL: `{prof.log_path}`")
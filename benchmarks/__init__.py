@@ -0,0 +1,4 @@
+"""
+Benchmarks dos caminhos críticos (parsing, snapshot, análise e agregações do dashboard)
+sobre corpora sintéticos. Uso: python -m benchmarks.run --sizes 100 10000 100000
+"""
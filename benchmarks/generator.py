@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import random
+
+# Os quatro primeiros batem com os grupos de analise_grupo_lider.analyze_grupo_lider
+GROUPS = ["lider", "servopa", "saga", "barigui", "leauto", "azurra", "carbel", "real", "rio", "ab"]
+BRANDS = [
+    "chevrolet", "fiat", "jeep", "ram", "toyota", "volkswagen", "honda", "hyundai",
+    "renault", "peugeot", "citroen", "nissan", "byd", "gwm", "volvo", "bmw",
+]
+CITIES = ["curitiba", "goiania", "brasilia", "rio", "barra", "recreio", "cascavel", "londrina", "niteroi", "campinas"]
+MODELS = ["onix", "tracker", "strada", "toro", "pulse", "compass", "renegade", "corolla", "hilux", "polo", "tcross", "hb20", "creta", "kicks"]
+TERMS = ["preço", "seminovos", "0km", "consórcio", "financiamento", "revisão", "test drive", "ofertas", "2025", "telefone"]
+COUNTRIES = ["Brasil", "Mobile Brasil", "Estados Unidos", "Portugal"]
+INTENTS = ["Informacional", "Navegacional", "Comercial", "Transacional"]
+
+
+def fmt_int(n):
+    return f"{int(n):,}".replace(",", ".")
+
+
+def fmt_dec(x, digits=2):
+    return f"{x:.{digits}f}".replace(".", ",")
+
+
+def fmt_k(n):
+    return f"{n / 1000:.1f}k" if n >= 1000 else str(int(n))
+
+
+def _split(rng, total, parts):
+    cuts = sorted(rng.random() for _ in range(parts - 1))
+    bounds = [0.0] + cuts + [1.0]
+    return [total * (b - a) for a, b in zip(bounds, bounds[1:])]
+
+
+def _keyword(rng, marca):
+    words = [rng.choice(MODELS if rng.random() < 0.6 else [marca]), rng.choice(TERMS)]
+    if rng.random() < 0.3:
+        words.append(rng.choice(CITIES))
+    return " ".join(words)
+
+
+def generate_report(rng, dominio, marca, n_keywords=5, n_competitors=5, n_paid=3, n_ads=3):
+    """
+    Texto de um relatório sintético no formato SEMrush "Página N:" lido por seo_parser
+    """
+    trafego = rng.randint(50, 60000)
+    palavras = rng.randint(20, 15000)
+    backlinks = rng.randint(10, 100000)
+    ref = rng.randint(5, 600)
+    pago = rng.choice([0, rng.randint(1, 50000)])
+    top3 = rng.randint(0, max(1, palavras // 5))
+
+    lines = [
+        "Página 1:",
+        f"- Relatório referente ao domínio: {dominio}",
+        f"- Data de geração: {rng.randint(1, 28)} de abril de 2025",
+        "- Fonte: SEMrush",
+        "",
+        "Página 2:",
+        "Resumo da Busca Orgânica:",
+        f"- Tráfego estimado: {fmt_int(trafego)} (aumento de {rng.randint(1, 40)}%)",
+        f"- Posição no ranking da Semrush: {fmt_k(rng.randint(1000, 2000000))}",
+        f"- Palavras-chave orgânicas: {fmt_int(palavras)} (queda de {rng.randint(1, 40)}%)",
+        f"- Custo do tráfego: R${fmt_int(trafego * rng.uniform(0.5, 3))}",
+        "",
+        "Resumo da Busca Paga:",
+        f"- Tráfego estimado: {fmt_int(pago)}",
+        f"- Palavras-chave pagas: {fmt_int(rng.randint(0, 400) if pago else 0)}",
+        f"- Custo do tráfego pago: R${fmt_int(pago * rng.uniform(0.5, 6))}",
+        "",
+        "Backlinks:",
+        f"- Total: {fmt_int(backlinks)}",
+        f"- Domínios de referência: {fmt_int(ref)}",
+        f"- IPs de referência: {fmt_int(ref + rng.randint(0, 50))}",
+        "",
+        "Página 3:",
+        "Distribuição das Palavras-chave por País (Busca Orgânica):",
+    ]
+    for pais, pct in zip(COUNTRIES, _split(rng, 100, len(COUNTRIES))):
+        lines.append(f"- {pais}: {fmt_dec(pct)}%")
+
+    lines += ["", "Página 4:", "Principais Palavras-chave Orgânicas:"]
+    for i, share in enumerate(sorted(_split(rng, 100, max(1, n_keywords)), reverse=True)[:n_keywords], 1):
+        posicao = f" – Posição: {rng.randint(1, 30)}" if rng.random() < 0.7 else ""
+        lines.append(
+            f'{i}. "{_keyword(rng, marca)}"{posicao} – Volume: {fmt_int(rng.choice([10, 90, 210, 720, 1000, 3600, 12100]))} '
+            f"– Tráfego: {fmt_dec(share)}%"
+        )
+
+    lines += ["", "Distribuição das Posições das Palavras-chave:", f"- Posições 1-3: {fmt_int(top3)}", f"- Posições 4-10: {fmt_int(rng.randint(0, 500))}", ""]
+    lines.append("Intenção das Palavras-chave:")
+    for tipo, pct in zip(INTENTS, _split(rng, 100, len(INTENTS))):
+        lines.append(f"- {tipo}: {fmt_int(palavras * pct / 100)} palavras – {fmt_int(trafego * pct / 100)} de tráfego ({fmt_dec(pct, 1)}%)")
+
+    lines += ["", "Página 5:", "Principais Concorrentes em Busca Orgânica:"]
+    for i in range(1, n_competitors + 1):
+        concorrente = f"{rng.choice(BRANDS)}{rng.choice(CITIES)}{rng.randint(1, 400)}.com.br"
+        lines.append(
+            f"{i}. {concorrente} – Palavras em comum: {rng.randint(1, 300)} – "
+            f"Palavras orgânicas: {fmt_k(rng.randint(50, 20000))} – Similaridade: {rng.randint(1, 60)}%"
+        )
+
+    lines += ["", "Página 6:", "Palavras-chave Pagas:"]
+    for i, share in enumerate(_split(rng, 100, max(1, n_paid))[:n_paid] if pago else [], 1):
+        lines.append(
+            f'{i}. "{_keyword(rng, marca)}" – Posição: {rng.randint(1, 8)} – Volume: {fmt_int(rng.choice([90, 210, 1000, 3600]))} '
+            f"– CPC: R${fmt_dec(rng.uniform(0.3, 8))} – Tráfego: {fmt_dec(share)}%"
+        )
+
+    lines += ["", "Página 7:", "Exemplos de Anúncios:"]
+    for i in range(1, (n_ads if pago else 0) + 1):
+        lines.append(
+            f'{i}. "{rng.choice(MODELS).title()} {rng.choice(TERMS)}" – Condições especiais na {marca.title()} – https://www.{dominio}'
+        )
+
+    lines += ["", "Página 8:", f"Backlinks - Total: {fmt_int(backlinks)}", ""]
+    return "\n".join(lines)
+
+
+def generate_corpus(base_dir, n_reports, n_groups=8, n_brands=6, n_keywords=5, n_competitors=5, seed=0):
+    """
+    Grava `n_reports` relatórios em base_dir/grupo-<g>/<marca>/analise_detalhada_<slug>_por_pagina.json
+    (formato bruto {"conteudo": ...}, o mesmo lido pelo dashboard). Retorna a lista de caminhos.
+    """
+    rng = random.Random(seed)
+    groups = (GROUPS + [f"sintetico{i}" for i in range(len(GROUPS), n_groups)])[:n_groups]
+    paths = []
+    for i in range(n_reports):
+        grupo = groups[i % len(groups)]
+        marca = BRANDS[(i // len(groups)) % min(n_brands, len(BRANDS))]
+        slug = f"{marca}{rng.choice(CITIES)}{i}"
+        folder = os.path.join(base_dir, f"grupo-{grupo}", marca)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"analise_detalhada_{slug}_por_pagina.json")
+        conteudo = generate_report(rng, f"{slug}.com.br", marca, n_keywords=n_keywords, n_competitors=n_competitors)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"conteudo": conteudo}, f, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera relatórios SEMrush sintéticos para benchmarks")
+    parser.add_argument("base_dir")
+    parser.add_argument("--reports", type=int, default=100)
+    parser.add_argument("--groups", type=int, default=8)
+    parser.add_argument("--brands", type=int, default=6)
+    parser.add_argument("--keywords", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = generate_corpus(args.base_dir, args.reports, args.groups, args.brands, args.keywords, seed=args.seed)
+    print(f"{len(paths)} relatórios gerados em {args.base_dir}")
+
+
+if __name__ == "__main__":
+    main()
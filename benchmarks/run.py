@@ -0,0 +1,237 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from analise_grupo_lider import analyze_grupo_lider
+from benchmarks.generator import generate_corpus
+from keyword_index import KeywordIndex
+from opportunity_scores import score_frame
+from seo_ingest import iter_report_files
+from seo_parser import extract_seo_metrics
+from seo_snapshot import load_snapshot, open_snapshot
+from seo_views import DashboardCube, ShardCatalog, dashboard_frame
+from table_view import query_table
+
+DEFAULT_SIZES = [100, 10_000, 100_000]
+DEFAULT_WORKDIR = os.path.join(".seo_cache", "bench")
+# Amostra de arquivos para medir extract_seo_metrics arquivo a arquivo
+PARSE_SAMPLE = 500
+# Abaixo disso (p50 em segundos) a variação é ruído de medição e não conta como regressão
+MIN_COMPARE_SECONDS = 0.001
+VIEW_FILTERS = [
+    ("Todos", (), 5),
+    ("Só Grupo Líder", (), 5),
+    ("Só Concorrentes", (), 10),
+]
+
+
+def summarize(samples):
+    arr = np.asarray(samples, dtype=float)
+    return {
+        "runs": len(arr),
+        "min": round(float(arr.min()), 6),
+        "p50": round(float(np.percentile(arr, 50)), 6),
+        "p95": round(float(np.percentile(arr, 95)), 6),
+        "max": round(float(arr.max()), 6),
+    }
+
+
+def measure(fn, repeat=1):
+    """
+    Executa `fn` `repeat` vezes; retorna (último resultado, estatísticas em segundos)
+    """
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return result, summarize(samples)
+
+
+def prepare_corpus(size_dir, n_reports, params):
+    """
+    Gera o corpus sintético em size_dir/analise-performance (reaproveitado se os parâmetros não mudaram)
+    """
+    marker = os.path.join(size_dir, "corpus.json")
+    wanted = dict(params, reports=n_reports)
+    try:
+        with open(marker, "r", encoding="utf-8") as f:
+            if json.load(f) == wanted:
+                return
+    except (OSError, ValueError):
+        pass
+
+    shutil.rmtree(size_dir, ignore_errors=True)
+    start = time.perf_counter()
+    generate_corpus(
+        os.path.join(size_dir, "analise-performance"),
+        n_reports,
+        n_groups=params["groups"],
+        n_brands=params["brands"],
+        n_keywords=params["keywords"],
+        seed=params["seed"],
+    )
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump(wanted, f)
+    print(f"  corpus gerado em {time.perf_counter() - start:.1f}s")
+
+
+def bench_size(repeat):
+    """
+    Roda todos os benchmarks sobre um corpus de `n_reports` (cwd = diretório do corpus)
+    """
+    base_dir = "analise-performance"
+    results = {}
+
+    paths = list(iter_report_files(base_dir))
+    sample = random.Random(0).sample(paths, min(PARSE_SAMPLE, len(paths)))
+    samples = []
+    for path in sample:
+        start = time.perf_counter()
+        extract_seo_metrics(path, base_dir)
+        samples.append(time.perf_counter() - start)
+    results["extract_seo_metrics"] = summarize(samples)
+
+    # load_seo_data do dashboard = snapshot + schema tipado
+    def load_seo_data():
+        snapshot = load_snapshot(base_dir)
+        return snapshot, dashboard_frame(snapshot.tables["dominios"])
+
+    shutil.rmtree(".seo_cache", ignore_errors=True)
+    _, results["load_seo_data_cold"] = measure(load_seo_data)
+    (snapshot, df_seo), results["load_seo_data_warm"] = measure(load_seo_data, repeat)
+
+    # Usuário "Só Grupo Líder": manifesto + shards dos grupos Líder apenas
+    def load_lider_shards():
+        lider = open_snapshot()
+        return dashboard_frame(lider.load(ShardCatalog(lider.manifest["shards"]).groups_for("Só Grupo Líder"))["dominios"])
+
+    _, results["load_lider_shards"] = measure(load_lider_shards, repeat)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, results["analyze_grupo_lider"] = measure(lambda: analyze_grupo_lider(base_dir), max(1, repeat // 2))
+
+    # Agregações por rerun: cubo, recortes (miss/hit) e página da tabela de palavras-chave
+    cube, results["cube_build"] = measure(lambda: DashboardCube(df_seo), repeat)
+
+    def views():
+        for modo, marcas, top_n in VIEW_FILTERS:
+            cube.view(modo, marcas, top_n)
+
+    samples = []
+    for _ in range(repeat):
+        cube = DashboardCube(df_seo)
+        samples.append(measure(views)[1]["p50"])
+    results["views_miss"] = summarize(samples)
+    _, results["views_hit"] = measure(views, repeat)
+
+    # Score de oportunidade do dataset inteiro (na ingestão) e ranking de um recorte (top-k pelo rank)
+    _, results["opportunity_scores"] = measure(lambda: score_frame(snapshot.tables["dominios"]), max(1, repeat // 2))
+    _, results["opportunity_ranking"] = measure(lambda: cube.ranking_oportunidades("Só Concorrentes", (), k=50), repeat)
+
+    palavras = snapshot.tables["palavras"]
+    _, results["keyword_table_page"] = measure(
+        lambda: query_table(palavras, search="preço", search_cols=["palavra", "marca"], sort_by="volume", page=2),
+        repeat,
+    )
+    index, results["keyword_index_build"] = measure(lambda: KeywordIndex.from_tables(snapshot.tables), max(1, repeat // 2))
+    _, results["keyword_search"] = measure(lambda: index.search("onix preço", df_seo, limit=200), repeat)
+
+    results["_rows"] = {"dominios": len(df_seo), "palavras": len(palavras), "concorrentes": len(snapshot.tables["concorrentes"])}
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compara o p50 de cada benchmark com o baseline; retorna a lista de regressões
+    """
+    regressions = []
+    for size, benches in results["results"].items():
+        for name, stats in benches.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if name.startswith("_") or not base or not base.get("p50"):
+                continue
+            ratio = stats["p50"] / base["p50"]
+            slow = ratio > 1 + tolerance and stats["p50"] >= MIN_COMPARE_SECONDS
+            flag = "  <-- REGRESSÃO" if slow else ""
+            print(f"  {size:>7} {name:<24} {base['p50'] * 1000:.2f}ms -> {stats['p50'] * 1000:.2f}ms ({ratio:.2f}x){flag}")
+            if flag:
+                regressions.append((size, name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos críticos sobre corpora sintéticos")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workdir", default=DEFAULT_WORKDIR, help="onde os corpora sintéticos são gerados")
+    parser.add_argument("--out", default=None, help="JSON de resultados (padrão: <workdir>/results-<data>.json)")
+    parser.add_argument("--baseline", default=None, help="JSON de uma execução anterior para comparar")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="piora relativa do p50 aceita antes de acusar regressão")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--groups", type=int, default=8)
+    parser.add_argument("--brands", type=int, default=6)
+    parser.add_argument("--keywords", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    params = {"groups": args.groups, "brands": args.brands, "keywords": args.keywords, "seed": args.seed}
+    workdir = os.path.abspath(args.workdir)
+    out = os.path.abspath(args.out or os.path.join(workdir, f"results-{time.strftime('%Y%m%d-%H%M%S')}.json"))
+    results = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "params": dict(params, repeat=args.repeat),
+        "results": {},
+    }
+
+    cwd = os.getcwd()
+    for size in args.sizes:
+        print(f"== {size} relatórios")
+        size_dir = os.path.join(workdir, str(size))
+        prepare_corpus(size_dir, size, params)
+        os.chdir(size_dir)
+        try:
+            bench = bench_size(args.repeat)
+        finally:
+            os.chdir(cwd)
+        results["results"][str(size)] = bench
+        for name, stats in bench.items():
+            if not name.startswith("_"):
+                print(f"  {name:<24} p50 {stats['p50'] * 1000:.2f}ms  p95 {stats['p95'] * 1000:.2f}ms  ({stats['runs']} execuções)")
+
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"Resultados: {out}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("Comparação com o baseline (p50):")
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+
+import numpy as np
+import pandas as pd
+
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    Limites de um cache em memória: entradas, bytes estimados e validade (segundos)
+    """
+
+    max_entries: int = 64
+    max_bytes: int = None   # None = só o limite de entradas
+    ttl: float = None       # None = sem expiração
+
+
+# Política central de todos os caches em memória do processo (somados cabem no limite do container).
+# SEO_CACHE_<NOME>_MB sobrescreve o limite de bytes de um cache (ex.: SEO_CACHE_DADOS_MB=256).
+POLICIES = {
+    # Objetos de longa duração (LiveDataset com watcher, cache de figuras): um por base_dir
+    "recursos": CachePolicy(max_entries=4),
+    # Catálogo dos shards (só o manifesto)
+    "catalogo": CachePolicy(max_entries=4, max_bytes=8 * MB),
+    # Tabelas tipadas por (versão, grupos carregados)
+    "dados": CachePolicy(max_entries=8, max_bytes=512 * MB),
+    # Cubos do dashboard por (versão, grupos)
+    "cubos": CachePolicy(max_entries=8, max_bytes=128 * MB),
+    # Recortes (modo, marcas, top_n) dentro de cada cubo
+    "recortes": CachePolicy(max_entries=64, max_bytes=64 * MB, ttl=6 * 3600),
+    # Grafo de concorrentes do corpus inteiro
+    "grafo": CachePolicy(max_entries=2, max_bytes=256 * MB),
+    # Índice invertido de termos por (versão, grupos)
+    "indice_termos": CachePolicy(max_entries=4, max_bytes=512 * MB),
+    # Figuras Plotly estilizadas
+    "figuras": CachePolicy(max_entries=128, max_bytes=64 * MB, ttl=3600),
+}
+
+_MISSING = object()
+
+
+def policy_for(name):
+    """
+    Política do cache `name` com o override de bytes do ambiente aplicado
+    """
+    policy = POLICIES.get(name, CachePolicy())
+    override = os.environ.get(f"SEO_CACHE_{name.upper()}_MB")
+    if override:
+        policy = CachePolicy(policy.max_entries, int(float(override) * MB), policy.ttl)
+    return policy
+
+
+def _array_bytes(arr):
+    # Arrays sobre um memory-map são páginas do arquivo, não memória do processo
+    base = arr
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return 0
+        base = getattr(base, "base", None)
+    return arr.nbytes
+
+
+def estimate_bytes(value, _seen=None, _depth=0):
+    """
+    Bytes aproximados de `value` na memória do processo (DataFrames, arrays, containers e atributos de objetos)
+    """
+    seen = set() if _seen is None else _seen
+    if id(value) in seen or _depth > 6:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, np.ndarray):
+        if value.dtype == object and value.size:
+            # Strings/objetos: média de uma amostra vezes o tamanho
+            sample = value.ravel()[:1000]
+            return value.nbytes + int(sum(sys.getsizeof(v) for v in sample) / len(sample) * value.size)
+        return _array_bytes(value)
+    if isinstance(value, pd.DataFrame):
+        return sum(estimate_bytes(value[col], seen, _depth + 1) for col in value.columns) + value.index.memory_usage()
+    if isinstance(value, pd.Series):
+        values = value.array
+        if isinstance(value.dtype, pd.CategoricalDtype):
+            return _array_bytes(np.asarray(values.codes)) + int(values.categories.memory_usage(deep=True))
+        if value.dtype == object:
+            return int(value.memory_usage(index=False, deep=True))
+        return _array_bytes(value.to_numpy())
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=value.dtype == object))
+    if isinstance(value, (str, bytes, int, float, bool)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_bytes(k, seen, _depth + 1) + estimate_bytes(v, seen, _depth + 1) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset, OrderedDict)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v, seen, _depth + 1) for v in value)
+    if hasattr(value, "to_plotly_json"):
+        return estimate_bytes(value.to_plotly_json(), seen, _depth + 1)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_bytes(vars(value), seen, _depth + 1)
+    return sys.getsizeof(value)
+
+
+class BoundedCache:
+    """
+    Cache LRU com limite de entradas e de bytes estimados, TTL e invalidação por versão do dataset.
+
+    Os valores são compartilhados entre sessões (não são copiados) e não devem ser
+    alterados por quem os lê. Cada chave é construída uma vez: chamadas concorrentes
+    para a mesma chave esperam a primeira. `on_evict(valor)` é chamado ao descartar
+    (por entrada, quando passado a put/get_or_build; senão o do cache), sempre fora
+    do lock: um hook que para uma thread ou reentra no cache não trava os demais.
+    """
+
+    def __init__(self, name, policy=None, on_evict=None):
+        self.name = name
+        self.policy = policy or policy_for(name)
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bytes = 0
+        self._entries = OrderedDict()   # key -> (valor, bytes, criado_em, versão, on_evict)
+        self._versions = {}             # função -> versão do dataset vista por último
+        self._building = {}
+        self._evicted = []              # (valor, on_evict) descartados sob o lock, à espera dos hooks
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            found = self._lookup(key, count=False) is not _MISSING
+        self._run_evict_hooks()
+        return found
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key, count=True):
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        if self.policy.ttl is not None and time.monotonic() - entry[2] > self.policy.ttl:
+            self._drop(key)
+            self.expirations += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        if count:
+            self.hits += 1
+        return entry[0]
+
+    def _drop(self, key):
+        # Chamado com o lock: só remove; os hooks rodam em _run_evict_hooks, depois do lock
+        value, nbytes, _, _, on_evict = self._entries.pop(key)
+        self.bytes -= nbytes
+        if on_evict is not None:
+            self._evicted.append((value, on_evict))
+
+    def _run_evict_hooks(self):
+        with self._lock:
+            evicted, self._evicted = self._evicted, []
+        for value, on_evict in evicted:
+            on_evict(value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._lookup(key)
+        self._run_evict_hooks()
+        return default if value is _MISSING else value
+
+    def put(self, key, value, version=None, on_evict=None):
+        """
+        Guarda `value`; `on_evict` (padrão: o do cache) é chamado quando esta entrada sair
+        """
+        nbytes = estimate_bytes(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, nbytes, time.monotonic(), version, on_evict or self.on_evict)
+            self.bytes += nbytes
+            # A entrada recém-inserida nunca é descartada, mesmo acima do limite de bytes
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.policy.max_entries
+                or (self.policy.max_bytes is not None and self.bytes > self.policy.max_bytes)
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        self._run_evict_hooks()
+        return value
+
+    def get_or_build(self, key, build, version=None, on_evict=None):
+        """
+        Valor de `key`; `build()` só roda quando a chave não está no cache (ou expirou)
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                building = self._building.setdefault(key, threading.Lock())
+        self._run_evict_hooks()
+        if value is not _MISSING:
+            return value
+
+        with building:
+            with self._lock:
+                value = self._lookup(key, count=False)
+            self._run_evict_hooks()
+            if value is not _MISSING:
+                with self._lock:
+                    self.hits += 1
+                return value
+            try:
+                value = build()
+                with self._lock:
+                    self.misses += 1
+                return self.put(key, value, version, on_evict)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+
+    def switch_version(self, owner, version):
+        """
+        Registra a versão do dataset vista por `owner`; True se ela mudou desde a última chamada
+        """
+        with self._lock:
+            changed = owner in self._versions and self._versions[owner] != version
+            self._versions[owner] = version
+            return changed
+
+    def invalidate(self, version=None, match=None):
+        """
+        Descarta as entradas de outras versões do dataset (todas, se `version` for None);
+        `match(key)` restringe às chaves de um dono
+        """
+        with self._lock:
+            stale = [
+                k for k, entry in self._entries.items()
+                if (version is None or entry[3] != version) and (match is None or match(k))
+            ]
+            for key in stale:
+                self._drop(key)
+        self._run_evict_hooks()
+        return len(stale)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "cache": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.policy.max_entries,
+                "bytes": self.bytes,
+                "max_bytes": self.policy.max_bytes,
+                "ttl": self.policy.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+def release(value):
+    """
+    on_evict para recursos com thread/arquivo: chama stop() ou close() se existir
+    """
+    for method in ("stop", "close"):
+        if callable(getattr(value, method, None)):
+            getattr(value, method)()
+            return
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def named_cache(name, policy=None):
+    """
+    Cache nomeado do processo (criado na primeira chamada com a política de POLICIES);
+    `policy` substitui a política do cache, inclusive de um já criado
+    """
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = BoundedCache(name, policy)
+        elif policy is not None:
+            _registry[name].policy = policy
+        return _registry[name]
+
+
+def cached(name, on_evict=None):
+    """
+    Decorator: memoiza a função no cache nomeado `name`, compartilhado entre sessões.
+
+    Como no st.cache_resource, argumentos com "_" no início não entram na chave. Se
+    a função tem um argumento `version`, uma versão nova do dataset descarta as
+    entradas das versões anteriores do mesmo dataset (argumento `dataset`, ex.: o
+    base_dir): sessões em datasets diferentes não invalidam as entradas umas das outras.
+    `on_evict` vale para as entradas desta função, mesmo num cache compartilhado.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+        key_params = [p for p in signature.parameters if not p.startswith("_")]
+        # Posição do dataset na chave (None: a função não distingue datasets)
+        dataset_pos = key_params.index("dataset") + 1 if "dataset" in key_params else None
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (fn.__qualname__,) + tuple(bound.arguments[p] for p in key_params)
+            version = bound.arguments.get("version")
+            dataset = bound.arguments.get("dataset")
+            cache = named_cache(name)
+            if version is not None and cache.switch_version((fn.__qualname__, dataset), version):
+                cache.invalidate(
+                    version,
+                    match=lambda k: k[0] == fn.__qualname__ and (dataset_pos is None or k[dataset_pos] == dataset),
+                )
+            return cache.get_or_build(key, lambda: fn(*args, **kwargs), version, on_evict)
+
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """
+    DataFrame com tamanho, limites e taxa de acerto de cada cache nomeado
+    """
+    with _registry_lock:
+        caches = list(_registry.values())
+    return pd.DataFrame([c.stats() for c in caches])
+
+
+def clear_caches():
+    with _registry_lock:
+        caches = list(_registry.values())
+    for cache in caches:
+        cache.invalidate()
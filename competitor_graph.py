@@ -0,0 +1,183 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from seo_parser import normalize_domain
+
+
+def _csr(n_nodes, src, dst, *weights):
+    """
+    Monta (indptr, indices, *pesos) no formato CSR, com as arestas ordenadas por origem
+    """
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_nodes), out=indptr[1:])
+    return (indptr, dst[order]) + tuple(w[order] for w in weights)
+
+
+class CompetitorGraph:
+    """
+    Grafo de concorrência orgânica: nós = domínios (relatórios + concorrentes citados),
+    arestas = "domínio lista concorrente" com palavras em comum e similaridade (%).
+
+    Guarda adjacência de saída, de entrada e não-direcionada em arrays CSR, de modo
+    que vizinhanças são fatias O(grau) e o caminho mínimo é um Dijkstra sobre arrays.
+    """
+
+    def __init__(self, nodes, src, dst, similaridade, palavras_comuns, marca=None, grupo=None):
+        self.nodes = np.asarray(nodes, dtype=object)
+        self.node_index = {d: i for i, d in enumerate(self.nodes)}
+        self.src = np.asarray(src, dtype=np.int64)
+        self.dst = np.asarray(dst, dtype=np.int64)
+        self.similaridade = np.asarray(similaridade, dtype=np.float64)
+        self.palavras_comuns = np.asarray(palavras_comuns, dtype=np.int64)
+        self.marca = np.asarray(marca if marca is not None else [""] * len(self.src), dtype=object)
+        self.grupo = np.asarray(grupo if grupo is not None else [""] * len(self.src), dtype=object)
+
+        n = len(self.nodes)
+        edge_ids = np.arange(len(self.src))
+        self.out_indptr, self.out_dst, self.out_edge = _csr(n, self.src, self.dst, edge_ids)
+        self.in_indptr, self.in_src, self.in_edge = _csr(n, self.dst, self.src, edge_ids)
+
+        # Não-direcionado para caminhos: custo = 1 - similaridade (mais parecido = mais perto)
+        custo = np.clip(1 - self.similaridade / 100, 1e-3, None)
+        self.und_indptr, self.und_dst, self.und_cost = _csr(
+            n,
+            np.concatenate([self.src, self.dst]),
+            np.concatenate([self.dst, self.src]),
+            np.concatenate([custo, custo]),
+        )
+
+    @classmethod
+    def from_tables(cls, dominios, concorrentes):
+        """
+        Constrói o grafo a partir das tabelas `dominios` e `concorrentes` do snapshot
+        """
+        report_domains = [normalize_domain(d) for d in dominios["dominio"].astype(str)]
+        competitor_domains = concorrentes["concorrente"].astype(str).tolist()
+
+        node_index = {}
+        for d in report_domains + competitor_domains:
+            if d:
+                node_index.setdefault(d, len(node_index))
+
+        # domain_id é o rótulo do índice de `dominios` (global entre shards), não a posição
+        rows = dominios.index.get_indexer(concorrentes["domain_id"].to_numpy())
+        src = [node_index.get(report_domains[i], -1) if i >= 0 else -1 for i in rows]
+        dst = [node_index[d] for d in competitor_domains]
+        keep = np.asarray(src, dtype=np.int64) >= 0
+
+        return cls(
+            list(node_index),
+            np.asarray(src, dtype=np.int64)[keep],
+            np.asarray(dst, dtype=np.int64)[keep],
+            concorrentes["similaridade"].to_numpy()[keep],
+            concorrentes["palavras_comuns"].to_numpy()[keep],
+            concorrentes["marca"].astype(str).to_numpy()[keep],
+            concorrentes["grupo"].astype(str).to_numpy()[keep],
+        )
+
+    @property
+    def n_nodes(self):
+        return len(self.nodes)
+
+    @property
+    def n_edges(self):
+        return len(self.src)
+
+    def node_id(self, dominio):
+        return self.node_index.get(normalize_domain(dominio))
+
+    def _edges_frame(self, edge_ids, other_ids, other_label):
+        return (
+            pd.DataFrame(
+                {
+                    other_label: self.nodes[other_ids],
+                    "similaridade": self.similaridade[edge_ids],
+                    "palavras_comuns": self.palavras_comuns[edge_ids],
+                }
+            )
+            .sort_values("similaridade", ascending=False, kind="stable")
+            .reset_index(drop=True)
+        )
+
+    def competitors(self, dominio):
+        """
+        Concorrentes listados no relatório de `dominio`
+        """
+        i = self.node_id(dominio)
+        if i is None:
+            return self._edges_frame(np.array([], dtype=np.int64), np.array([], dtype=np.int64), "concorrente")
+        a, b = self.out_indptr[i], self.out_indptr[i + 1]
+        return self._edges_frame(self.out_edge[a:b], self.out_dst[a:b], "concorrente")
+
+    def competed_by(self, dominio):
+        """
+        Domínios cujo relatório lista `dominio` como concorrente
+        """
+        i = self.node_id(dominio)
+        if i is None:
+            return self._edges_frame(np.array([], dtype=np.int64), np.array([], dtype=np.int64), "dominio")
+        a, b = self.in_indptr[i], self.in_indptr[i + 1]
+        return self._edges_frame(self.in_edge[a:b], self.in_src[a:b], "dominio")
+
+    def shared_competitors(self, edge_mask=None, min_marcas=2):
+        """
+        Concorrentes citados por `min_marcas` ou mais marcas distintas (opcionalmente só
+        nas arestas de `edge_mask`, ex.: `graph.grupo == "lider"`)
+        """
+        mask = np.ones(self.n_edges, dtype=bool) if edge_mask is None else np.asarray(edge_mask, dtype=bool)
+        edges = pd.DataFrame(
+            {
+                "concorrente": self.nodes[self.dst[mask]],
+                "marca": self.marca[mask],
+                "similaridade": self.similaridade[mask],
+                "palavras_comuns": self.palavras_comuns[mask],
+            }
+        )
+        out = (
+            edges.groupby("concorrente")
+            .agg(
+                marcas=("marca", "nunique"),
+                citacoes=("marca", "size"),
+                similaridade_media=("similaridade", "mean"),
+                palavras_comuns=("palavras_comuns", "sum"),
+                lista_marcas=("marca", lambda s: ", ".join(sorted(set(s)))),
+            )
+            .reset_index()
+        )
+        return out[out["marcas"] >= min_marcas].sort_values(["marcas", "similaridade_media"], ascending=False).reset_index(drop=True)
+
+    def shortest_path(self, origem, destino):
+        """
+        Caminho de menor custo (1 - similaridade) entre dois domínios, ignorando a direção.
+        Retorna (lista de domínios, custo) ou ([], inf) se não houver caminho.
+        """
+        a, b = self.node_id(origem), self.node_id(destino)
+        if a is None or b is None:
+            return [], float("inf")
+
+        dist = {a: 0.0}
+        prev = {}
+        heap = [(0.0, a)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if u == b:
+                break
+            if d > dist.get(u, float("inf")):
+                continue
+            lo, hi = self.und_indptr[u], self.und_indptr[u + 1]
+            for v, w in zip(self.und_dst[lo:hi].tolist(), self.und_cost[lo:hi].tolist()):
+                nd = d + w
+                if nd < dist.get(v, float("inf")):
+                    dist[v] = nd
+                    prev[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        if b not in dist:
+            return [], float("inf")
+        path = [b]
+        while path[-1] != a:
+            path.append(prev[path[-1]])
+        return [self.nodes[i] for i in reversed(path)], dist[b]
@@ -0,0 +1,47 @@
+import hashlib
+from dataclasses import replace
+
+import pandas as pd
+
+from cache_policy import named_cache, policy_for
+
+
+def frame_fingerprint(df):
+    """
+    Hash do conteúdo de um DataFrame (colunas, dtypes, índice e valores)
+    """
+    h = hashlib.sha1(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class FigureCache:
+    """
+    LRU de figuras Plotly já estilizadas, por (tipo de gráfico, hash dos dados, tema).
+
+    As figuras guardadas são compartilhadas e não devem ser alteradas depois de
+    montadas: quem precisar ajustar algo deve incluir o ajuste no `build`.
+    Limites de entradas, bytes e TTL vêm da política "figuras" (cache_policy); o cache
+    é o nomeado "figuras", que aparece em cache_stats() junto dos demais.
+    """
+
+    def __init__(self, max_figures=None):
+        policy = None
+        if max_figures is not None:
+            policy = replace(policy_for("figuras"), max_entries=max_figures)
+        self._cache = named_cache("figuras", policy)
+
+    @property
+    def max_figures(self):
+        return self._cache.policy.max_entries
+
+    def get_or_build(self, kind, df, theme, build):
+        """
+        Retorna a figura de `kind` para `df` no tema `theme`; `build(df)` só é
+        chamado quando a combinação ainda não está no cache
+        """
+        return self._cache.get_or_build((kind, frame_fingerprint(df), theme), lambda: build(df))
+
+    def stats(self):
+        stats = self._cache.stats()
+        return dict(stats, figures=stats["entries"], max_figures=stats["max_entries"])
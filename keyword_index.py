@@ -0,0 +1,197 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Fontes indexadas: tabela do snapshot -> (coluna de texto, fonte)
+INDEX_SOURCES = {
+    "palavras": ("palavra", "organica"),
+    "palavras_pagas": ("palavra", "paga"),
+    "anuncios": ("titulo", "anuncio"),
+}
+SOURCE_LABELS = {"organica": "Orgânica", "paga": "Paga", "anuncio": "Anúncio"}
+TOKEN_RE = re.compile(r"[0-9a-z]+")
+# Ocorrências devolvidas por busca (as de maior volume)
+DEFAULT_SEARCH_LIMIT = 1000
+
+
+def fold_text(text):
+    """
+    Minúsculas sem acentos ("Consórcio" -> "consorcio")
+    """
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(fold_text(text))
+
+
+def _csr_gather(indptr, indices, ids):
+    """
+    Concatena as linhas `ids` de uma matriz CSR sem laço em Python
+    """
+    starts = indptr[ids]
+    counts = indptr[ids + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    return indices[offsets]
+
+
+def _take(values, rows):
+    """
+    values[rows] (posições) como strings; colunas categóricas são lidas pelos códigos (custo O(len(rows)))
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        labels = np.asarray(values.cat.categories, dtype=object)
+        return labels[values.cat.codes.to_numpy()[rows]]
+    return values.astype(str).to_numpy()[rows]
+
+
+def _csr(n_rows, row_ids, values):
+    order = np.argsort(row_ids, kind="stable")
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_ids, minlength=n_rows), out=indptr[1:])
+    return indptr, values[order]
+
+
+class KeywordIndex:
+    """
+    Índice invertido das palavras-chave orgânicas, pagas e títulos de anúncios.
+
+    Os tokens são extraídos do vocabulário de textos (cada texto distinto uma vez, não
+    cada linha). token -> textos e texto -> ocorrências ficam em CSR; o vocabulário de
+    tokens é ordenado, então um prefixo é uma faixa contígua (searchsorted) e a busca
+    custa O(log V + resultados), independente do total de linhas.
+    """
+
+    def __init__(self, texts, text_id, domain_id, fonte, volume, posicao, trafego):
+        self.texts = np.asarray(texts, dtype=object)
+        self.text_id = np.asarray(text_id, dtype=np.int64)
+        self.domain_id = np.asarray(domain_id, dtype=np.int64)
+        self.fonte = np.asarray(fonte, dtype=np.int8)
+        self.volume = np.asarray(volume, dtype=np.int64)
+        self.posicao = np.asarray(posicao, dtype=np.int32)
+        self.trafego = np.asarray(trafego, dtype=np.float64)
+
+        pairs = {}
+        for i, text in enumerate(self.texts):
+            for token in set(tokenize(text)):
+                pairs.setdefault(token, []).append(i)
+        self.tokens = np.asarray(sorted(pairs), dtype=object)
+        counts = np.fromiter((len(pairs[t]) for t in self.tokens), dtype=np.int64, count=len(self.tokens))
+        self.token_indptr = np.zeros(len(self.tokens) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.token_indptr[1:])
+        self.token_texts = np.fromiter(
+            (i for t in self.tokens for i in pairs[t]), dtype=np.int64, count=int(self.token_indptr[-1])
+        )
+
+        self.text_indptr, self.text_rows = _csr(len(self.texts), self.text_id, np.arange(len(self.text_id)))
+
+    @classmethod
+    def from_tables(cls, tables):
+        """
+        Monta o índice a partir das tabelas do snapshot (textos categóricos: o vocabulário já é único)
+        """
+        vocab = {}
+        parts = []
+        for fonte, (table, (col, _)) in enumerate(INDEX_SOURCES.items()):
+            frame = tables[table]
+            # Shards são fatias das tabelas globais: o vocabulário traz textos de outros grupos
+            values = pd.Categorical(frame[col]).remove_unused_categories()
+            global_ids = np.fromiter(
+                (vocab.setdefault(str(c), len(vocab)) for c in values.categories),
+                dtype=np.int64,
+                count=len(values.categories),
+            )
+            codes = np.asarray(values.codes)
+            keep = codes >= 0
+            n = int(keep.sum())
+            parts.append(
+                (
+                    global_ids[codes[keep]],
+                    frame["domain_id"].to_numpy()[keep],
+                    np.full(n, fonte, dtype=np.int8),
+                    frame["volume"].to_numpy()[keep] if "volume" in frame else np.zeros(n, dtype=np.int64),
+                    frame["posicao"].to_numpy()[keep] if "posicao" in frame else np.zeros(n, dtype=np.int32),
+                    frame["trafego"].to_numpy()[keep] if "trafego" in frame else np.full(n, np.nan),
+                )
+            )
+        columns = [np.concatenate(arrays) for arrays in zip(*parts)]
+        return cls(list(vocab), *columns)
+
+    def token_range(self, token, prefix=False):
+        """
+        Faixa [início, fim) de tokens iguais a `token` (ou que começam com ele)
+        """
+        lo = int(np.searchsorted(self.tokens, token, side="left"))
+        if prefix:
+            hi = int(np.searchsorted(self.tokens, token + "\uffff", side="left"))
+        else:
+            hi = lo + 1 if lo < len(self.tokens) and self.tokens[lo] == token else lo
+        return lo, hi
+
+    def match_texts(self, query, prefix=True):
+        """
+        Textos com todos os tokens da consulta; o último token vale como prefixo (busca enquanto digita)
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+        result = None
+        for i, token in enumerate(tokens):
+            lo, hi = self.token_range(token, prefix=prefix and i == len(tokens) - 1)
+            texts = np.unique(self.token_texts[self.token_indptr[lo]:self.token_indptr[hi]])
+            result = texts if result is None else np.intersect1d(result, texts, assume_unique=True)
+            if not len(result):
+                break
+        return result
+
+    def postings(self, query, prefix=True):
+        """
+        Posições (linhas do índice) das ocorrências que casam com a consulta
+        """
+        return _csr_gather(self.text_indptr, self.text_rows, self.match_texts(query, prefix))
+
+    def search(self, query, dominios, prefix=True, domain_ids=None, limit=None):
+        """
+        Ocorrências da consulta como DataFrame (domínio, texto, fonte, volume, posição, tráfego %),
+        por volume decrescente; `domain_ids` restringe aos domínios do recorte
+        """
+        rows = self.postings(query, prefix)
+        if domain_ids is not None:
+            rows = rows[np.isin(self.domain_id[rows], np.asarray(domain_ids))]
+        if limit is not None and len(rows) > limit:
+            # Só os `limit` de maior volume são ordenados (seleção parcial)
+            rows = rows[np.argpartition(-self.volume[rows], limit - 1)[:limit]]
+        rows = rows[np.argsort(-self.volume[rows], kind="stable")]
+
+        # domain_id é rótulo do índice de `dominios` (shards carregados guardam o id global)
+        domain_rows = dominios.index.get_indexer(self.domain_id[rows])
+        fontes = np.asarray([SOURCE_LABELS[f] for _, f in INDEX_SOURCES.values()], dtype=object)
+        return pd.DataFrame(
+            {
+                "Domínio": _take(dominios["dominio"], domain_rows),
+                "Grupo": _take(dominios["grupo"], domain_rows),
+                "Marca": _take(dominios["marca"], domain_rows),
+                "Termo": self.texts[self.text_id[rows]],
+                "Fonte": fontes[self.fonte[rows]],
+                "Volume": self.volume[rows],
+                "Posição": pd.Series(self.posicao[rows]).where(lambda p: p > 0).astype("Int32").to_numpy(),
+                "Tráfego (%)": self.trafego[rows],
+            }
+        )
+
+    def suggest(self, prefix, limit=10):
+        """
+        Tokens que começam com `prefix`, os mais frequentes primeiro
+        """
+        token = fold_text(prefix).strip()
+        if not token:
+            return []
+        lo, hi = self.token_range(token, prefix=True)
+        freq = np.diff(self.token_indptr[lo:hi + 1])
+        return self.tokens[lo:hi][np.argsort(-freq, kind="stable")][:limit].tolist()
+
+    def stats(self):
+        return {"tokens": len(self.tokens), "textos": len(self.texts), "ocorrencias": len(self.text_id)}
@@ -0,0 +1,141 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Métricas do score -> peso: +1 autoridade (quanto maior, mais oportunidade), -1 desempenho
+SCORE_METRICS = {
+    "backlinks": 1.0,
+    "dominos_referencia": 1.0,
+    "trafego_organico": -1.0,
+    "palavras_chave_organicas": -1.0,
+    "share_top3": -1.0,
+}
+# Coortes menores que isso usam as estatísticas do dataset inteiro
+MIN_COHORT = 3
+# Acima de 50 a autoridade supera o desempenho dentro da coorte
+OPPORTUNITY_THRESHOLD = 50.0
+# Montadoras reconhecidas na marca/domínio ("fiatbarigui.com.br" -> fiat)
+BRANDS = (
+    "fiat", "chevrolet", "volkswagen", "toyota", "renault", "jeep", "ram", "honda", "hyundai", "nissan",
+    "ford", "peugeot", "citroen", "byd", "gwm", "bmw", "audi", "mercedes", "kia", "mitsubishi", "lexus",
+    "volvo", "chery", "suzuki", "subaru", "land rover", "jaguar", "porsche", "dodge",
+)
+OTHER_COHORT = "outras"
+
+def _brand_pattern(brand):
+    # Início de token ("fiatbarigui" -> fiat); siglas curtas só como token inteiro ("ram", não "ramos")
+    pattern = r"[\s_-]?".join(re.escape(word) for word in brand.split())
+    return pattern + r"(?![a-z])" if len(brand) <= 3 else pattern
+
+
+BRAND_RE = re.compile(
+    r"(?<![a-z0-9])(?:" + "|".join(_brand_pattern(b) for b in sorted(BRANDS, key=len, reverse=True)) + ")"
+)
+
+SCORE_SCHEMA = {
+    "coorte": "category",
+    **{f"pct_{m}": "float32" for m in SCORE_METRICS},
+    **{f"z_{m}": "float32" for m in SCORE_METRICS},
+    "score_oportunidade": "float32",
+    "rank_oportunidade": "int32",
+}
+
+
+def brand_of(*texts):
+    """
+    Primeira montadora encontrada no início de um token dos textos (marca, domínio), sem acentos; None se nenhuma
+    """
+    for text in texts:
+        folded = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode().lower()
+        match = BRAND_RE.search(folded)
+        if match:
+            return re.sub(r"[\s_-]", "", match.group(0))
+    return None
+
+
+def cohort_labels(marca, dominio):
+    """
+    Coorte de marca de cada domínio: montadora da pasta da marca ou, na falta, do domínio
+    """
+    pairs = pd.DataFrame({"marca": np.asarray(marca, dtype=object), "dominio": np.asarray(dominio, dtype=object)})
+    # Uma chamada por par distinto, não por linha
+    codes, uniques = pd.factorize(pairs["marca"].astype(str) + "\x00" + pairs["dominio"].astype(str))
+    labels = np.asarray([brand_of(*u.split("\x00")) or OTHER_COHORT for u in uniques], dtype=object)
+    return pd.Categorical(labels[codes])
+
+
+def _cohort_stats(values, codes, n_cohorts):
+    """
+    Média e desvio (ddof=0) de `values` por coorte, devolvidos por linha
+    """
+    counts = np.bincount(codes, minlength=n_cohorts)
+    sums = np.bincount(codes, weights=values, minlength=n_cohorts)
+    squares = np.bincount(codes, weights=values * values, minlength=n_cohorts)
+    mean = sums / np.maximum(counts, 1)
+    std = np.sqrt(np.maximum(squares / np.maximum(counts, 1) - mean * mean, 0))
+    return mean[codes], std[codes], counts[codes]
+
+
+def _zscore(values, mean, std):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(std > 0, (values - mean) / std, 0.0)
+
+
+def score_frame(dominios):
+    """
+    Score de oportunidade de cada domínio, calculado uma vez para o dataset inteiro.
+
+    Para cada métrica: percentil (rank médio) e z-score dentro da coorte de marca
+    (coortes com menos de MIN_COHORT domínios usam o dataset inteiro). O score combina
+    os percentis com os pesos de SCORE_METRICS em 0–100; rank_oportunidade é a ordem
+    global (0 = melhor), para que o top-k de qualquer recorte saia de uma seleção parcial.
+    """
+    n = len(dominios)
+    metrics = {m: pd.to_numeric(dominios[m], errors="coerce").fillna(0).to_numpy(np.float64) for m in SCORE_METRICS if m != "share_top3"}
+    top3 = pd.to_numeric(dominios["palavras_top3"], errors="coerce").fillna(0).to_numpy(np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics["share_top3"] = np.where(metrics["palavras_chave_organicas"] > 0, top3 / metrics["palavras_chave_organicas"], 0.0)
+
+    cohort = cohort_labels(dominios["marca"], dominios["dominio"])
+    codes = np.asarray(cohort.codes)
+    n_cohorts = len(cohort.categories)
+    global_codes = np.zeros(n, dtype=np.int64)
+
+    cols = {"coorte": cohort}
+    composite = np.zeros(n)
+    for metric, weight in SCORE_METRICS.items():
+        values = metrics[metric]
+        mean, std, counts = _cohort_stats(values, codes, n_cohorts)
+        g_mean, g_std, _ = _cohort_stats(values, global_codes, 1)
+        small = counts < MIN_COHORT
+        # Ranks percentuais vetorizados por coorte (groupby.rank em Cython)
+        pct = pd.Series(values).groupby(codes).rank(method="average", pct=True).to_numpy()
+        g_pct = pd.Series(values).rank(method="average", pct=True).to_numpy()
+        pct = np.where(small, g_pct, pct)
+        z = np.where(small, _zscore(values, g_mean, g_std), _zscore(values, mean, std))
+        cols[f"pct_{metric}"] = pct.astype(np.float32)
+        cols[f"z_{metric}"] = z.astype(np.float32)
+        composite += weight * (pct - 0.5)
+
+    weights = sum(abs(w) for w in SCORE_METRICS.values())
+    score = (composite / weights + 0.5) * 100 if n else composite
+    # Desempate pelo z-score de autoridade e depois pela ordem de entrada (estável)
+    authority = sum(w * cols[f"z_{m}"].astype(np.float64) for m, w in SCORE_METRICS.items() if w > 0)
+    order = np.lexsort((np.arange(n), -authority, -score))
+    rank = np.empty(n, dtype=np.int32)
+    rank[order] = np.arange(n, dtype=np.int32)
+    cols["score_oportunidade"] = score.astype(np.float32)
+    cols["rank_oportunidade"] = rank
+    return pd.DataFrame(cols, index=dominios.index)[list(SCORE_SCHEMA)]
+
+
+def top_k(rank, rows, k):
+    """
+    As `k` posições de `rows` com melhor rank: seleção parcial (argpartition) + ordenação só dos k
+    """
+    rows = np.asarray(rows)
+    if k is not None and len(rows) > k:
+        rows = rows[np.argpartition(rank[rows], k - 1)[:k]]
+    return rows[np.argsort(rank[rows], kind="stable")]
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+
+from seo_parser import PARSER_VERSION
+
+DEFAULT_CACHE_PATH = os.path.join(".seo_cache", "parse_cache.json")
+
+
+def file_sha1(path, chunk_size=1 << 16):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    Cache em disco das métricas extraídas de cada relatório.
+
+    Cada entrada guarda (size, mtime, sha1) do arquivo. Se size e mtime batem,
+    a entrada é usada sem ler o arquivo; se só o mtime mudou, o sha1 decide.
+    """
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._seen = set()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("parser_version") == PARSER_VERSION:
+            self.entries = data.get("entries", {})
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"parser_version": PARSER_VERSION, "entries": self.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+        self._dirty = False
+
+    def lookup(self, path):
+        """
+        Retorna (metrics, None) se o arquivo não mudou, ou (None, stamp) se precisa
+        ser reprocessado; `stamp` deve ser repassado a store()
+        """
+        key = os.path.normpath(path)
+        self._seen.add(key)
+        st = os.stat(path)
+        entry = self.entries.get(key)
+
+        if entry and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+            self.hits += 1
+            return entry["metrics"], None
+
+        sha1 = file_sha1(path)
+        if entry and entry["sha1"] == sha1:
+            entry["size"], entry["mtime"] = st.st_size, st.st_mtime
+            self._dirty = True
+            self.hits += 1
+            return entry["metrics"], None
+
+        self.misses += 1
+        return None, (st.st_size, st.st_mtime, sha1)
+
+    def store(self, path, stamp, metrics):
+        key = os.path.normpath(path)
+        if metrics is not None:
+            size, mtime, sha1 = stamp
+            self.entries[key] = {"size": size, "mtime": mtime, "sha1": sha1, "metrics": metrics}
+            self._dirty = True
+        elif key in self.entries:
+            del self.entries[key]
+            self._dirty = True
+
+    def get_or_parse(self, path, parse_fn):
+        """
+        Retorna as métricas de `path`, reaproveitando o cache quando o arquivo não mudou
+        """
+        metrics, stamp = self.lookup(path)
+        if stamp is None:
+            return metrics
+        metrics = parse_fn(path)
+        self.store(path, stamp, metrics)
+        return metrics
+
+    def prune(self, base_dir=None):
+        """
+        Remove entradas de arquivos que não foram vistos nesta leitura (apagados)
+        """
+        prefix = os.path.normpath(base_dir) + os.sep if base_dir else None
+        for key in list(self.entries):
+            if key in self._seen:
+                continue
+            if prefix is None or key.startswith(prefix):
+                del self.entries[key]
+                self._dirty = True
+        self._seen.clear()
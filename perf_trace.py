@@ -0,0 +1,134 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+import pandas as pd
+
+# Instrumentação opcional: SEO_PROFILE=1 (ou ?profile=1 na URL do dashboard)
+PROFILE_ENV = "SEO_PROFILE"
+DEFAULT_LOG_PATH = os.environ.get("SEO_PROFILE_LOG", os.path.join(".seo_cache", "profile.jsonl"))
+# Amostras por seção mantidas em memória para p50/p95 (todas as sessões do processo)
+HISTORY_SIZE = 500
+
+_history = {}
+_history_lock = threading.Lock()
+_log_lock = threading.Lock()
+
+
+def profiling_enabled(query_value=None):
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0") or query_value in ("1", "true", "on")
+
+
+def section_percentiles():
+    """
+    DataFrame com n, p50 e p95 (ms) de cada seção já medida neste processo
+    """
+    with _history_lock:
+        items = [(name, np.asarray(samples)) for name, samples in _history.items()]
+    return pd.DataFrame(
+        [
+            {"Seção": name, "n": len(arr), "p50 (ms)": np.percentile(arr, 50), "p95 (ms)": np.percentile(arr, 95)}
+            for name, arr in items
+        ],
+        columns=["Seção", "n", "p50 (ms)", "p95 (ms)"],
+    ).round(1)
+
+
+class RerunProfiler:
+    """
+    Mede seções nomeadas de um rerun do dashboard. Desligado, section() é um nullcontext.
+
+    Cada seção vira uma amostra no histórico do processo (p50/p95); finish() grava
+    uma linha JSON por rerun com as seções e os hits/misses dos caches observados.
+    Reruns só de um @st.fragment usam fragment(): viram uma linha própria no log.
+    """
+
+    def __init__(self, enabled=False, log_path=DEFAULT_LOG_PATH):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.sections = []
+        self._depth = 0
+        self._caches = {}
+        self._start = time.perf_counter()
+        self._finished = False
+
+    def section(self, name):
+        return self._timed(name) if self.enabled else nullcontext()
+
+    def fragment(self, name):
+        """
+        Seção de um @st.fragment. No rerun completo é uma seção comum; num rerun só do
+        fragmento (profiler do script já fechado) abre uma medição nova e a fecha no fim
+        """
+        if not self.enabled:
+            return nullcontext()
+        if not self._finished:
+            return self._timed(name)
+        return self._fragment_run(name)
+
+    @contextmanager
+    def _fragment_run(self, name):
+        self.sections = []
+        self._depth = 0
+        self._caches = {cache: (stats_fn, stats_fn()) for cache, (stats_fn, _) in self._caches.items()}
+        self._start = time.perf_counter()
+        self._finished = False
+        try:
+            with self._timed(name):
+                yield
+        finally:
+            self.finish(fragmento=name)
+
+    @contextmanager
+    def _timed(self, name):
+        depth = self._depth
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self._depth = depth
+            self.sections.append({"secao": name, "nivel": depth, "ms": round(elapsed, 3)})
+            with _history_lock:
+                _history.setdefault(name, deque(maxlen=HISTORY_SIZE)).append(elapsed)
+
+    def watch_cache(self, name, stats_fn):
+        """
+        Registra um cache com stats() -> {"hits", "misses", ...}; o rerun reporta o delta
+        """
+        if self.enabled and name not in self._caches:
+            self._caches[name] = (stats_fn, stats_fn())
+
+    def cache_deltas(self):
+        deltas = {}
+        for name, (stats_fn, before) in self._caches.items():
+            after = stats_fn()
+            deltas[name] = {k: after[k] - before.get(k, 0) for k in ("hits", "misses") if k in after}
+        return deltas
+
+    def finish(self, **extra):
+        """
+        Fecha o rerun: grava a linha JSONL e retorna o registro
+        """
+        if not self.enabled:
+            return None
+        self._finished = True
+        record = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "total_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "secoes": self.sections,
+            "caches": self.cache_deltas(),
+            **extra,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+            with _log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Erro ao gravar perfil: {str(e)}")
+        return record
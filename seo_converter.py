@@ -0,0 +1,123 @@
+import argparse
+import json
+import os
+import time
+
+from parse_cache import ParseCache, file_sha1
+from seo_parser import DEFAULT_BASE_DIR, PARSER_VERSION, parse_report, path_labels
+
+# Estado do conversor: (size, mtime, sha1) de cada TXT já convertido
+DEFAULT_STATE_PATH = os.path.join(".seo_cache", "converter_state.json")
+FORMAT_VERSION = 1
+
+
+def is_txt_report(file_name):
+    """
+    Só os relatórios "Página N:" (analise_detalhada*.txt) lidos pelo parser; os relatorio_*.txt
+    têm outro formato e seus JSON versionados não são regravados
+    """
+    return file_name.endswith(".txt") and "analise_detalhada" in file_name
+
+
+def iter_txt_reports(base_dir=DEFAULT_BASE_DIR):
+    """
+    Lista os relatórios TXT na ordem do os.walk
+    """
+    for root, _, files in os.walk(base_dir):
+        for file in files:
+            if is_txt_report(file):
+                yield os.path.join(root, file)
+
+
+def json_path_for(txt_path):
+    return os.path.splitext(txt_path)[0] + ".json"
+
+
+def _tee(lines, sink):
+    for line in lines:
+        sink.append(line)
+        yield line
+
+
+def convert_file(txt_path, sha1, base_dir=DEFAULT_BASE_DIR, raw=False):
+    """
+    Converte um TXT em JSON estruturado ({"registro": ...}), lendo o arquivo linha a linha.
+    O texto bruto só é incluído (em "conteudo") com raw=True.
+    """
+    json_path = json_path_for(txt_path)
+    lines = []
+    with open(txt_path, "r", encoding="utf-8") as f:
+        record = parse_report(_tee(f, lines) if raw else f)
+    record.grupo, record.marca, record.concessionaria = path_labels(json_path, base_dir)
+
+    data = {
+        "formato": FORMAT_VERSION,
+        "parser_version": PARSER_VERSION,
+        "fonte": os.path.basename(txt_path),
+        "sha1": sha1,
+        "registro": record.to_dict(),
+    }
+    if raw:
+        data["conteudo"] = "".join(lines)
+
+    tmp_path = f"{json_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, json_path)
+    return json_path
+
+
+def convert_tree(base_dir=DEFAULT_BASE_DIR, state_path=DEFAULT_STATE_PATH, raw=False, force=False):
+    """
+    Converte os TXT de `base_dir` que mudaram desde a última execução (ou cujo JSON
+    sumiu / foi gerado com outro `raw`). Retorna (convertidos, inalterados, erros).
+    """
+    state = ParseCache(state_path)
+    converted = unchanged = 0
+    errors = []
+
+    for txt_path in iter_txt_reports(base_dir):
+        entry, stamp = state.lookup(txt_path)
+        json_path = json_path_for(txt_path)
+        if stamp is None:
+            if not force and entry.get("raw") == raw and os.path.exists(json_path):
+                unchanged += 1
+                continue
+            st = os.stat(txt_path)
+            stamp = (st.st_size, st.st_mtime, file_sha1(txt_path))
+
+        try:
+            convert_file(txt_path, stamp[2], base_dir=base_dir, raw=raw)
+        except Exception as e:
+            errors.append((txt_path, str(e)))
+            print(f"Erro ao converter {txt_path}: {str(e)}")
+            state.store(txt_path, stamp, None)
+            continue
+
+        state.store(txt_path, stamp, {"raw": raw})
+        converted += 1
+        print(f"Arquivo convertido: {json_path}")
+
+    state.prune(base_dir)
+    state.save()
+    return converted, unchanged, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte relatórios TXT do SEMrush em JSON estruturado (incremental)")
+    parser.add_argument("base_dir", nargs="?", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--raw", action="store_true", help="inclui o texto bruto no JSON")
+    parser.add_argument("--force", action="store_true", help="reconverte mesmo sem alterações")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="arquivo de estado do conversor")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    converted, unchanged, errors = convert_tree(args.base_dir, args.state, raw=args.raw, force=args.force)
+    print(
+        f"Conversão concluída! {converted} convertidos, {unchanged} inalterados, "
+        f"{len(errors)} erros em {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
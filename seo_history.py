@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: só o lock entre threads do processo
+    fcntl = None
+
+import numpy as np
+import pandas as pd
+
+from seo_ingest import DEFAULT_BASE_DIR, DEFAULT_WORKERS, domain_key, ingest_reports, iter_report_files
+from seo_snapshot import METRIC_COLUMNS, read_columns, source_fingerprint, write_columns
+
+HISTORY_VERSION = 2
+DEFAULT_HISTORY_DIR = os.path.join(".seo_cache", "history")
+# Partição de relatórios sem "Data de geração"
+UNDATED_PARTITION = "sem-data"
+
+# Uma linha por (grupo/domínio, Data de geração); `chave` = domain_key do registro
+HISTORY_SCHEMA = {
+    "chave": "category",
+    "grupo": "category",
+    "marca": "category",
+    "concessionaria": "category",
+    "dominio": "category",
+    "data_geracao": "datetime64[D]",
+    **{c: "float32" for c in METRIC_COLUMNS},
+}
+
+
+def partition_of(data_geracao):
+    """
+    Partição mensal ("2025-04") de uma data ISO
+    """
+    return data_geracao[:7] if data_geracao else UNDATED_PARTITION
+
+
+class HistoryStore:
+    """
+    Histórico append-only de snapshots por domínio, particionado por mês de geração.
+
+    Cada ingestão grava só as chaves (domínio, Data de geração) ainda não vistas, como
+    uma parte nova (colunas .npy) dentro de `mes=AAAA-MM/`; nada é reescrito. O índice
+    guarda as chaves e as partes de cada partição, então consultas de tendência abrem
+    só os meses pedidos. Vários processos (watcher do app, CLI) podem acrescentar ao
+    mesmo histórico: o índice é relido e gravado sob um lock de arquivo.
+    """
+
+    def __init__(self, history_dir=DEFAULT_HISTORY_DIR):
+        self.history_dir = history_dir
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _index_path(self):
+        return os.path.join(self.history_dir, "index.json")
+
+    def _load_index(self):
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == HISTORY_VERSION:
+                index["keys"] = set(index["keys"])
+                return index
+        except (OSError, ValueError):
+            pass
+        return {"version": HISTORY_VERSION, "fingerprint": None, "keys": set(), "partitions": {}}
+
+    @contextmanager
+    def _locked(self):
+        """
+        Lock exclusivo do histórico (threads do processo + outros processos via flock)
+        """
+        with self._lock:
+            os.makedirs(self.history_dir, exist_ok=True)
+            with open(os.path.join(self.history_dir, "index.lock"), "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """
+        Relê o índice do disco (partes acrescentadas por outros processos)
+        """
+        self._index = self._load_index()
+
+    def _save_index(self):
+        os.makedirs(self.history_dir, exist_ok=True)
+        tmp_path = f"{self._index_path()}.tmp-{os.getpid()}"
+        data = dict(self._index, keys=sorted(self._index["keys"]))
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self._index_path())
+
+    @property
+    def fingerprint(self):
+        return self._index["fingerprint"]
+
+    def partitions(self):
+        return sorted(self._index["partitions"])
+
+    def ingest(self, records, fingerprint=None):
+        """
+        Acrescenta os registros cujas chaves (domínio, Data de geração) são novas; retorna quantos
+        """
+        with self._locked():
+            # Outro processo pode ter acrescentado partes desde a última leitura
+            self.refresh()
+            seen = self._index["keys"]
+            novos = {}
+            for record in records:
+                key = f"{domain_key(record)}|{record.data_geracao}"
+                if key in seen:
+                    continue
+                seen.add(key)
+                novos.setdefault(partition_of(record.data_geracao), []).append(record)
+
+            for partition, part_records in novos.items():
+                parts = self._index["partitions"].setdefault(partition, [])
+                part_name = f"part-{len(parts):05d}-{os.getpid()}"
+                part_dir = os.path.join(self.history_dir, f"mes={partition}", part_name)
+                tmp_dir = f"{part_dir}.tmp"
+                os.makedirs(tmp_dir, exist_ok=True)
+                cols = {
+                    "chave": [domain_key(r) for r in part_records],
+                    "grupo": [r.grupo for r in part_records],
+                    "marca": [r.marca for r in part_records],
+                    "concessionaria": [r.concessionaria for r in part_records],
+                    "dominio": [r.dominio for r in part_records],
+                    "data_geracao": [r.data_geracao or "NaT" for r in part_records],
+                    **{c: [getattr(r, c) or 0 for r in part_records] for c in METRIC_COLUMNS},
+                }
+                meta = write_columns(tmp_dir, "dominios", cols, HISTORY_SCHEMA)
+                with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+                    json.dump(meta, f, ensure_ascii=False)
+                os.replace(tmp_dir, part_dir)
+                parts.append(part_name)
+
+            if novos or fingerprint != self._index["fingerprint"]:
+                self._index["fingerprint"] = fingerprint
+                self._save_index()
+            return sum(len(v) for v in novos.values())
+
+    def sync(self, base_dir=DEFAULT_BASE_DIR, workers=DEFAULT_WORKERS):
+        """
+        Ingere o corpus se ele mudou desde a última ingestão (relatórios vêm do cache de parsing)
+        """
+        fingerprint = source_fingerprint(iter_report_files(base_dir))
+        self.refresh()
+        if fingerprint == self.fingerprint:
+            return 0
+        records, _, _ = ingest_reports(base_dir, workers=workers)
+        return self.ingest(records, fingerprint)
+
+    def read(self, start=None, end=None, columns=None, undated=False):
+        """
+        Linhas das partições entre `start` e `end` ("AAAA-MM", inclusive); só essas partes são abertas
+        """
+        self.refresh()
+        frames = []
+        for partition in self.partitions():
+            if partition == UNDATED_PARTITION:
+                if not undated:
+                    continue
+            elif (start and partition < start) or (end and partition > end):
+                continue
+            for part_name in self._index["partitions"][partition]:
+                part_dir = os.path.join(self.history_dir, f"mes={partition}", part_name)
+                with open(os.path.join(part_dir, "manifest.json"), "r", encoding="utf-8") as f:
+                    meta = json.load(f)
+                frames.append(read_columns(part_dir, meta, columns))
+        if not frames:
+            return pd.DataFrame(columns=columns or list(HISTORY_SCHEMA))
+        return pd.concat(frames, ignore_index=True)
+
+    def latest(self, start=None, end=None):
+        """
+        Snapshot mais recente de cada domínio no intervalo
+        """
+        frame = self.read(start, end, undated=True)
+        frame = frame.assign(chave=frame["chave"].astype(str))
+        frame = frame.sort_values("data_geracao", na_position="first", kind="stable")
+        return frame.drop_duplicates("chave", keep="last").sort_index().reset_index(drop=True)
+
+    def trend(self, metric="trafego_organico", by="grupo", start=None, end=None):
+        """
+        Série mensal de `metric` somada por `by`, usando o último snapshot de cada domínio em cada mês
+        """
+        frame = self.read(start, end, columns=["chave", by, "data_geracao", metric])
+        if frame.empty:
+            return pd.DataFrame()
+        frame = frame.assign(mes=frame["data_geracao"].dt.to_period("M"), chave=frame["chave"].astype(str))
+        frame = frame.sort_values("data_geracao", kind="stable").drop_duplicates(["chave", "mes"], keep="last")
+        return (
+            frame.astype({metric: np.float64})
+            .pivot_table(index="mes", columns=by, values=metric, aggfunc="sum", observed=True)
+            .fillna(0)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Histórico de snapshots por domínio e Data de geração (partições mensais)")
+    parser.add_argument("base_dir", nargs="?", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--history", default=DEFAULT_HISTORY_DIR, help="diretório do histórico")
+    parser.add_argument("--desde", default=None, help="primeiro mês (AAAA-MM)")
+    parser.add_argument("--ate", default=None, help="último mês (AAAA-MM)")
+    parser.add_argument("--metrica", default="trafego_organico", choices=METRIC_COLUMNS)
+    parser.add_argument("--por", default="grupo", choices=["grupo", "marca", "dominio"])
+    args = parser.parse_args()
+
+    store = HistoryStore(args.history)
+    start = time.perf_counter()
+    novos = store.sync(args.base_dir)
+    print(f"{novos} snapshots novos em {time.perf_counter() - start:.2f}s • partições: {', '.join(store.partitions()) or '-'}")
+    print(store.trend(args.metrica, args.por, args.desde, args.ate).round(0).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from parse_cache import DEFAULT_CACHE_PATH, ParseCache
+from seo_parser import DEFAULT_BASE_DIR, ReportRecord, parse_report_file
+
+# Paralelismo: SEO_INGEST_WORKERS=0 -> automático (cpu_count), 1 -> serial
+DEFAULT_WORKERS = int(os.environ.get("SEO_INGEST_WORKERS", "0"))
+DEFAULT_BATCH_SIZE = int(os.environ.get("SEO_INGEST_BATCH_SIZE", "64"))
+# Abaixo disso o custo de subir o pool não compensa
+PARALLEL_MIN_FILES = 200
+
+
+def is_report_file(file_name):
+    return file_name.endswith(".json") and "analise_detalhada" in file_name
+
+
+def iter_report_files(base_dir=DEFAULT_BASE_DIR):
+    """
+    Lista os relatórios (analise_detalhada*.json) na ordem do os.walk
+    """
+    for root, _, files in os.walk(base_dir):
+        for file in files:
+            if is_report_file(file):
+                yield os.path.join(root, file)
+
+
+def domain_key(record):
+    """
+    Identidade do domínio dentro do grupo (o mesmo site pode aparecer em dois grupos);
+    relatórios sem domínio usam grupo/marca/concessionária
+    """
+    return f"{record.grupo}/{record.dominio}" if record.dominio else f"{record.grupo}/{record.marca}/{record.concessionaria}"
+
+
+def latest_records(records):
+    """
+    Um registro por domínio de cada grupo: o de "Data de geração" mais recente (empate: o último lido).
+    Mantém a ordem original; exportações antigas do mesmo domínio não somam duas vezes.
+    """
+    latest = {}
+    for i, record in enumerate(records):
+        key = domain_key(record)
+        if key not in latest or record.data_geracao >= records[latest[key]].data_geracao:
+            latest[key] = i
+    keep = set(latest.values())
+    return [record for i, record in enumerate(records) if i in keep]
+
+
+def _parse_batch(paths, base_dir=DEFAULT_BASE_DIR):
+    """
+    Executado nos workers: retorna [(ReportRecord, erro)] na mesma ordem de `paths`
+    """
+    results = []
+    for path in paths:
+        try:
+            results.append((parse_report_file(path, base_dir), None))
+        except Exception as e:
+            results.append((None, str(e)))
+    return results
+
+
+def _batches(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def parse_files(paths, base_dir=DEFAULT_BASE_DIR, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Processa `paths` (serial ou em um ProcessPoolExecutor, em lotes) e retorna
+    [(ReportRecord, erro)] na mesma ordem de entrada
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, max(1, -(-len(paths) // batch_size)))
+
+    if workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return _parse_batch(paths, base_dir)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # executor.map preserva a ordem dos lotes -> resultado determinístico
+        for batch_result in executor.map(partial(_parse_batch, base_dir=base_dir), _batches(paths, batch_size)):
+            results.extend(batch_result)
+    return results
+
+
+def ingest_report_map(
+    base_dir=DEFAULT_BASE_DIR,
+    cache_path=DEFAULT_CACHE_PATH,
+    workers=DEFAULT_WORKERS,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """
+    Extrai as métricas de todos os relatórios, usando o cache de parsing em disco.
+    Só os arquivos novos/alterados são processados (em paralelo, se forem muitos).
+    Retorna ({caminho: ReportRecord} na ordem do os.walk, quantidade de arquivos,
+    lista de erros (caminho, mensagem)).
+    """
+    cache = ParseCache(cache_path)
+    paths = list(iter_report_files(base_dir))
+
+    cached = []
+    pending = []
+    errors = []
+    for i, json_path in enumerate(paths):
+        try:
+            metrics, stamp = cache.lookup(json_path)
+        except OSError as e:
+            # Apagado (ou ilegível) entre a listagem e a leitura: registra como erro e segue
+            errors.append((json_path, str(e)))
+            print(f"Erro ao processar {json_path}: {str(e)}")
+            continue
+        if stamp is None:
+            cached.append((i, ReportRecord.from_dict(metrics)))
+        else:
+            pending.append((i, json_path, stamp))
+
+    by_index = dict(cached)
+    parsed = parse_files([p for _, p, _ in pending], base_dir=base_dir, workers=workers, batch_size=batch_size)
+    for (i, json_path, stamp), (record, error) in zip(pending, parsed):
+        if error is not None:
+            errors.append((json_path, error))
+            print(f"Erro ao processar {json_path}: {error}")
+        cache.store(json_path, stamp, record.to_dict() if record else None)
+        by_index[i] = record
+
+    records = {path: by_index[i] for i, path in enumerate(paths) if by_index.get(i)}
+
+    # Remove do cache relatórios apagados e persiste só se algo mudou
+    cache.prune(base_dir)
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"Erro ao salvar cache de parsing: {str(e)}")
+
+    return records, len(paths), errors
+
+
+def ingest_reports(
+    base_dir=DEFAULT_BASE_DIR,
+    cache_path=DEFAULT_CACHE_PATH,
+    workers=DEFAULT_WORKERS,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    """
+    Como ingest_report_map, mas retorna (lista de ReportRecord, quantidade de arquivos, erros)
+    """
+    records, file_count, errors = ingest_report_map(base_dir, cache_path, workers, batch_size)
+    return list(records.values()), file_count, errors
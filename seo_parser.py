@@ -0,0 +1,439 @@
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from datetime import date
+
+# Incrementar sempre que a extração mudar (invalida caches persistidos)
+PARSER_VERSION = 7
+
+DEFAULT_BASE_DIR = "analise-performance"
+
+# =========================
+# PADRÕES (compilados uma vez)
+# =========================
+NUMBER_RE = re.compile(r"[\d,.]+")
+DOMAIN_RE = re.compile(r"domínio: ([\w\.]+)")
+PAGE_RE = re.compile(r"^Página (\d+):\s*$")
+KEYWORD_RE = re.compile(r'"([^"]*)"')
+URL_RE = re.compile(r"https?://\S+")
+COMPETITOR_RE = re.compile(r"^\s*(?:\d+\.|-)\s*([\w-]+(?:\.[\w-]+)+)\s*–(.*)$")
+QUANTITY_RE = re.compile(r"([\d.,]+)\s*([kKmM]?)")
+SLUG_RE = re.compile(r"^(?:analise_detalhada_|relatorio_)?(.*?)(?:_por_pagina)?$")
+DATA_PT_RE = re.compile(r"(\d{1,2})\s+de\s+([a-zç]+)\s+de\s+(\d{4})", re.IGNORECASE)
+DATA_NUM_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
+MESES = {
+    "janeiro": 1, "fevereiro": 2, "março": 3, "marco": 3, "abril": 4, "maio": 5, "junho": 6,
+    "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10, "novembro": 11, "dezembro": 12,
+}
+
+SECAO_ORGANICA = "Resumo da Busca Orgânica"
+SECAO_PAGA = "Resumo da Busca Paga"
+SECAO_BACKLINKS = "Backlinks"
+
+HEADER_PAISES = "Distribuição das Palavras-chave por País (Busca Orgânica):"
+HEADER_INTENCAO = "Intenção das Palavras-chave:"
+HEADER_PALAVRAS = "Principais Palavras-chave Orgânicas:"
+FIM_PALAVRAS = "Distribuição das Posições"
+SECAO_POSICOES = "Distribuição das Posições"
+
+# Rótulos das colunas nas linhas de palavras-chave
+KEYWORD_LABELS = (("posi", "posicao"), ("volume", "volume"), ("cpc", "cpc"), ("tráfego", "trafego"))
+
+
+@dataclass
+class ReportRecord:
+    """
+    Registro tipado de um relatório; reúne os campos usados pelo dashboard e pelo CLI
+    """
+
+    grupo: str = ""
+    marca: str = ""
+    concessionaria: str = ""
+    dominio: str = ""
+    data_geracao: str = ""  # ISO (AAAA-MM-DD); vazio se o relatório não informar
+    trafego_organico: float = 0
+    trafego_pago: float = 0
+    palavras_chave_organicas: float = 0
+    palavras_chave_pagas: float = 0
+    custo_trafego_organico: float = 0
+    custo_trafego_pago: float = 0
+    backlinks: float = 0
+    dominos_referencia: float = 0
+    posicao_media: float = 0
+    ctr: float = 0
+    palavras_top3: int = 0
+    intencao_palavras_chave: dict = field(default_factory=dict)
+    distribuicao_paises: dict = field(default_factory=dict)
+    top_palavras: list = field(default_factory=list)
+    palavras_pagas: list = field(default_factory=list)
+    anuncios: list = field(default_factory=list)
+    concorrentes: list = field(default_factory=list)
+
+    def to_dict(self):
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def extract_number(text):
+    numbers = NUMBER_RE.findall(text)
+    if numbers:
+        return float(numbers[0].replace(".", "").replace(",", "."))
+    return 0
+
+
+def parse_data_pt(text):
+    """
+    "7 de abril de 2025" (ou "07/04/2025") -> "2025-04-07"; "" se não houver data válida
+    """
+    match = DATA_PT_RE.search(text)
+    if match and match.group(2).lower() in MESES:
+        dia, mes, ano = int(match.group(1)), MESES[match.group(2).lower()], int(match.group(3))
+    else:
+        match = DATA_NUM_RE.search(text)
+        if not match:
+            return ""
+        dia, mes, ano = (int(g) for g in match.groups())
+    try:
+        return date(ano, mes, dia).isoformat()
+    except ValueError:
+        return ""
+
+
+def section_title(line):
+    """
+    Retorna o título da seção se a linha for um cabeçalho ("Backlinks:"), senão None
+    """
+    s = line.strip()
+    if not s.endswith(":") or s.startswith("-") or s[:1].isdigit():
+        return None
+    return s[:-1].strip()
+
+
+def tokenize_report(conteudo):
+    """
+    Percorre o relatório uma única vez, gerando (pagina, secao, linha).
+    `conteudo` pode ser o texto inteiro ou um iterável de linhas (ex.: arquivo aberto).
+    """
+    pagina = 0
+    secao = None
+    lines = conteudo.split("\n") if isinstance(conteudo, str) else (line.rstrip("\n") for line in conteudo)
+    for line in lines:
+        page_match = PAGE_RE.match(line.strip())
+        if page_match:
+            pagina = int(page_match.group(1))
+            secao = None
+        else:
+            titulo = section_title(line)
+            if titulo is not None:
+                secao = titulo
+        yield pagina, secao, line
+
+
+class _Block:
+    """
+    Acumula as linhas de um bloco que começa em `header` e termina antes de uma
+    linha em branco (seguida de `end_prefix`, quando informado). Só o primeiro
+    bloco fechado é aproveitado.
+    """
+
+    def __init__(self, header, end_prefix=None):
+        self.header = header
+        self.end_prefix = end_prefix
+        self.lines = None
+        self.closed = None
+        self._prev_blank = False
+
+    def feed(self, line):
+        if self.closed is not None:
+            return
+        if self.lines is None:
+            idx = line.find(self.header)
+            if idx >= 0:
+                self.lines = [line[idx + len(self.header):]]
+            return
+
+        if self.end_prefix is None:
+            if line == "":
+                self.closed = self.lines
+                return
+        elif self._prev_blank and line.startswith(self.end_prefix):
+            self.closed = self.lines[:-1]
+            return
+
+        self._prev_blank = line == ""
+        self.lines.append(line)
+
+
+def _parse_paises(lines):
+    paises = {}
+    for line in lines:
+        if ":" in line:
+            pais, percentual = line.split(":")
+            pais = pais.replace("-", "").strip()
+            paises[pais] = extract_number(percentual)
+    return paises
+
+
+def _parse_intencao(lines):
+    intencao = {}
+    for line in lines:
+        if ":" in line and "palavras" in line.lower():
+            tipo, resto = line.split(":", 1)
+            tipo = tipo.replace("-", "").strip()
+            palavras = extract_number(resto.split("palavras")[0])
+            trafego = extract_number(resto.split("tráfego")[1]) if "tráfego" in resto else 0
+            percentual = extract_number(resto.split("(")[-1]) if "(" in resto else 0
+            intencao[tipo] = {
+                "palavras": int(palavras),
+                "trafego": int(trafego),
+                "percentual": percentual,
+            }
+    return intencao
+
+
+def parse_keyword_line(line):
+    """
+    Lê uma linha '1. "termo" – Posição: 1 – Volume: 1.000 – Tráfego: 13,53%'
+    pelos rótulos; campos ausentes ou não numéricos ficam 0
+    """
+    partes = line.split("–")
+    quoted = KEYWORD_RE.search(partes[0])
+    palavra = quoted.group(1).strip() if quoted else partes[0].replace('"', "").strip()
+
+    campos = {"posicao": 0, "volume": 0, "cpc": 0, "trafego": 0}
+    for parte in partes[1:]:
+        rotulo, _, valor = parte.partition(":")
+        rotulo = rotulo.strip().lower()
+        for prefixo, campo in KEYWORD_LABELS:
+            if rotulo.startswith(prefixo):
+                campos[campo] = extract_number(valor)
+                break
+    return palavra, campos
+
+
+def _parse_palavras(lines):
+    top_palavras = []
+    for line in lines:
+        if '"' in line and "–" in line:
+            palavra, campos = parse_keyword_line(line)
+            if palavra and campos["volume"] > 0:
+                top_palavras.append(
+                    {
+                        "palavra": palavra,
+                        "posicao": int(campos["posicao"]),
+                        "volume": int(campos["volume"]),
+                        "trafego": campos["trafego"],
+                    }
+                )
+    return top_palavras
+
+
+def _parse_palavra_paga(line):
+    palavra, campos = parse_keyword_line(line)
+    if not palavra:
+        return None
+    return {
+        "palavra": palavra,
+        "posicao": int(campos["posicao"]),
+        "volume": int(campos["volume"]),
+        "cpc": campos["cpc"],
+        "trafego": campos["trafego"],
+    }
+
+
+def _parse_anuncio(line):
+    """
+    '1. "Título" – descrição – https://url' (descrição e URL opcionais)
+    """
+    quoted = KEYWORD_RE.search(line)
+    if not quoted or not quoted.group(1).strip():
+        return None
+    resto = line[quoted.end():]
+    url_match = URL_RE.search(resto)
+    url = url_match.group(0) if url_match else ""
+    if url_match:
+        resto = resto[:url_match.start()]
+    descricao = " – ".join(p.strip() for p in resto.split("–") if p.strip())
+    return {"titulo": quoted.group(1).strip(), "descricao": descricao, "url": url}
+
+
+def extract_quantity(text):
+    """
+    Como extract_number, mas entende sufixos "k"/"m" ("1.4k" -> 1400)
+    """
+    match = QUANTITY_RE.search(text)
+    if not match:
+        return 0
+    if match.group(2):
+        mult = 1_000 if match.group(2).lower() == "k" else 1_000_000
+        return float(match.group(1).replace(",", ".")) * mult
+    return extract_number(match.group(1))
+
+
+def _parse_concorrente(line):
+    """
+    '1. dominio.com.br – 33 palavras em comum – 132 palavras-chave – Similaridade: 33%'
+    (rótulos opcionais; a ordem das colunas é sempre comuns, total, similaridade)
+    """
+    match = COMPETITOR_RE.match(line)
+    if not match:
+        return None
+    partes = [p for p in match.group(2).split("–") if p.strip()]
+    if len(partes) < 3:
+        return None
+    return {
+        "dominio": normalize_domain(match.group(1)),
+        "palavras_comuns": int(extract_quantity(partes[0])),
+        "palavras_chave": int(extract_quantity(partes[1])),
+        "similaridade": extract_number(partes[2].split(":")[-1]),
+    }
+
+
+def normalize_domain(dominio):
+    dominio = dominio.strip().lower()
+    return dominio[4:] if dominio.startswith("www.") else dominio
+
+
+def is_organic_competitors_section(secao):
+    return bool(secao) and "Concorrentes" in secao and "Orgânic" in secao
+
+
+def is_ads_section(secao):
+    return bool(secao) and (secao.startswith("Anúncios") or (secao.startswith("Exemplo") and "Anúncio" in secao))
+
+
+def parse_report(conteudo):
+    """
+    Extrai as métricas de um relatório SEMrush ("Página N:") em uma única passada
+    """
+    record = ReportRecord()
+
+    paises = _Block(HEADER_PAISES)
+    intencao = _Block(HEADER_INTENCAO)
+    palavras = _Block(HEADER_PALAVRAS, end_prefix=FIM_PALAVRAS)
+    dominio = None
+    top3 = None
+
+    for _, secao, line in tokenize_report(conteudo):
+        if dominio is None:
+            domain_match = DOMAIN_RE.search(line)
+            if domain_match:
+                dominio = domain_match.group(1)
+
+        if not record.data_geracao and "Data de geração:" in line:
+            record.data_geracao = parse_data_pt(line)
+        elif secao == SECAO_PAGA and "Tráfego estimado:" in line:
+            record.trafego_pago = extract_number(line)
+        elif secao == SECAO_PAGA and "Palavras-chave pagas:" in line:
+            record.palavras_chave_pagas = extract_number(line)
+        elif secao == SECAO_PAGA and "Custo do tráfego pago:" in line:
+            record.custo_trafego_pago = extract_number(line)
+        elif secao == SECAO_ORGANICA and "Custo do tráfego:" in line:
+            record.custo_trafego_organico = extract_number(line)
+        elif "Tráfego estimado:" in line and secao == SECAO_ORGANICA:
+            record.trafego_organico = extract_number(line)
+        elif "Palavras-chave orgânicas:" in line:
+            record.palavras_chave_organicas = extract_number(line)
+        elif "Total:" in line and secao == SECAO_BACKLINKS:
+            record.backlinks = extract_number(line)
+        elif "Domínios de referência:" in line:
+            record.dominos_referencia = extract_number(line)
+        elif "Posição no ranking" in line:
+            record.posicao_media = extract_number(line)
+        elif "Posições 1-3:" in line and top3 is None and secao and secao.startswith(SECAO_POSICOES):
+            # A primeira distribuição é a orgânica; a da busca paga vem depois
+            top3 = int(extract_number(line.split(":", 1)[1]))
+        elif '"' in line and "–" in line and "CPC:" in line:
+            # Palavras-chave pagas: reconhecidas pela coluna CPC, qualquer que seja o título da seção
+            palavra_paga = _parse_palavra_paga(line)
+            if palavra_paga:
+                record.palavras_pagas.append(palavra_paga)
+
+        if is_organic_competitors_section(secao):
+            concorrente = _parse_concorrente(line)
+            if concorrente:
+                record.concorrentes.append(concorrente)
+
+        if is_ads_section(secao):
+            # Linhas recuadas continuam o anúncio anterior (URL e/ou descrição abaixo do título)
+            continuacao = line[:1].isspace() and bool(line.strip()) and bool(record.anuncios)
+            anuncio = _parse_anuncio(line) if '"' in line and not continuacao else None
+            if anuncio:
+                record.anuncios.append(anuncio)
+            elif record.anuncios and not record.anuncios[-1]["url"] and URL_RE.match(line.strip()):
+                # URL na linha seguinte ao título
+                record.anuncios[-1]["url"] = line.strip()
+            elif continuacao:
+                anterior = record.anuncios[-1]
+                anterior["descricao"] = " ".join(p for p in (anterior["descricao"], line.strip()) if p)
+
+        paises.feed(line)
+        intencao.feed(line)
+        palavras.feed(line)
+
+    if dominio:
+        record.dominio = dominio
+    if top3 is not None:
+        record.palavras_top3 = top3
+    if paises.closed is not None:
+        record.distribuicao_paises = _parse_paises(paises.closed)
+    if intencao.closed is not None:
+        record.intencao_palavras_chave = _parse_intencao(intencao.closed)
+    if palavras.closed is not None:
+        record.top_palavras = _parse_palavras(palavras.closed)
+
+    return record
+
+
+def path_labels(json_path, base_dir=DEFAULT_BASE_DIR):
+    """
+    Deriva (grupo, marca, concessionaria) do caminho relativo a `base_dir`:
+    grupo = primeira pasta, marca = pasta do arquivo, concessionaria = nome do arquivo
+    """
+    rel_parts = os.path.normpath(os.path.relpath(json_path, base_dir)).split(os.sep)
+    if rel_parts[0] == os.pardir:
+        # Fora de base_dir: assume <grupo>/<marca>/<arquivo>
+        rel_parts = os.path.normpath(json_path).split(os.sep)[-3:]
+
+    grupo = rel_parts[0] if len(rel_parts) > 1 else ""
+    marca = rel_parts[-2] if len(rel_parts) > 1 else ""
+    stem = os.path.splitext(rel_parts[-1])[0]
+    concessionaria = SLUG_RE.match(stem).group(1)
+
+    return grupo.replace("grupo-", ""), marca, concessionaria
+
+
+def parse_report_file(json_path, base_dir=DEFAULT_BASE_DIR):
+    """
+    Lê um relatório JSON e retorna um ReportRecord; erros são propagados.
+
+    Aceita o formato bruto ({"conteudo": ...}) e o estruturado do seo_converter
+    ({"registro": ...}); registros de outra PARSER_VERSION são reprocessados a
+    partir do texto (embutido ou do TXT de origem).
+    """
+    with open(json_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    if data.get("registro") is not None and data.get("parser_version") == PARSER_VERSION:
+        record = ReportRecord.from_dict(data["registro"])
+    elif "conteudo" in data or "registro" not in data:
+        record = parse_report(data.get("conteudo", ""))
+    else:
+        fonte = os.path.join(os.path.dirname(json_path), data["fonte"])
+        with open(fonte, "r", encoding="utf-8") as file:
+            record = parse_report(file)
+    record.grupo, record.marca, record.concessionaria = path_labels(json_path, base_dir)
+    return record
+
+
+def extract_seo_metrics(json_path, base_dir=DEFAULT_BASE_DIR):
+    try:
+        return parse_report_file(json_path, base_dir).to_dict()
+    except Exception as e:
+        print(f"Erro ao processar {json_path}: {str(e)}")
+        return None
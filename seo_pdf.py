@@ -0,0 +1,221 @@
+import argparse
+import json
+import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+from parse_cache import ParseCache, file_sha1
+from seo_converter import convert_file
+from seo_ingest import DEFAULT_WORKERS
+from seo_parser import DEFAULT_BASE_DIR, PAGE_RE, SECAO_BACKLINKS, SECAO_ORGANICA, SECAO_PAGA, section_title
+
+# Estado da extração: (size, mtime, sha1) de cada PDF já convertido
+DEFAULT_STATE_PATH = os.path.join(".seo_cache", "pdf_state.json")
+# Texto bruto de cada página por conteúdo (sha1 do PDF): cópias/renomeações não são reextraídas,
+# e mudanças na normalização (pages_to_report) não exigem reler os PDFs
+DEFAULT_TEXT_CACHE_DIR = os.path.join(".seo_cache", "pdf_text")
+# Extrair um PDF custa bem mais que ler um JSON: o pool compensa a partir de poucos arquivos
+PARALLEL_MIN_PDFS = 4
+
+BULLET_RE = re.compile(r"^[•●▪◦·]\s*")
+SPACES_RE = re.compile(r"[ \t]+")
+# Cabeçalhos das exportações em inglês -> seções que o parser reconhece
+SECTION_ALIASES = {
+    "organic search": SECAO_ORGANICA,
+    "paid search": SECAO_PAGA,
+    "backlinks": SECAO_BACKLINKS,
+}
+
+
+def iter_pdf_reports(base_dir=DEFAULT_BASE_DIR):
+    """
+    Lista as exportações PDF na ordem do os.walk
+    """
+    for root, _, files in os.walk(base_dir):
+        for file in files:
+            if file.lower().endswith(".pdf"):
+                yield os.path.join(root, file)
+
+
+def txt_path_for(pdf_path):
+    """
+    TXT no padrão dos relatórios transcritos (analise_detalhada_<nome>_por_pagina.txt)
+    """
+    folder, file = os.path.split(pdf_path)
+    stem = os.path.splitext(file)[0]
+    if not stem.startswith("analise_detalhada"):
+        stem = f"analise_detalhada_{stem}"
+    if not stem.endswith("_por_pagina"):
+        stem = f"{stem}_por_pagina"
+    return os.path.join(folder, f"{stem}.txt")
+
+
+def normalize_line(line):
+    """
+    Limpa uma linha extraída do PDF: ligaduras/compatibilidade (NFKC), espaços, marcadores e cabeçalhos conhecidos
+    """
+    line = SPACES_RE.sub(" ", unicodedata.normalize("NFKC", line).replace("\x00", "")).strip()
+    line = BULLET_RE.sub("- ", line)
+    alias = SECTION_ALIASES.get(line.rstrip(":").strip().lower())
+    return f"{alias}:" if alias else line
+
+
+def pages_to_report(pages):
+    """
+    Texto de cada página -> relatório no formato "Página N:" lido por parse_report
+    """
+    out = []
+    for number, text in enumerate(pages, start=1):
+        # Marcadores "Página N:" impressos no próprio PDF saem: a numeração vem da página real
+        lines = [line for line in map(normalize_line, (text or "").splitlines()) if not PAGE_RE.match(line)]
+        out.append(f"Página {number}:")
+        for line in lines:
+            # O texto do PDF costuma perder as linhas em branco; o parser fecha os blocos
+            # nelas, então cada cabeçalho de seção volta a ser precedido por uma
+            if section_title(line) is not None and out[-1] and not PAGE_RE.match(out[-1]):
+                out.append("")
+            # Uma linha em branco no máximo entre blocos
+            if line or (out[-1] and not PAGE_RE.match(out[-1])):
+                out.append(line)
+        if out[-1]:
+            out.append("")
+    return "\n".join(out)
+
+
+def owns_txt(txt_path, previous):
+    """
+    True se o TXT não existe ou foi gravado por esta etapa (sha1 igual ao registrado no estado);
+    TXT transcritos à mão (fontes versionadas) nunca são sobrescritos sem --force
+    """
+    if not os.path.exists(txt_path):
+        return True
+    return bool(previous) and previous.get("txt_sha1") == file_sha1(txt_path)
+
+
+def extract_pdf_pages(pdf_path):
+    """
+    Texto bruto de cada página do PDF (PyPDF2)
+    """
+    return [page.extract_text() or "" for page in PdfReader(pdf_path).pages]
+
+
+def _extract_one(job):
+    """
+    Executado nos workers: (pdf, sha1, cache_dir) -> (páginas, erro)
+    """
+    pdf_path, sha1, cache_dir = job
+    cached_path = os.path.join(cache_dir, f"{sha1}.json")
+    try:
+        if os.path.exists(cached_path):
+            with open(cached_path, "r", encoding="utf-8") as f:
+                return json.load(f), None
+        pages = extract_pdf_pages(pdf_path)
+        tmp_path = f"{cached_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(pages, f, ensure_ascii=False)
+        os.replace(tmp_path, cached_path)
+        return pages, None
+    except Exception as e:
+        return None, str(e)
+
+
+def extract_pdfs(jobs, workers=DEFAULT_WORKERS):
+    """
+    Extrai os PDFs de `jobs` (serial ou em um ProcessPoolExecutor); [(páginas, erro)] na ordem de entrada
+    """
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    if workers <= 1 or len(jobs) < PARALLEL_MIN_PDFS:
+        return [_extract_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Um PDF por tarefa: páginas custam bem mais que um JSON, lotes desbalanceariam
+        return list(executor.map(_extract_one, jobs))
+
+
+def ingest_pdfs(
+    base_dir=DEFAULT_BASE_DIR,
+    state_path=DEFAULT_STATE_PATH,
+    text_cache_dir=DEFAULT_TEXT_CACHE_DIR,
+    workers=DEFAULT_WORKERS,
+    force=False,
+):
+    """
+    Converte as exportações PDF de `base_dir` em TXT "Página N:" + JSON estruturado
+    (o mesmo caminho do seo_converter), só para PDFs novos ou alterados.
+    Um TXT que já existe e não foi gerado daqui (transcrição manual) é preservado e o PDF
+    ignorado, salvo com `force`. Retorna (convertidos, inalterados, ignorados, erros).
+    """
+    state = ParseCache(state_path)
+    os.makedirs(text_cache_dir, exist_ok=True)
+    unchanged = 0
+    skipped = []
+    pending = []
+
+    for pdf_path in iter_pdf_reports(base_dir):
+        entry, stamp = state.lookup(pdf_path)
+        if stamp is None:
+            if not force and os.path.exists(txt_path_for(pdf_path)):
+                unchanged += 1
+                continue
+            st = os.stat(pdf_path)
+            stamp = (st.st_size, st.st_mtime, entry.get("sha1") or file_sha1(pdf_path))
+        else:
+            # PDF novo/alterado: o estado anterior diz se o TXT atual é nosso
+            entry = state.entries.get(os.path.normpath(pdf_path), {}).get("metrics")
+        if not force and not owns_txt(txt_path_for(pdf_path), entry):
+            skipped.append(pdf_path)
+            print(f"PDF ignorado (TXT existente não gerado do PDF, use --force): {pdf_path}")
+            continue
+        pending.append((pdf_path, stamp))
+
+    errors = []
+    converted = 0
+    jobs = [(pdf_path, stamp[2], text_cache_dir) for pdf_path, stamp in pending]
+    for (pdf_path, stamp), (pages, error) in zip(pending, extract_pdfs(jobs, workers)):
+        txt_path = txt_path_for(pdf_path)
+        try:
+            if error is not None:
+                raise ValueError(error)
+            with open(txt_path, "w", encoding="utf-8") as f:
+                f.write(pages_to_report(pages))
+            convert_file(txt_path, file_sha1(txt_path), base_dir=base_dir)
+        except Exception as e:
+            errors.append((pdf_path, str(e)))
+            print(f"Erro ao extrair {pdf_path}: {str(e)}")
+            state.store(pdf_path, stamp, None)
+            continue
+        state.store(
+            pdf_path, stamp, {"sha1": stamp[2], "txt": os.path.basename(txt_path), "txt_sha1": file_sha1(txt_path)}
+        )
+        converted += 1
+        print(f"PDF convertido: {txt_path}")
+
+    state.prune(base_dir)
+    state.save()
+    return converted, unchanged, skipped, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extrai exportações PDF do SEMrush para TXT/JSON (incremental, em paralelo)")
+    parser.add_argument("base_dir", nargs="?", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="processos de extração (0 = automático, 1 = serial)")
+    parser.add_argument("--force", action="store_true", help="reprocessa mesmo sem alterações e sobrescreve TXT existentes")
+    parser.add_argument("--state", default=DEFAULT_STATE_PATH, help="arquivo de estado da extração")
+    parser.add_argument("--cache", default=DEFAULT_TEXT_CACHE_DIR, help="textos extraídos por sha1 do PDF")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    converted, unchanged, skipped, errors = ingest_pdfs(args.base_dir, args.state, args.cache, args.workers, args.force)
+    print(
+        f"Extração concluída! {converted} convertidos, {unchanged} inalterados, {len(skipped)} ignorados, "
+        f"{len(errors)} erros em {time.perf_counter() - start:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
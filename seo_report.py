@@ -0,0 +1,153 @@
+import argparse
+import os
+import re
+import time
+
+import pandas as pd
+
+from seo_parser import DEFAULT_BASE_DIR
+from seo_snapshot import load_snapshot
+from seo_views import VIEW_MODES, DashboardCube, dashboard_frame, fact_rows
+
+# Uma pasta por grupo focal com os mesmos CSV do botão "Exportar CSV" do dashboard
+DEFAULT_OUT_DIR = "relatorios"
+DEFAULT_TOP_N = 10
+
+
+OPORTUNIDADES_COLUMNS = {
+    "marca_display": "Marca",
+    "dominio": "Domínio",
+    "coorte": "Coorte",
+    "score_oportunidade": "Score",
+    "backlinks": "Backlinks",
+    "trafego_organico": "Tráfego",
+    "palavras_chave_organicas": "Palavras-chave",
+}
+
+
+def oportunidades_table(view):
+    """
+    Melhores oportunidades do recorte (score de autoridade alta e desempenho baixo na coorte de marca)
+    """
+    return ranking_table(view.oportunidades)
+
+
+def ranking_table(ranking):
+    """
+    Ranking de oportunidades (DashboardCube.ranking_oportunidades) com os rótulos do dashboard
+    """
+    return ranking[list(OPORTUNIDADES_COLUMNS)].rename(columns=OPORTUNIDADES_COLUMNS).assign(
+        Score=lambda d: d["Score"].round(1)
+    )
+
+
+def top_concorrentes_table(view):
+    """
+    Top N concorrentes (fora do grupo focal) por tráfego orgânico
+    """
+    df_top = view.top_concorrentes
+    return pd.DataFrame(
+        {
+            "Marca": df_top["marca_display"],
+            "Domínio": df_top["dominio"],
+            "Tráfego": df_top["trafego_organico"].round(0).astype(int),
+            "Palavras-chave": df_top["palavras_chave_organicas"].round(0).astype(int),
+            "Backlinks": df_top["backlinks"].round(0).astype(int),
+            "Domínios Ref.": df_top["dominos_referencia"].round(0).astype(int),
+        }
+    )
+
+
+def keyword_table(palavras, domain_index):
+    """
+    Palavras-chave dos domínios em `domain_index`, por volume (fato `palavras` do snapshot,
+    lido por posições: a tabela compartilhada não é filtrada)
+    """
+    rows = fact_rows(palavras, domain_index, order_by="volume")
+    posicao = palavras["posicao"].to_numpy()[rows]
+    return pd.DataFrame(
+        {
+            "Palavra-chave": palavras["palavra"].array.take(rows),
+            "Posição": pd.Series(posicao).where(posicao > 0).astype("Int32").to_numpy(),
+            "Volume": palavras["volume"].to_numpy()[rows],
+            "Tráfego": palavras["trafego"].to_numpy()[rows],
+            "Marca": palavras["marca"].array.take(rows),
+        }
+    )
+
+
+def compile_tables(cube, palavras, modo="Todos", sel_marcas=(), top_n=DEFAULT_TOP_N):
+    """
+    Tabelas de um grupo focal a partir do cubo já montado: {nome: DataFrame}
+    """
+    view = cube.view(modo, sel_marcas, top_n)
+    return {
+        "oportunidades": oportunidades_table(view),
+        "ranking_oportunidades": ranking_table(cube.ranking_oportunidades(modo, sel_marcas)),
+        "top_concorrentes": top_concorrentes_table(view),
+        "metricas": view.metricas,
+        "palavras_chave": keyword_table(palavras, cube.lider_index),
+    }
+
+
+def group_slug(grupo):
+    return re.sub(r"[^0-9a-z]+", "-", grupo.strip().lower()).strip("-") or "sem-grupo"
+
+
+def compile_reports(snapshot, groups=None, modo="Todos", top_n=DEFAULT_TOP_N):
+    """
+    Tabelas de cada grupo focal sobre um único snapshot carregado: {grupo: {nome: DataFrame}}.
+    Sem `groups`, todos os grupos do dataset.
+    """
+    # Categorias/float32 uma vez; por grupo só is_lider e marca_display são recalculados
+    dominios = dashboard_frame(snapshot.tables["dominios"])
+    palavras = snapshot.tables["palavras"]
+    available = sorted(str(g) for g in pd.unique(dominios["grupo"].astype(str)) if str(g).strip())
+    reports = {}
+    for grupo in groups or available:
+        if grupo not in available:
+            print(f"Grupo não encontrado: {grupo}")
+            continue
+        cube = DashboardCube(dashboard_frame(dominios, focal_group=grupo), max_views=1)
+        reports[grupo] = compile_tables(cube, palavras, modo=modo, top_n=top_n)
+    return reports
+
+
+def write_reports(reports, out_dir=DEFAULT_OUT_DIR):
+    """
+    Grava <out_dir>/<grupo>/<tabela>.csv para todos os grupos; retorna os caminhos
+    """
+    paths = []
+    for grupo, tables in reports.items():
+        folder = os.path.join(out_dir, group_slug(grupo))
+        os.makedirs(folder, exist_ok=True)
+        for name, df in tables.items():
+            path = os.path.join(folder, f"{name}.csv")
+            df.to_csv(path, index=False, encoding="utf-8")
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera as tabelas do dashboard (CSV) para cada grupo focal, sem Streamlit")
+    parser.add_argument("base_dir", nargs="?", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="diretório de saída (uma pasta por grupo)")
+    parser.add_argument("--groups", nargs="+", default=None, help="grupos focais (padrão: todos)")
+    parser.add_argument("--modo", default="Todos", choices=VIEW_MODES,
+                        help="recorte aplicado às tabelas (\"Só Grupo Líder\" = só o grupo focal)")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N, help="concorrentes na tabela de top concorrentes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot = load_snapshot(args.base_dir)
+    loaded = time.perf_counter()
+    reports = compile_reports(snapshot, groups=args.groups, modo=args.modo, top_n=args.top_n)
+    paths = write_reports(reports, args.out)
+    print(
+        f"{len(reports)} grupos, {len(paths)} arquivos em {args.out} "
+        f"(carga {loaded - start:.2f}s, tabelas {time.perf_counter() - loaded:.2f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
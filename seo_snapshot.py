@@ -0,0 +1,566 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from opportunity_scores import SCORE_SCHEMA, score_frame
+from seo_ingest import DEFAULT_BASE_DIR, DEFAULT_WORKERS, ingest_reports, iter_report_files, latest_records
+from seo_parser import PARSER_VERSION
+
+# Incrementar sempre que o layout das tabelas (ou o cálculo das colunas de score) mudar
+SNAPSHOT_VERSION = 12
+DEFAULT_SNAPSHOT_DIR = os.path.join(".seo_cache", "snapshot")
+# Versões mantidas em disco (a corrente + a anterior, ainda aberta por sessões antigas)
+KEEP_VERSIONS = 2
+
+METRIC_COLUMNS = [
+    "trafego_organico",
+    "trafego_pago",
+    "palavras_chave_organicas",
+    "palavras_chave_pagas",
+    "custo_trafego_organico",
+    "custo_trafego_pago",
+    "backlinks",
+    "dominos_referencia",
+    "posicao_media",
+    "ctr",
+    "palavras_top3",
+]
+
+# Tabela -> coluna -> dtype ("category" = códigos int8/16/32 + vocabulário)
+SCHEMA = {
+    "dominios": {
+        "grupo": "category",
+        "marca": "category",
+        "concessionaria": "category",
+        "dominio": "category",
+        # Resolução de segundos: a menor que o pandas guarda sem converter (e copiar) o array mapeado
+        "data_geracao": "datetime64[s]",
+        # float32: valores por domínio cabem com folga; somas são feitas em float64
+        **{c: "float32" for c in METRIC_COLUMNS},
+        # Score de oportunidade (coortes de marca), calculado na ingestão sobre o dataset inteiro
+        **SCORE_SCHEMA,
+    },
+    # Fato de palavras-chave (formato longo): grupo/marca desnormalizados como categorias
+    "palavras": {
+        "domain_id": "int32",
+        "grupo": "category",
+        "marca": "category",
+        "palavra": "category",
+        "posicao": "int32",
+        "volume": "int64",
+        "trafego": "float64",
+    },
+    "palavras_pagas": {
+        "domain_id": "int32",
+        "grupo": "category",
+        "marca": "category",
+        "palavra": "category",
+        "posicao": "int32",
+        "volume": "int64",
+        "cpc": "float64",
+        "trafego": "float64",
+    },
+    "anuncios": {
+        "domain_id": "int32",
+        "titulo": "category",
+        "descricao": "category",
+        "url": "category",
+    },
+    # Arestas domínio -> concorrente orgânico (ver competitor_graph.py)
+    "concorrentes": {
+        "domain_id": "int32",
+        "grupo": "category",
+        "marca": "category",
+        "concorrente": "category",
+        "palavras_comuns": "int64",
+        "palavras_chave": "int64",
+        "similaridade": "float64",
+    },
+    # Agregados de mídia paga por grupo, calculados uma vez por snapshot
+    "pago_grupos": {
+        "grupo": "category",
+        "dominios": "int32",
+        "trafego_organico": "float64",
+        "trafego_pago": "float64",
+        "share_pago": "float64",
+        "palavras_chave_pagas": "float64",
+        "custo_trafego_pago": "float64",
+        "custo_por_visita": "float64",
+        "cpc_medio": "float64",
+        "custo_palavras_top": "float64",
+    },
+    "intencao": {
+        "domain_id": "int32",
+        "tipo": "category",
+        "palavras": "int64",
+        "trafego": "int64",
+        "percentual": "float64",
+    },
+    "paises": {
+        "domain_id": "int32",
+        "pais": "category",
+        "percentual": "float64",
+    },
+}
+
+
+class Snapshot:
+    """
+    Tabelas colunares do corpus, abertas via memory-map (somente leitura).
+
+    Cada tabela é gravada uma vez, com as linhas agrupadas por grupo; o manifesto guarda
+    a faixa de linhas de cada grupo (shard). Abrir o snapshot lê só o manifesto; um shard
+    é uma fatia do mapeamento (sem cópia), e só as páginas dos grupos lidos entram na
+    memória. O recorte "Todos" é a própria tabela mapeada, compartilhada entre processos.
+    domain_id é global, então recortes de grupos diferentes continuam compatíveis.
+    """
+
+    def __init__(self, path, manifest, tables=None):
+        self.path = path
+        self.manifest = manifest
+        self._tables = tables
+        self._global = None
+        self._lock = threading.Lock()
+
+    @property
+    def file_count(self):
+        return self.manifest["file_count"]
+
+    @property
+    def version(self):
+        """
+        Identificador da versão do dataset (muda sempre que os relatórios mudam)
+        """
+        return self.manifest["fingerprint"][:16]
+
+    @property
+    def errors(self):
+        return self.manifest.get("errors", [])
+
+    @property
+    def groups(self):
+        return list(self.manifest["shards"])
+
+    @property
+    def tables(self):
+        if self._tables is None:
+            self._tables = self.load()
+        return self._tables
+
+    def _mapped(self):
+        """
+        Todas as tabelas mapeadas (uma vez por instância; nenhuma página é lida aqui)
+        """
+        with self._lock:
+            if self._global is None:
+                tables_dir = os.path.join(self.path, self.manifest["dir"])
+                self._global = {
+                    name: read_columns(tables_dir, table_meta) for name, table_meta in self.manifest["tables"].items()
+                }
+            return self._global
+
+    def table(self, name):
+        """
+        Uma tabela de todos os grupos (memory-mapped, sem cópia)
+        """
+        return self._mapped()[name]
+
+    def shard(self, grupo):
+        """
+        Tabelas de um grupo: fatias das tabelas mapeadas (domain_id e índice de dominios globais)
+        """
+        return self._take([grupo])
+
+    def load(self, groups=None):
+        """
+        Tabelas dos `groups` pedidos (todos se None), na ordem do manifesto
+        """
+        if groups is None:
+            return dict(self._mapped())
+        groups = frozenset(groups)
+        return self._take([g for g in self.groups if g in groups])
+
+    def _take(self, groups):
+        mapped = self._mapped()
+        tables = {}
+        for name, frame in mapped.items():
+            ranges = merge_ranges(self.manifest["shards"][g]["rows"][name] for g in groups)
+            tables[name] = take_ranges(frame, ranges)
+        return tables
+
+    def __getitem__(self, table):
+        return self.tables[table]
+
+
+def merge_ranges(ranges):
+    """
+    Junta faixas [início, fim) adjacentes (grupos vizinhos no arquivo viram uma fatia só)
+    """
+    merged = []
+    for start, stop in sorted(ranges):
+        if start == stop:
+            continue
+        if merged and merged[-1][1] == start:
+            merged[-1][1] = stop
+        else:
+            merged.append([start, stop])
+    return merged
+
+
+def take_ranges(frame, ranges):
+    """
+    Linhas `ranges` de uma tabela mapeada: uma faixa é uma fatia (view do memory-map);
+    várias são copiadas, mas só as linhas pedidas
+    """
+    if len(ranges) == 1:
+        start, stop = ranges[0]
+        index = frame.index[start:stop]
+        return pd.DataFrame({col: frame[col].array[start:stop] for col in frame.columns}, index=index, copy=False)
+    rows = np.concatenate([np.arange(start, stop) for start, stop in ranges]) if ranges else np.zeros(0, dtype=np.int64)
+    cols = {col: frame[col].array.take(rows) for col in frame.columns}
+    return pd.DataFrame(cols, index=frame.index[rows], copy=False)
+
+
+def stats_fingerprint(stats):
+    """
+    Fingerprint a partir de (caminho, tamanho, mtime_ns) já coletados
+    """
+    h = hashlib.sha1(f"{SNAPSHOT_VERSION}:{PARSER_VERSION}".encode())
+    for path, size, mtime_ns in stats:
+        h.update(f"\n{os.path.normpath(path)}\t{size}\t{mtime_ns}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def source_fingerprint(paths):
+    """
+    Identifica o estado do corpus pelos (caminho, tamanho, mtime) dos relatórios
+    """
+    return stats_fingerprint((path, st.st_size, st.st_mtime_ns) for path, st in ((p, os.stat(p)) for p in paths))
+
+
+def dataset_scores(records):
+    """
+    Score de oportunidade de todos os domínios (na ordem de `records`), com as métricas em float32 como no snapshot
+    """
+    cols = {"marca": [r.marca for r in records], "dominio": [r.dominio for r in records]}
+    for c in METRIC_COLUMNS:
+        cols[c] = np.asarray([getattr(r, c) or 0 for r in records], dtype=np.float32)
+    return score_frame(pd.DataFrame(cols))
+
+
+def build_tables(records, scores=None):
+    """
+    Converte a lista de ReportRecord (com dicts/listas aninhados) em tabelas colunares;
+    `scores` (linhas de dataset_scores para estes registros) vai para as colunas de score de dominios
+    """
+    if scores is None:
+        scores = dataset_scores(records)
+    tables = {name: {col: [] for col in cols} for name, cols in SCHEMA.items()}
+    dominios, palavras = tables["dominios"], tables["palavras"]
+    intencao, paises = tables["intencao"], tables["paises"]
+    palavras_pagas, anuncios = tables["palavras_pagas"], tables["anuncios"]
+    concorrentes = tables["concorrentes"]
+
+    for domain_id, r in enumerate(records):
+        dominios["grupo"].append(r.grupo)
+        dominios["marca"].append(r.marca)
+        dominios["concessionaria"].append(r.concessionaria)
+        dominios["dominio"].append(r.dominio)
+        dominios["data_geracao"].append(r.data_geracao or "NaT")
+        for c in METRIC_COLUMNS:
+            dominios[c].append(getattr(r, c) or 0)
+
+        for kw in r.top_palavras:
+            palavras["domain_id"].append(domain_id)
+            palavras["grupo"].append(r.grupo)
+            palavras["marca"].append(r.marca)
+            palavras["palavra"].append(kw.get("palavra", ""))
+            palavras["posicao"].append(kw.get("posicao", 0))
+            palavras["volume"].append(kw.get("volume", 0))
+            palavras["trafego"].append(kw.get("trafego", 0))
+
+        for kw in r.palavras_pagas:
+            palavras_pagas["domain_id"].append(domain_id)
+            palavras_pagas["grupo"].append(r.grupo)
+            palavras_pagas["marca"].append(r.marca)
+            for col in ("palavra", "posicao", "volume", "cpc", "trafego"):
+                palavras_pagas[col].append(kw[col])
+
+        for ad in r.anuncios:
+            anuncios["domain_id"].append(domain_id)
+            for col in ("titulo", "descricao", "url"):
+                anuncios[col].append(ad[col])
+
+        for c in r.concorrentes:
+            concorrentes["domain_id"].append(domain_id)
+            concorrentes["grupo"].append(r.grupo)
+            concorrentes["marca"].append(r.marca)
+            concorrentes["concorrente"].append(c["dominio"])
+            for col in ("palavras_comuns", "palavras_chave", "similaridade"):
+                concorrentes[col].append(c[col])
+
+        for tipo, v in r.intencao_palavras_chave.items():
+            intencao["domain_id"].append(domain_id)
+            intencao["tipo"].append(tipo)
+            intencao["palavras"].append(v.get("palavras", 0))
+            intencao["trafego"].append(v.get("trafego", 0))
+            intencao["percentual"].append(v.get("percentual", 0))
+
+        for pais, percentual in r.distribuicao_paises.items():
+            paises["domain_id"].append(domain_id)
+            paises["pais"].append(pais)
+            paises["percentual"].append(percentual)
+
+    for col in SCORE_SCHEMA:
+        dominios[col] = scores[col].to_numpy() if col != "coorte" else scores[col].astype(str).tolist()
+    tables["pago_grupos"] = paid_group_aggregates(records)
+    return tables
+
+
+def paid_group_aggregates(records):
+    """
+    Agregados de busca paga por grupo. O tráfego de cada palavra-chave paga vem em %
+    do tráfego pago do domínio; daí saem cliques estimados e o custo ponderado pelo CPC.
+    """
+    acc = {}
+    for r in records:
+        g = acc.setdefault(r.grupo, dict.fromkeys(
+            ("dominios", "trafego_organico", "trafego_pago", "palavras_chave_pagas", "custo_trafego_pago", "cliques_top", "custo_palavras_top"), 0
+        ))
+        g["dominios"] += 1
+        g["trafego_organico"] += r.trafego_organico or 0
+        g["trafego_pago"] += r.trafego_pago or 0
+        g["palavras_chave_pagas"] += r.palavras_chave_pagas or 0
+        g["custo_trafego_pago"] += r.custo_trafego_pago or 0
+        for kw in r.palavras_pagas:
+            cliques = (r.trafego_pago or 0) * kw["trafego"] / 100
+            g["cliques_top"] += cliques
+            g["custo_palavras_top"] += cliques * kw["cpc"]
+
+    cols = {col: [] for col in SCHEMA["pago_grupos"]}
+    for grupo, g in acc.items():
+        total = g["trafego_organico"] + g["trafego_pago"]
+        cols["grupo"].append(grupo)
+        cols["dominios"].append(g["dominios"])
+        cols["trafego_organico"].append(g["trafego_organico"])
+        cols["trafego_pago"].append(g["trafego_pago"])
+        cols["share_pago"].append(g["trafego_pago"] / total * 100 if total else 0)
+        cols["palavras_chave_pagas"].append(g["palavras_chave_pagas"])
+        cols["custo_trafego_pago"].append(g["custo_trafego_pago"])
+        cols["custo_por_visita"].append(g["custo_trafego_pago"] / g["trafego_pago"] if g["trafego_pago"] else 0)
+        cols["cpc_medio"].append(g["custo_palavras_top"] / g["cliques_top"] if g["cliques_top"] else 0)
+        cols["custo_palavras_top"].append(g["custo_palavras_top"])
+    return cols
+
+
+def brand_totals(records):
+    """
+    {marca: domínios e somas principais} de um shard, para o catálogo do manifesto
+    """
+    totals = {}
+    for r in records:
+        t = totals.setdefault(r.marca, dict.fromkeys(("dominios", "trafego_organico", "palavras_chave_organicas", "dominos_referencia"), 0))
+        t["dominios"] += 1
+        for col in ("trafego_organico", "palavras_chave_organicas", "dominos_referencia"):
+            t[col] += float(np.float32(getattr(r, col) or 0))
+    return totals
+
+
+def _encode_category(values):
+    categories = {}
+    codes = np.fromiter((categories.setdefault(v, len(categories)) for v in values), dtype=np.int32, count=len(values))
+    # Menor inteiro que o pandas usaria para os códigos: assim Categorical.from_codes
+    # guarda o próprio array mapeado, sem convertê-lo para a memória do processo
+    for dtype in (np.int8, np.int16):
+        if len(categories) < np.iinfo(dtype).max:
+            return codes.astype(dtype), list(categories)
+    return codes, list(categories)
+
+
+def write_columns(out_dir, name, cols, schema):
+    """
+    Grava as colunas de uma tabela como .npy (categorias: códigos + vocabulário JSON); retorna o metadado
+    """
+    table_meta = {"rows": len(next(iter(cols.values()))), "columns": {}}
+    for col, values in cols.items():
+        dtype = schema[col]
+        file_name = f"{name}.{col}.npy"
+        col_meta = {"dtype": dtype, "file": file_name}
+        if dtype == "category":
+            codes, categories = _encode_category(values)
+            np.save(os.path.join(out_dir, file_name), codes)
+            col_meta["categories"] = f"{name}.{col}.categories.json"
+            with open(os.path.join(out_dir, col_meta["categories"]), "w", encoding="utf-8") as f:
+                json.dump(categories, f, ensure_ascii=False)
+        else:
+            np.save(os.path.join(out_dir, file_name), np.asarray(values, dtype=dtype))
+        table_meta["columns"][col] = col_meta
+    return table_meta
+
+
+def read_columns(in_dir, table_meta, columns=None):
+    """
+    DataFrame (memory-mapped) de uma tabela gravada por write_columns
+    """
+    metas = table_meta["columns"]
+    cols = {col: _load_column(in_dir, metas[col]) for col in (columns or metas)}
+    return pd.DataFrame(cols, copy=False)
+
+
+def write_snapshot(records, file_count, fingerprint, snapshot_dir=DEFAULT_SNAPSHOT_DIR, errors=()):
+    """
+    Grava um snapshot versionado, um shard por grupo, e aponta CURRENT para ele (troca atômica).
+    Só a exportação mais recente de cada domínio entra (ver latest_records).
+    """
+    records = latest_records(records)
+    version_id = fingerprint[:16]
+    final_dir = os.path.join(snapshot_dir, version_id)
+    tmp_dir = f"{final_dir}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    manifest = {
+        "snapshot_version": SNAPSHOT_VERSION,
+        "parser_version": PARSER_VERSION,
+        "fingerprint": fingerprint,
+        "file_count": file_count,
+        "errors": [list(e) for e in errors],
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "shards": {},
+    }
+
+    by_group = {}
+    for r in records:
+        by_group.setdefault(r.grupo, []).append(r)
+    # Linhas agrupadas por grupo: cada shard é uma faixa contígua de cada tabela
+    ordered = [r for group_records in by_group.values() for r in group_records]
+
+    tables = build_tables(ordered, dataset_scores(ordered))
+    domain_ids = {name: np.asarray(cols["domain_id"], dtype=np.int64) for name, cols in tables.items() if "domain_id" in cols}
+    manifest["dir"] = "tables"
+    tables_dir = os.path.join(tmp_dir, manifest["dir"])
+    os.makedirs(tables_dir, exist_ok=True)
+    manifest["tables"] = {name: write_columns(tables_dir, name, cols, SCHEMA[name]) for name, cols in tables.items()}
+
+    offset = 0
+    for i, (grupo, group_records) in enumerate(by_group.items()):
+        stop = offset + len(group_records)
+        rows = {"dominios": [offset, stop], "pago_grupos": [i, i + 1]}
+        for name, ids in domain_ids.items():
+            rows[name] = [int(x) for x in np.searchsorted(ids, [offset, stop])]
+        manifest["shards"][grupo] = {
+            "offset": offset,
+            "dominios": len(group_records),
+            "marcas": brand_totals(group_records),
+            "rows": rows,
+        }
+        offset = stop
+
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    if os.path.isdir(final_dir):
+        shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+
+    current_tmp = os.path.join(snapshot_dir, f"CURRENT.tmp-{os.getpid()}")
+    with open(current_tmp, "w", encoding="utf-8") as f:
+        f.write(version_id)
+    os.replace(current_tmp, os.path.join(snapshot_dir, "CURRENT"))
+
+    prune_versions(snapshot_dir, keep=KEEP_VERSIONS)
+
+    return final_dir
+
+
+def prune_versions(snapshot_dir=DEFAULT_SNAPSHOT_DIR, keep=KEEP_VERSIONS):
+    """
+    Remove as versões além das `keep` mais recentes (a corrente nunca sai).
+
+    Snapshots já abertos mapeiam os shards sob demanda: apagar a versão anterior logo
+    na troca quebraria o próximo shard() de quem ainda a usa, então ela fica até a seguinte.
+    """
+    try:
+        with open(os.path.join(snapshot_dir, "CURRENT"), "r", encoding="utf-8") as f:
+            current = f.read().strip()
+    except OSError:
+        current = None
+    versions = [
+        entry for entry in os.listdir(snapshot_dir)
+        if os.path.isdir(os.path.join(snapshot_dir, entry)) and ".tmp-" not in entry and entry != current
+    ]
+    versions.sort(key=lambda entry: os.path.getmtime(os.path.join(snapshot_dir, entry)), reverse=True)
+    for entry in versions[max(keep - 1, 0):]:
+        shutil.rmtree(os.path.join(snapshot_dir, entry), ignore_errors=True)
+
+
+def _load_column(version_dir, col_meta):
+    path = os.path.join(version_dir, col_meta["file"])
+    arr = np.load(path, mmap_mode="r")
+    if col_meta["dtype"] != "category":
+        return arr
+    with open(os.path.join(version_dir, col_meta["categories"]), "r", encoding="utf-8") as f:
+        categories = json.load(f)
+    return pd.Categorical.from_codes(arr, categories=pd.Index(categories, dtype=object), validate=False)
+
+
+def open_snapshot(snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """
+    Abre o snapshot corrente; retorna None se não existir ou for de outra versão
+    """
+    try:
+        with open(os.path.join(snapshot_dir, "CURRENT"), "r", encoding="utf-8") as f:
+            version_dir = os.path.join(snapshot_dir, f.read().strip())
+        with open(os.path.join(version_dir, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get("snapshot_version") != SNAPSHOT_VERSION or manifest.get("parser_version") != PARSER_VERSION:
+        return None
+
+    return Snapshot(version_dir, manifest)
+
+
+def load_snapshot(base_dir=DEFAULT_BASE_DIR, snapshot_dir=DEFAULT_SNAPSHOT_DIR, force=False, workers=DEFAULT_WORKERS):
+    """
+    Abre o snapshot se ele corresponder aos arquivos atuais; senão recompila
+    """
+    fingerprint = source_fingerprint(iter_report_files(base_dir))
+    snapshot = None if force else open_snapshot(snapshot_dir)
+    if snapshot is not None and snapshot.manifest["fingerprint"] == fingerprint:
+        return snapshot
+
+    records, file_count, errors = ingest_reports(base_dir, workers=workers)
+    write_snapshot(records, file_count, fingerprint, snapshot_dir, errors=errors)
+    return open_snapshot(snapshot_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compila o corpus de relatórios em um snapshot colunar (.npy)")
+    parser.add_argument("base_dir", nargs="?", default=DEFAULT_BASE_DIR)
+    parser.add_argument("--out", default=DEFAULT_SNAPSHOT_DIR, help="Diretório do snapshot")
+    parser.add_argument("--force", action="store_true", help="Recompila mesmo sem mudanças")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Processos de parsing (0 = automático, 1 = serial)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    snapshot = load_snapshot(args.base_dir, args.out, force=args.force, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"Snapshot: {snapshot.path}")
+    for name, table in snapshot.tables.items():
+        print(f"  {name}: {len(table)} linhas")
+    print(f"Arquivos: {snapshot.file_count} • erros: {len(snapshot.errors)} • {elapsed:.2f}s")
+    for path, error in snapshot.errors:
+        print(f"  ! {path}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from cache_policy import BoundedCache, policy_for
+from opportunity_scores import OPPORTUNITY_THRESHOLD, SCORE_SCHEMA, score_frame, top_k
+from seo_snapshot import METRIC_COLUMNS
+
+VIEW_MODES = ("Todos", "Só Grupo Líder", "Só Concorrentes")
+CUBE_DIMENSIONS = ["grupo", "marca_display", "is_lider"]
+CUBE_METRICS = ["trafego_organico", "palavras_chave_organicas", "backlinks", "dominos_referencia", "posicao_media"]
+# Oportunidades exibidas no Resumo Executivo (as de melhor score no recorte)
+OPPORTUNITY_TOP_K = 5
+
+# Schema da tabela de domínios usada pelo dashboard (garantido por dashboard_frame)
+DOMINIO_SCHEMA = {
+    "grupo": "category",
+    "marca": "category",
+    "concessionaria": "category",
+    "dominio": "category",
+    "data_geracao": "datetime64",
+    **{c: "float32" for c in METRIC_COLUMNS},
+    **SCORE_SCHEMA,
+    "is_lider": "bool",
+    "marca_display": "category",
+}
+
+
+def focal_label(focal_group=None):
+    """
+    Rótulo do grupo focal nas marcas (None = Grupo Líder, o foco do dashboard)
+    """
+    if focal_group is None or "lider" in focal_group.lower():
+        return "Grupo Líder"
+    name = focal_group.strip()
+    return f"Grupo {name[:1].upper()}{name[1:]}"
+
+
+def dashboard_frame(dominios, focal_group=None):
+    """
+    Normaliza a tabela `dominios` uma única vez: categorias, métricas float32 sem NaN,
+    e is_lider / marca_display calculados sobre o vocabulário (não linha a linha).
+    O score de oportunidade vem do snapshot; tabelas sem ele (ex.: montadas à mão) são pontuadas aqui.
+
+    `is_lider` marca o grupo focal: por padrão os grupos com "lider" no nome; com
+    `focal_group` só esse grupo (relatórios em lote de outros grupos).
+    """
+    cols = {}
+    for col in ["grupo", "marca", "concessionaria", "dominio"]:
+        values = dominios[col]
+        cols[col] = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype(str).astype("category")
+    cols["data_geracao"] = pd.to_datetime(dominios["data_geracao"]) if "data_geracao" in dominios else pd.NaT
+    for col in METRIC_COLUMNS:
+        values = dominios[col]
+        if values.dtype != np.float32 or values.isna().any():
+            values = pd.to_numeric(values, errors="coerce").fillna(0).astype(np.float32)
+        cols[col] = values
+    if all(col in dominios for col in SCORE_SCHEMA):
+        cols.update({col: dominios[col] for col in SCORE_SCHEMA})
+    else:
+        scores = score_frame(pd.DataFrame({col: cols[col] for col in ["marca", "dominio", *METRIC_COLUMNS]}))
+        cols.update({col: scores[col] for col in SCORE_SCHEMA})
+
+    grupo = cols["grupo"].cat
+    grupos = grupo.categories.astype(str)
+    focal = grupos.str.lower().str.contains("lider") if focal_group is None else grupos == focal_group
+    is_lider = np.append(np.asarray(focal, dtype=bool), False)[grupo.codes]
+    marca = cols["marca"].cat
+    marcas = np.asarray(marca.categories.astype(str), dtype=object)[marca.codes]
+    display = np.where(is_lider, marcas + f" ({focal_label(focal_group)})", marcas)
+    cols["is_lider"] = pd.Series(is_lider, index=dominios.index, dtype=bool)
+    cols["marca_display"] = pd.Series(pd.Categorical(display), index=dominios.index)
+
+    return pd.DataFrame(cols, index=dominios.index)[list(DOMINIO_SCHEMA)]
+
+
+def normalize_filters(modo, sel_marcas, top_n):
+    """
+    Chave canônica do recorte: modo desconhecido/vazio vira "Todos" e a ordem das marcas não importa
+    """
+    return (modo if modo in VIEW_MODES else "Todos", tuple(sorted(set(sel_marcas or ()))), int(top_n))
+
+
+def filter_mask(frame, modo, sel_marcas):
+    """
+    Máscara booleana do recorte sobre qualquer tabela com colunas is_lider e marca_display
+    """
+    mask = np.ones(len(frame), dtype=bool)
+    is_lider = frame["is_lider"].to_numpy(dtype=bool)
+    if modo == "Só Grupo Líder":
+        mask &= is_lider
+    elif modo == "Só Concorrentes":
+        mask &= ~is_lider
+    if sel_marcas:
+        mask &= frame["marca_display"].isin(sel_marcas).to_numpy()
+    return mask
+
+
+def fact_rows(fact, domain_ids, order_by=None):
+    """
+    Posições das linhas de uma tabela fato (coluna domain_id) dos domínios `domain_ids`,
+    opcionalmente por `order_by` decrescente. A tabela compartilhada não é filtrada nem
+    copiada: o recorte é um array de posições (lookup em um array booleano por domain_id).
+    """
+    ids = fact["domain_id"].to_numpy()
+    domain_ids = np.asarray(domain_ids, dtype=np.int64)
+    selected = np.zeros(int(max(ids.max(initial=-1), domain_ids.max(initial=-1))) + 1, dtype=bool)
+    selected[domain_ids] = True
+    rows = np.flatnonzero(selected[ids])
+    if order_by is not None:
+        rows = rows[np.argsort(-fact[order_by].to_numpy()[rows], kind="stable")]
+    return rows
+
+
+def take_labels(values, rows):
+    """
+    values[rows] (posições) como strings; colunas categóricas são lidas pelos códigos
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        labels = np.asarray(values.cat.categories, dtype=object)
+        return labels[values.cat.codes.to_numpy()[rows]]
+    return values.to_numpy()[rows].astype(str).astype(object)
+
+
+class ShardCatalog:
+    """
+    Catálogo dos shards por grupo, lido só do manifesto do snapshot (nenhum shard é aberto).
+
+    Dá ao dashboard o que ele precisa antes de escolher os shards: a lista de marcas
+    do filtro, os KPIs do Grupo Líder sobre o dataset inteiro, o tráfego por marca e
+    quais grupos um recorte (modo, marcas) precisa carregar.
+    """
+
+    def __init__(self, shards):
+        self.groups = list(shards)
+        self.focal_groups = [g for g in self.groups if "lider" in g.lower()]
+        rows = [
+            {"grupo": grupo, "marca": marca, **totais}
+            for grupo, meta in shards.items()
+            for marca, totais in meta["marcas"].items()
+        ]
+        self.frame = pd.DataFrame(
+            rows, columns=["grupo", "marca", "dominios", "trafego_organico", "palavras_chave_organicas", "dominos_referencia"]
+        )
+        is_lider = self.frame["grupo"].isin(self.focal_groups).to_numpy(dtype=bool)
+        self.frame["is_lider"] = is_lider
+        self.frame["marca_display"] = np.where(is_lider, self.frame["marca"] + f" ({focal_label()})", self.frame["marca"])
+
+        self.marcas = sorted(self.frame["marca_display"].unique().tolist())
+        self.por_marca_total = (
+            self.frame.groupby("marca_display")["trafego_organico"].sum().sort_values(ascending=False)
+        )
+
+    def lider_kpis(self):
+        """
+        Totais do Grupo Líder e share de tráfego orgânico sobre o dataset inteiro
+        """
+        lider = self.frame[self.frame["is_lider"].to_numpy(dtype=bool)]
+        trafego_lider = float(lider["trafego_organico"].sum())
+        trafego_total = float(self.frame["trafego_organico"].sum())
+        return {
+            "trafego_organico": trafego_lider,
+            "palavras_chave_organicas": float(lider["palavras_chave_organicas"].sum()),
+            "dominos_referencia": float(lider["dominos_referencia"].sum()),
+            "share": (trafego_lider / trafego_total * 100) if trafego_total > 0 else 0,
+        }
+
+    def groups_for(self, modo, sel_marcas=()):
+        """
+        Grupos cujos shards o recorte precisa. Os grupos Líder entram sempre: os blocos
+        do Grupo Líder (palavras-chave, KPIs) independem do filtro.
+        """
+        modo, sel_marcas, _ = normalize_filters(modo, sel_marcas, 0)
+        frame = self.frame
+        if modo == "Só Grupo Líder":
+            frame = frame[frame["is_lider"]]
+        elif modo == "Só Concorrentes":
+            frame = frame[~frame["is_lider"]]
+        if sel_marcas:
+            frame = frame[frame["marca_display"].isin(sel_marcas)]
+        wanted = set(frame["grupo"]) | set(self.focal_groups)
+        return tuple(g for g in self.groups if g in wanted)
+
+
+@dataclass
+class DashboardView:
+    """
+    Tudo o que o dashboard exibe para um recorte (modo, marcas, top_n)
+    """
+
+    frame: pd.DataFrame             # domínios do recorte, métricas já numéricas
+    destaques: dict                 # métrica -> linha do domínio com maior valor
+    totais: dict                    # métrica -> soma no recorte
+    oportunidades: pd.DataFrame     # top OPPORTUNITY_TOP_K por score de oportunidade (acima do limiar)
+    top_concorrentes: pd.DataFrame  # nlargest(top_n) por tráfego, sem o Grupo Líder
+    por_marca: pd.DataFrame         # tráfego e keywords por marca
+    metricas: pd.DataFrame          # tabela agregada por marca
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+
+class DashboardCube:
+    """
+    Agregados do dashboard para uma versão do dataset (tabela já normalizada por dashboard_frame).
+
+    As métricas são somadas uma única vez no nível grupo × marca × is_lider;
+    as tabelas por marca de cada recorte saem do cubo (poucas linhas), não dos domínios.
+    Os recortes calculados ficam num LRU limitado (política "recortes"), compartilhado entre sessões.
+    """
+
+    def __init__(self, df_seo, max_views=None):
+        self.frame = df_seo[
+            ["grupo", "marca", "dominio", "marca_display", "is_lider", "coorte", "score_oportunidade", "rank_oportunidade"]
+            + CUBE_METRICS
+        ]
+
+        # Somas em float64 (a tabela guarda float32)
+        grouped = self.frame.astype({col: np.float64 for col in CUBE_METRICS}).groupby(
+            CUBE_DIMENSIONS, observed=True, sort=True
+        )
+        self.cube = grouped[CUBE_METRICS].sum()
+        self.cube["dominios"] = grouped.size()
+        self.cube = self.cube.reset_index()
+
+        self.lider_index = self.frame.index[self.frame["is_lider"].to_numpy(dtype=bool)]
+
+        policy = policy_for("recortes")
+        self._views = BoundedCache("recortes", policy if max_views is None else replace(policy, max_entries=max_views))
+
+    def view(self, modo, sel_marcas, top_n):
+        """
+        Recorte memoizado; filtros equivalentes (ex.: marcas em outra ordem) compartilham a entrada
+        """
+        key = normalize_filters(modo, sel_marcas, top_n)
+        return self._views.get_or_build(key, lambda: self._compute(*key))
+
+    def _compute(self, modo, sel_marcas, top_n):
+        frame = self.frame[filter_mask(self.frame, modo, sel_marcas)]
+        cube = self.cube[filter_mask(self.cube, modo, sel_marcas)]
+
+        destaques = {}
+        if not frame.empty:
+            for col in ["trafego_organico", "palavras_chave_organicas", "backlinks"]:
+                destaques[col] = frame.loc[frame[col].idxmax()]
+        totais = {col: cube[col].sum() for col in ["trafego_organico", "palavras_chave_organicas", "backlinks"]}
+
+        oportunidades = self._ranked(frame, OPPORTUNITY_TOP_K)
+
+        concorrentes = frame[~frame["is_lider"].to_numpy(dtype=bool)]
+        top_concorrentes = concorrentes.nlargest(top_n, "trafego_organico")
+
+        by_marca = cube.groupby("marca_display", observed=True, sort=True)
+        sums = by_marca[CUBE_METRICS + ["dominios"]].sum()
+        por_marca = (
+            sums[["trafego_organico", "palavras_chave_organicas"]]
+            .reset_index()
+            .sort_values("trafego_organico", ascending=False)
+        )
+        metricas = (
+            sums[["trafego_organico", "palavras_chave_organicas", "backlinks", "dominos_referencia"]]
+            .assign(posicao_media=sums["posicao_media"] / sums["dominios"])
+            .reset_index()
+            .rename(
+                columns={
+                    "marca_display": "Marca",
+                    "trafego_organico": "Tráfego Orgânico",
+                    "palavras_chave_organicas": "Palavras-chave",
+                    "backlinks": "Backlinks",
+                    "dominos_referencia": "Domínios Referência",
+                    "posicao_media": "Posição Média",
+                }
+            )
+            .sort_values("Tráfego Orgânico", ascending=False)
+        )
+
+        return DashboardView(frame, destaques, totais, oportunidades, top_concorrentes, por_marca, metricas)
+
+    @staticmethod
+    def _ranked(frame, k):
+        """
+        Domínios do recorte com score acima do limiar, pelo rank pré-calculado (seleção parcial dos k)
+        """
+        rank = frame["rank_oportunidade"].to_numpy()
+        rows = top_k(rank, np.flatnonzero(frame["score_oportunidade"].to_numpy() > OPPORTUNITY_THRESHOLD), k)
+        return frame.iloc[rows][
+            ["marca_display", "is_lider", "coorte", "dominio", "score_oportunidade", "trafego_organico", "backlinks", "palavras_chave_organicas"]
+        ]
+
+    def ranking_oportunidades(self, modo, sel_marcas, k=None):
+        """
+        Ranking de oportunidades do recorte (todas acima do limiar, ou as k melhores)
+        """
+        modo, sel_marcas, _ = normalize_filters(modo, sel_marcas, 0)
+        return self._ranked(self.frame[filter_mask(self.frame, modo, sel_marcas)], k)
+
+    @property
+    def max_views(self):
+        return self._views.policy.max_entries
+
+    def stats(self):
+        stats = self._views.stats()
+        return dict(stats, views=stats["entries"], max_views=stats["max_entries"])
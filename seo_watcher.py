@@ -0,0 +1,176 @@
+import os
+import threading
+
+from parse_cache import DEFAULT_CACHE_PATH, ParseCache
+from seo_history import DEFAULT_HISTORY_DIR, HistoryStore
+from seo_ingest import DEFAULT_WORKERS, ingest_report_map, iter_report_files, parse_files
+from seo_parser import DEFAULT_BASE_DIR, ReportRecord
+from seo_snapshot import DEFAULT_SNAPSHOT_DIR, load_snapshot, open_snapshot, stats_fingerprint, write_snapshot
+
+# Intervalo de polling em segundos; SEO_WATCH_INTERVAL=0 desliga o watcher
+DEFAULT_POLL_INTERVAL = float(os.environ.get("SEO_WATCH_INTERVAL", "10"))
+
+
+def scan_reports(base_dir=DEFAULT_BASE_DIR):
+    """
+    {caminho: (tamanho, mtime_ns)} dos relatórios, na ordem do os.walk
+    """
+    scan = {}
+    for path in iter_report_files(base_dir):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        scan[path] = (st.st_size, st.st_mtime_ns)
+    return scan
+
+
+def diff_scans(old, new):
+    """
+    Retorna (adicionados, modificados, removidos) entre duas varreduras
+    """
+    added = [p for p in new if p not in old]
+    modified = [p for p in new if p in old and new[p] != old[p]]
+    deleted = [p for p in old if p not in new]
+    return added, modified, deleted
+
+
+class LiveDataset:
+    """
+    Snapshot do corpus mantido em dia por um watcher em thread (polling, sem serviços externos).
+
+    A cada mudança só os relatórios adicionados/alterados são reprocessados; os removidos
+    saem do conjunto em memória. O snapshot é regravado e `version` muda, o que invalida
+    os caches do dashboard chaveados por versão.
+    """
+
+    def __init__(
+        self,
+        base_dir=DEFAULT_BASE_DIR,
+        snapshot_dir=DEFAULT_SNAPSHOT_DIR,
+        workers=DEFAULT_WORKERS,
+        history_dir=DEFAULT_HISTORY_DIR,
+        cache_path=DEFAULT_CACHE_PATH,
+    ):
+        self.base_dir = base_dir
+        self.snapshot_dir = snapshot_dir
+        self.cache_path = cache_path
+        self.workers = workers
+        self.refreshes = 0
+        self.history = HistoryStore(history_dir)
+
+        # Varredura antes do load: mudanças durante a carga são vistas no próximo ciclo
+        self._scan = scan_reports(base_dir)
+        self.snapshot = load_snapshot(base_dir, snapshot_dir, workers=workers)
+        self._records = None
+        self._errors = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def version(self):
+        return self.snapshot.version
+
+    def refresh(self):
+        """
+        Aplica as mudanças desde a última varredura; retorna (adicionados, modificados, removidos)
+        """
+        with self._lock:
+            scan = scan_reports(self.base_dir)
+            added, modified, deleted = diff_scans(self._scan, scan)
+            if not (added or modified or deleted):
+                return added, modified, deleted
+
+            if self._records is None:
+                # Primeira mudança: registros atuais via cache de parsing (só o que mudou é reprocessado)
+                self._records, _, errors = ingest_report_map(self.base_dir, self.cache_path, workers=self.workers)
+                self._errors = dict(errors)
+            else:
+                self._apply_changes(added + modified, deleted)
+                self._records = {p: self._records[p] for p in scan if p in self._records}
+
+            fingerprint = stats_fingerprint((p, size, mtime_ns) for p, (size, mtime_ns) in scan.items())
+            write_snapshot(
+                list(self._records.values()),
+                len(scan),
+                fingerprint,
+                self.snapshot_dir,
+                errors=[(p, self._errors[p]) for p in scan if p in self._errors],
+            )
+            snapshot = open_snapshot(self.snapshot_dir)
+            if snapshot is None:
+                # Snapshot ilegível (ex.: regravado por outro processo no meio da leitura):
+                # mantém o anterior e tenta de novo na próxima varredura
+                print(f"Erro ao abrir o snapshot em {self.snapshot_dir}; mantendo a versão anterior")
+                return added, modified, deleted
+            self.snapshot = snapshot
+            self._scan = scan
+            # Histórico: só as (domínio, Data de geração) novas são acrescentadas
+            self.history.ingest(self._records.values(), fingerprint)
+            self.refreshes += 1
+            return added, modified, deleted
+
+    def _apply_changes(self, changed, deleted):
+        """
+        Reprocessa só `changed` e grava o resultado no cache de parsing em disco,
+        para que a próxima partida a frio não reprocesse os mesmos arquivos
+        """
+        cache = ParseCache(self.cache_path)
+        for path in deleted:
+            self._records.pop(path, None)
+            self._errors.pop(path, None)
+            cache.store(path, None, None)
+
+        pending = []
+        for path in changed:
+            try:
+                metrics, stamp = cache.lookup(path)
+            except OSError as e:
+                # Apagado entre a varredura e a leitura: sai agora, a próxima varredura confirma
+                self._records.pop(path, None)
+                self._errors[path] = str(e)
+                continue
+            if stamp is None:
+                self._records[path] = ReportRecord.from_dict(metrics)
+                self._errors.pop(path, None)
+            else:
+                pending.append((path, stamp))
+
+        parsed = parse_files([p for p, _ in pending], base_dir=self.base_dir, workers=self.workers)
+        for (path, stamp), (record, error) in zip(pending, parsed):
+            cache.store(path, stamp, record.to_dict() if record else None)
+            if record is None:
+                self._records.pop(path, None)
+                self._errors[path] = error
+                print(f"Erro ao processar {path}: {error}")
+            else:
+                self._records[path] = record
+                self._errors.pop(path, None)
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"Erro ao salvar cache de parsing: {str(e)}")
+
+    def start(self, interval=DEFAULT_POLL_INTERVAL):
+        if interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="seo-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self, interval):
+        try:
+            self.history.sync(self.base_dir, workers=self.workers)
+        except Exception as e:
+            print(f"Erro ao atualizar histórico: {str(e)}")
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Erro ao atualizar relatórios: {str(e)}")
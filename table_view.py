@@ -0,0 +1,90 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 50
+PAGE_SIZES = (25, 50, 100, 200)
+
+
+@dataclass
+class TablePage:
+    """
+    Uma página de uma tabela filtrada/ordenada no servidor
+    """
+
+    rows: pd.DataFrame
+    total: int     # linhas após a busca
+    page: int      # 1-based, já limitado a [1, n_pages]
+    n_pages: int
+    start: int     # posição (0-based) da primeira linha da página
+
+
+def search_mask(df, query, columns):
+    """
+    Busca case-insensitive (substring) em `columns`; colunas categóricas são
+    testadas só no vocabulário e expandidas pelos códigos
+    """
+    mask = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            hits = np.asarray(values.cat.categories.astype(str).str.contains(query, case=False, regex=False), dtype=bool)
+            codes = values.cat.codes.to_numpy()
+            mask |= (codes >= 0) & hits[codes]
+        else:
+            mask |= values.astype(str).str.contains(query, case=False, regex=False).to_numpy()
+    return mask
+
+
+def sort_positions(df, sort_by, ascending=False):
+    """
+    Posições das linhas de `df` ordenadas por `sort_by` (estável, vazios por último).
+    Colunas categóricas são ordenadas pelos rótulos, não pelos códigos (que seguem a
+    ordem de aparição): o vocabulário é ordenado uma vez e os códigos viram o rank.
+    """
+    values = df[sort_by]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        labels = np.asarray(values.cat.categories.astype(str), dtype=object)
+        rank = np.empty(len(labels), dtype=np.float64)
+        rank[np.argsort(labels, kind="stable")] = np.arange(len(labels))
+        codes = values.cat.codes.to_numpy()
+        values = pd.Series(np.where(codes >= 0, rank[codes], np.nan))
+    return values.reset_index(drop=True).sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()
+
+
+def query_table(df, search="", search_cols=None, sort_by=None, ascending=False, page=1, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Busca + ordenação + paginação sobre o DataFrame inteiro; só a página é materializada
+    """
+    positions = np.arange(len(df))
+    search = (search or "").strip()
+    if search and search_cols:
+        positions = positions[search_mask(df, search, search_cols)]
+    if sort_by in df.columns and len(positions):
+        subset = df.iloc[positions]
+        positions = positions[sort_positions(subset, sort_by, ascending)]
+
+    total = len(positions)
+    n_pages = max(1, math.ceil(total / page_size))
+    page = min(max(1, int(page)), n_pages)
+    start = (page - 1) * page_size
+    return TablePage(df.iloc[positions[start:start + page_size]], total, page, n_pages, start)
+
+
+def bar_limits(df, columns):
+    """
+    (mínimo, máximo, formato printf) de cada coluna numérica, calculados sobre a tabela
+    inteira para que as barras sejam comparáveis entre páginas
+    """
+    limits = {}
+    for col in columns:
+        if col not in df.columns:
+            continue
+        values = pd.to_numeric(df[col], errors="coerce").dropna()
+        if values.empty:
+            continue
+        integral = bool((values % 1 == 0).all())
+        limits[col] = (min(0.0, float(values.min())), float(values.max()) or 1.0, "%d" if integral else "%.2f")
+    return limits
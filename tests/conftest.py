@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_corpus  # noqa: E402
+from seo_snapshot import load_snapshot  # noqa: E402
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """
+    Corpus sintético pequeno (formato SEMrush) em 4 grupos, um deles "grupo-lider"
+    """
+    base_dir = tmp_path / "analise-performance"
+    generate_corpus(str(base_dir), 16, n_groups=4, n_brands=3)
+    return str(base_dir)
+
+
+@pytest.fixture
+def snapshot_dir(tmp_path):
+    return str(tmp_path / "snapshot")
+
+
+@pytest.fixture
+def snapshot(corpus, snapshot_dir):
+    return load_snapshot(corpus, snapshot_dir, workers=1)
@@ -0,0 +1,150 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cache_policy
+from cache_policy import MB, BoundedCache, CachePolicy, cached, estimate_bytes, named_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(cache_policy, "_registry", {})
+
+
+def test_lru_evicts_least_recently_used():
+    evicted = []
+    cache = BoundedCache("t", CachePolicy(max_entries=2), on_evict=evicted.append)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert evicted == [2] and cache.stats()["evictions"] == 1
+
+
+def test_byte_limit_keeps_newest_entry():
+    cache = BoundedCache("t", CachePolicy(max_entries=10, max_bytes=1 * MB))
+    cache.put("a", np.zeros(MB // 2, dtype=np.uint8))
+    cache.put("b", np.zeros(MB // 2 + 10, dtype=np.uint8))
+    assert len(cache) == 1 and "b" in cache
+    cache.put("c", np.zeros(2 * MB, dtype=np.uint8))
+    assert len(cache) == 1 and "c" in cache
+
+
+def test_ttl_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_policy.time, "monotonic", lambda: now[0])
+    cache = BoundedCache("t", CachePolicy(ttl=10))
+    cache.put("a", 1)
+    now[0] += 5
+    assert cache.get("a") == 1
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_get_or_build_is_single_flight():
+    cache = BoundedCache("t", CachePolicy())
+    calls = []
+
+    def build():
+        calls.append(1)
+        time.sleep(0.05)
+        return "valor"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build("k", build))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["valor"] * 8 and len(calls) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"]) == (1, 7)
+
+
+def test_estimate_bytes_ignores_memmaps(tmp_path):
+    path = tmp_path / "a.npy"
+    np.save(path, np.zeros(1000, dtype=np.float64))
+    assert estimate_bytes(np.load(path, mmap_mode="r")) == 0
+    assert estimate_bytes(np.zeros(1000, dtype=np.float64)) == 8000
+
+
+def test_cached_skips_underscore_args_and_invalidates_old_versions():
+    calls = []
+
+    @cached("dados")
+    def load(version, groups, _snapshot):
+        calls.append((version, groups))
+        return (version, groups, _snapshot)
+
+    assert load("v1", ("a",), object())[:2] == ("v1", ("a",))
+    load("v1", ("a",), object())
+    load("v1", ("b",), object())
+    assert calls == [("v1", ("a",)), ("v1", ("b",))]
+    load("v2", ("a",), None)
+    assert len(named_cache("dados")) == 1
+
+
+def test_cached_versions_are_tracked_per_dataset():
+    calls = []
+
+    @cached("dados")
+    def load(dataset, version):
+        calls.append((dataset, version))
+        return version
+
+    for _ in range(3):
+        load("base-a", "v1")
+        load("base-b", "v9")
+    assert calls == [("base-a", "v1"), ("base-b", "v9")]
+    load("base-a", "v2")
+    assert len(named_cache("dados")) == 2
+
+
+def test_on_evict_is_bound_per_function_in_shared_cache(monkeypatch):
+    monkeypatch.setitem(cache_policy.POLICIES, "recursos", CachePolicy(max_entries=1))
+    released = []
+
+    @cached("recursos")
+    def plain():
+        return "figuras"
+
+    @cached("recursos", on_evict=released.append)
+    def resource(name):
+        return f"watcher-{name}"
+
+    plain()
+    resource("a")
+    resource("b")
+    assert released == ["watcher-a"]
+
+
+def test_on_evict_runs_outside_the_lock():
+    cache = BoundedCache("t", CachePolicy(max_entries=1))
+
+    def stop(value):
+        # Como LiveDataset.stop(): espera uma thread que também usa o cache
+        worker = threading.Thread(target=cache.get, args=("b",))
+        worker.start()
+        worker.join(timeout=5)
+        stopped.append(not worker.is_alive())
+
+    stopped = []
+    cache.put("a", 1, on_evict=stop)
+    cache.put("b", 2)
+    assert stopped == [True]
+
+
+def test_figure_cache_is_registered():
+    from figure_cache import FigureCache
+
+    figures = FigureCache(max_figures=2)
+    df = pd.DataFrame({"x": [1, 2]})
+    assert figures.get_or_build("barra", df, "dark", lambda d: len(d)) == 2
+    assert figures.get_or_build("barra", df.copy(), "dark", lambda d: 0) == 2
+    stats = cache_policy.cache_stats().set_index("cache").loc["figuras"]
+    assert (stats["entries"], stats["hits"], stats["max_entries"]) == (1, 1, 2)
@@ -0,0 +1,50 @@
+import math
+
+import pandas as pd
+
+from competitor_graph import CompetitorGraph
+
+
+def _graph(index=None):
+    dominios = pd.DataFrame({"dominio": ["a.com.br", "b.com.br", "c.com.br"]}, index=index)
+    ids = list(dominios.index)
+    concorrentes = pd.DataFrame(
+        {
+            "domain_id": [ids[0], ids[0], ids[1], ids[2]],
+            "grupo": ["lider", "lider", "lider", "saga"],
+            "marca": ["fiat", "fiat", "jeep", "bmw"],
+            "concorrente": ["x.com.br", "b.com.br", "x.com.br", "y.com.br"],
+            "palavras_comuns": [10, 5, 7, 3],
+            "similaridade": [50.0, 20.0, 80.0, 10.0],
+        }
+    )
+    return CompetitorGraph.from_tables(dominios, concorrentes)
+
+
+def test_neighbourhoods():
+    graph = _graph()
+    assert (graph.n_nodes, graph.n_edges) == (5, 4)
+    assert graph.competitors("a.com.br")["concorrente"].tolist() == ["x.com.br", "b.com.br"]
+    assert graph.competed_by("x.com.br")["dominio"].tolist() == ["b.com.br", "a.com.br"]
+    assert graph.competitors("desconhecido.com.br").empty
+
+
+def test_domain_ids_are_index_labels():
+    # Shards carregados guardam domain_id global (rótulo do índice), não a posição
+    graph = _graph(index=pd.RangeIndex(40, 43))
+    assert graph.competitors("c.com.br")["concorrente"].tolist() == ["y.com.br"]
+
+
+def test_shared_competitors_by_brand():
+    shared = _graph().shared_competitors()
+    assert shared["concorrente"].tolist() == ["x.com.br"]
+    assert shared.loc[0, "lista_marcas"] == "fiat, jeep"
+    assert _graph().shared_competitors(edge_mask=_graph().grupo == "saga").empty
+
+
+def test_shortest_path_prefers_similar_domains():
+    graph = _graph()
+    path, cost = graph.shortest_path("a.com.br", "b.com.br")
+    # a–x (custo 0,5) + x–b (0,2) é mais barato que a–b direto (0,8)
+    assert path == ["a.com.br", "x.com.br", "b.com.br"] and math.isclose(cost, 0.7)
+    assert graph.shortest_path("a.com.br", "y.com.br") == ([], float("inf"))
@@ -0,0 +1,23 @@
+import json
+
+from seo_converter import convert_tree
+
+
+def test_convert_tree_skips_other_txt_formats(tmp_path):
+    folder = tmp_path / "base" / "grupo-saga" / "bmw"
+    folder.mkdir(parents=True)
+    (folder / "analise_detalhada_sagabmw_por_pagina.txt").write_text(
+        "Página 1:\nDomínio: sagabmw.com.br\nPalavras-chave orgânicas: 120\n", encoding="utf-8"
+    )
+    outro = folder / "relatorio_sagabmw.json"
+    outro.write_text(json.dumps({"conteudo": "relatório em outro formato"}), encoding="utf-8")
+    (folder / "relatorio_sagabmw.txt").write_text("relatório em outro formato\n", encoding="utf-8")
+
+    converted, unchanged, errors = convert_tree(str(tmp_path / "base"), str(tmp_path / "state.json"))
+    assert (converted, unchanged, errors) == (1, 0, [])
+    assert json.loads(outro.read_text(encoding="utf-8")) == {"conteudo": "relatório em outro formato"}
+    data = json.loads((folder / "analise_detalhada_sagabmw_por_pagina.json").read_text(encoding="utf-8"))
+    assert data["registro"]["palavras_chave_organicas"] == 120
+    assert data["registro"]["grupo"] == "saga"
+
+    assert convert_tree(str(tmp_path / "base"), str(tmp_path / "state.json"))[:2] == (0, 1)
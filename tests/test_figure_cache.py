@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+import cache_policy
+from figure_cache import FigureCache, frame_fingerprint
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    monkeypatch.setattr(cache_policy, "_registry", {})
+
+
+def test_fingerprint_tracks_values_and_dtypes():
+    df = pd.DataFrame({"x": [1, 2], "y": ["a", "b"]})
+    assert frame_fingerprint(df) == frame_fingerprint(df.copy())
+    assert frame_fingerprint(df) != frame_fingerprint(df.assign(x=[1, 3]))
+    assert frame_fingerprint(df) != frame_fingerprint(df.astype({"x": "float64"}))
+
+
+def test_figures_are_built_once_per_kind_data_and_theme():
+    built = []
+    figures = FigureCache()
+    df = pd.DataFrame({"x": [1, 2]})
+
+    def build(d):
+        built.append(len(d))
+        return object()
+
+    first = figures.get_or_build("barra", df, "dark", build)
+    assert figures.get_or_build("barra", df.copy(), "dark", build) is first
+    assert figures.get_or_build("barra", df, "light", build) is not first
+    assert figures.get_or_build("pizza", df, "dark", build) is not first
+    assert len(built) == 3 and figures.stats()["figures"] == 3
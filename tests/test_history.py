@@ -0,0 +1,26 @@
+from seo_history import HistoryStore
+from seo_parser import ReportRecord
+
+
+def _record(dominio, data, trafego):
+    return ReportRecord(grupo="lider", marca="fiat", dominio=dominio, data_geracao=data, trafego_organico=trafego)
+
+
+def test_ingest_appends_only_new_keys(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    assert store.ingest([_record("a.com.br", "2025-01-10", 1), _record("a.com.br", "2025-02-10", 2)]) == 2
+    assert store.ingest([_record("a.com.br", "2025-02-10", 2), _record("b.com.br", "2025-02-11", 5)]) == 1
+    assert store.partitions() == ["2025-01", "2025-02"]
+    assert len(store.read("2025-02", "2025-02")) == 2
+    assert store.latest()["trafego_organico"].tolist() == [2, 5]
+
+
+def test_concurrent_writers_do_not_lose_parts(tmp_path):
+    # Dois processos (watcher e CLI) com o índice carregado antes das ingestões um do outro
+    app, cli = HistoryStore(str(tmp_path)), HistoryStore(str(tmp_path))
+    app.ingest([_record("a.com.br", "2025-01-10", 1)])
+    cli.ingest([_record("b.com.br", "2025-01-12", 2)])
+    app.ingest([_record("b.com.br", "2025-01-12", 2), _record("c.com.br", "2025-01-15", 3)])
+
+    frame = HistoryStore(str(tmp_path)).read()
+    assert sorted(frame["dominio"].astype(str)) == ["a.com.br", "b.com.br", "c.com.br"]
@@ -0,0 +1,42 @@
+import os
+
+import parse_cache
+from seo_ingest import ingest_report_map, iter_report_files, latest_records
+from seo_parser import ReportRecord
+
+
+def test_latest_records_keeps_newest_export_per_domain():
+    old = ReportRecord(grupo="lider", dominio="a.com.br", data_geracao="2025-01-10", trafego_organico=1)
+    new = ReportRecord(grupo="lider", dominio="a.com.br", data_geracao="2025-03-10", trafego_organico=2)
+    other = ReportRecord(grupo="lider", dominio="b.com.br", data_geracao="2025-01-10")
+    assert latest_records([old, other, new]) == [other, new]
+
+
+def test_latest_records_same_domain_in_two_groups():
+    a = ReportRecord(grupo="wtotal", dominio="wtotalvw.com.br", data_geracao="2025-01-10")
+    b = ReportRecord(grupo="grupo- euroAmericas", dominio="wtotalvw.com.br", data_geracao="2025-04-10")
+    assert latest_records([a, b]) == [a, b]
+
+
+def test_latest_records_without_domain_uses_brand_and_dealer():
+    a = ReportRecord(grupo="lider", marca="fiat", concessionaria="x")
+    b = ReportRecord(grupo="lider", marca="fiat", concessionaria="y")
+    assert latest_records([a, b]) == [a, b]
+
+
+def test_file_deleted_during_ingest_is_reported_not_raised(corpus, tmp_path, monkeypatch):
+    paths = list(iter_report_files(corpus))
+    gone = paths[0]
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        # Simula o arquivo sumindo depois da listagem
+        if os.fspath(path) == gone:
+            raise FileNotFoundError(2, "No such file or directory", gone)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(parse_cache.os, "stat", stat)
+    records, file_count, errors = ingest_report_map(corpus, str(tmp_path / "cache.json"), workers=1)
+    assert file_count == len(paths)
+    assert gone not in records and len(records) == len(paths) - 1
+    assert [p for p, _ in errors] == [gone]
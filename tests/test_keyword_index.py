@@ -0,0 +1,67 @@
+import pandas as pd
+
+from keyword_index import KeywordIndex, fold_text, tokenize
+
+
+def _index():
+    tables = {
+        "palavras": pd.DataFrame(
+            {
+                "domain_id": [0, 0, 1],
+                "palavra": pd.Categorical(["consórcio fiat", "fiat strada 2024", "consorcio jeep"]),
+                "posicao": [1, 3, 2],
+                "volume": [100, 900, 300],
+                "trafego": [1.0, 2.0, 3.0],
+            }
+        ),
+        "palavras_pagas": pd.DataFrame(
+            {
+                "domain_id": [1],
+                "palavra": pd.Categorical(["fiat strada 2024"]),
+                "posicao": [1],
+                "volume": [900],
+                "trafego": [4.0],
+            }
+        ),
+        "anuncios": pd.DataFrame({"domain_id": [0], "titulo": pd.Categorical(["Strada por R$ 99 mil"])}),
+    }
+    return KeywordIndex.from_tables(tables)
+
+
+DOMINIOS = pd.DataFrame(
+    {"dominio": ["a.com.br", "b.com.br"], "grupo": ["lider", "saga"], "marca": ["fiat", "jeep"]}
+)
+
+
+def test_tokens_fold_accents():
+    assert fold_text("Consórcio") == "consorcio"
+    assert tokenize("Fiat Strada 2024!") == ["fiat", "strada", "2024"]
+
+
+def test_search_matches_all_tokens_with_prefix():
+    found = _index().search("consorc", DOMINIOS)
+    assert found["Termo"].tolist() == ["consorcio jeep", "consórcio fiat"]
+    assert found["Domínio"].tolist() == ["b.com.br", "a.com.br"]
+
+    found = _index().search("strada fiat", DOMINIOS)
+    assert sorted(found["Fonte"]) == ["Orgânica", "Paga"]
+    assert _index().search("strada", DOMINIOS, prefix=False)["Fonte"].tolist() == ["Orgânica", "Paga", "Anúncio"]
+
+
+def test_search_filters_domains_and_limits_by_volume():
+    index = _index()
+    assert index.search("fiat", DOMINIOS, domain_ids=[1])["Domínio"].tolist() == ["b.com.br"]
+    assert index.search("fiat", DOMINIOS, limit=1)["Volume"].tolist() == [900]
+
+
+def test_search_uses_global_domain_ids():
+    shard = DOMINIOS.set_axis(pd.RangeIndex(10, 12))
+    tables_index = _index()
+    tables_index.domain_id = tables_index.domain_id + 10
+    assert tables_index.search("jeep", shard)["Domínio"].tolist() == ["b.com.br"]
+
+
+def test_suggest_most_frequent_first():
+    assert _index().suggest("s") == ["strada"]
+    assert _index().suggest("") == []
+    assert _index().stats() == {"tokens": 9, "textos": 4, "ocorrencias": 5}
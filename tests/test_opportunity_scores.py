@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from opportunity_scores import OTHER_COHORT, SCORE_SCHEMA, brand_of, cohort_labels, score_frame, top_k
+
+
+def test_brand_of_matches_token_starts_only():
+    assert brand_of("fiatbarigui.com.br") == "fiat"
+    assert brand_of("Citroën Curitiba") == "citroen"
+    assert brand_of("land-rover-sp.com.br") == "landrover"
+    assert brand_of("ram.com.br") == "ram"
+    # Siglas dentro de outras palavras não contam
+    assert brand_of("ramos.com.br", "grandemotors.com", "paraudio.com") is None
+    assert brand_of("outros", "audicenter.com.br") == "audi"
+
+
+def test_cohort_labels_fall_back_to_domain_and_other():
+    labels = cohort_labels(["Fiat", "Concessionária", "Concessionária"], ["x.com", "toyotasul.com", "kiosque.com"])
+    assert list(labels) == ["fiat", "toyota", OTHER_COHORT]
+
+
+def _dominios(n):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "marca": ["Fiat"] * (n // 2) + ["Jeep"] * (n - n // 2),
+            "dominio": [f"d{i}.com.br" for i in range(n)],
+            "backlinks": rng.integers(0, 1000, n),
+            "dominos_referencia": rng.integers(0, 100, n),
+            "trafego_organico": rng.integers(0, 5000, n),
+            "palavras_chave_organicas": rng.integers(1, 500, n),
+            "palavras_top3": rng.integers(0, 50, n),
+        }
+    )
+
+
+def test_score_frame_ranks_authority_over_performance():
+    dominios = _dominios(10)
+    dominios.loc[0, ["backlinks", "dominos_referencia", "trafego_organico", "palavras_chave_organicas", "palavras_top3"]] = [
+        10**6, 10**5, 0, 1, 0,
+    ]
+    scores = score_frame(dominios)
+    assert list(scores.columns) == list(SCORE_SCHEMA)
+    assert scores.index.equals(dominios.index)
+    assert scores["score_oportunidade"].between(0, 100).all()
+    assert scores.loc[0, "rank_oportunidade"] == 0
+    assert sorted(scores["rank_oportunidade"]) == list(range(10))
+    assert set(scores["coorte"]) == {"fiat", "jeep"}
+
+
+def test_top_k_matches_full_sort():
+    rank = np.random.default_rng(1).permutation(50).astype(np.int32)
+    rows = np.arange(0, 50, 3)
+    expected = rows[np.argsort(rank[rows])]
+    assert list(top_k(rank, rows, 4)) == list(expected[:4])
+    assert list(top_k(rank, rows, None)) == list(expected)
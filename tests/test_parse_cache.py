@@ -0,0 +1,66 @@
+import json
+import os
+
+import parse_cache
+from parse_cache import ParseCache
+
+
+def _parse(calls):
+    def parse(path):
+        calls.append(path)
+        with open(path, encoding="utf-8") as f:
+            return {"texto": f.read()}
+
+    return parse
+
+
+def test_unchanged_file_is_not_parsed_again(tmp_path):
+    report = tmp_path / "r.txt"
+    report.write_text("a", encoding="utf-8")
+    calls = []
+    cache = ParseCache(str(tmp_path / "cache.json"))
+    assert cache.get_or_parse(str(report), _parse(calls)) == {"texto": "a"}
+    cache.save()
+
+    reloaded = ParseCache(str(tmp_path / "cache.json"))
+    assert reloaded.get_or_parse(str(report), _parse(calls)) == {"texto": "a"}
+    assert len(calls) == 1 and (reloaded.hits, reloaded.misses) == (1, 0)
+
+
+def test_touched_file_with_same_content_is_a_hit(tmp_path):
+    report = tmp_path / "r.txt"
+    report.write_text("a", encoding="utf-8")
+    calls = []
+    cache = ParseCache(str(tmp_path / "cache.json"))
+    cache.get_or_parse(str(report), _parse(calls))
+    os.utime(report, (1, 1))
+    cache.get_or_parse(str(report), _parse(calls))
+    assert len(calls) == 1
+
+    report.write_text("b", encoding="utf-8")
+    os.utime(report, (2, 2))
+    assert cache.get_or_parse(str(report), _parse(calls)) == {"texto": "b"}
+    assert len(calls) == 2
+
+
+def test_prune_drops_deleted_files(tmp_path):
+    keep, gone = tmp_path / "keep.txt", tmp_path / "gone.txt"
+    keep.write_text("a", encoding="utf-8")
+    gone.write_text("b", encoding="utf-8")
+    cache = ParseCache(str(tmp_path / "cache.json"))
+    for path in (keep, gone):
+        cache.get_or_parse(str(path), _parse([]))
+    cache.prune()
+
+    gone.unlink()
+    cache.get_or_parse(str(keep), _parse([]))
+    cache.prune(str(tmp_path))
+    assert list(cache.entries) == [os.path.normpath(str(keep))]
+
+
+def test_other_parser_version_is_discarded(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text(json.dumps({"parser_version": -1, "entries": {"x": {}}}), encoding="utf-8")
+    assert ParseCache(str(path)).entries == {}
+    path.write_text(json.dumps({"parser_version": parse_cache.PARSER_VERSION, "entries": {"x": {}}}), encoding="utf-8")
+    assert ParseCache(str(path)).entries == {"x": {}}
@@ -0,0 +1,81 @@
+import glob
+import os
+
+from seo_parser import parse_report, parse_report_file
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "analise-performance")
+
+ADS_REPORT = """Página 7:
+Exemplos de Anúncios:
+1. "Volkswagen Mila BH" – https://www.mila.com.br/volkswagen
+   O Seu Volkswagen é na Mila – Concessionária Premiada em BH.
+   Promoções em Saveiro e Polo.
+
+2. "Ofertas Polo" – Polo 0km – https://www.mila.com.br/polo
+3. "Seminovos"
+   https://www.mila.com.br/seminovos
+   Garantia de fábrica.
+
+Página 8:
+"""
+
+
+def test_ads_join_indented_description_lines():
+    anuncios = parse_report(ADS_REPORT).anuncios
+    assert anuncios == [
+        {
+            "titulo": "Volkswagen Mila BH",
+            "descricao": "O Seu Volkswagen é na Mila – Concessionária Premiada em BH. Promoções em Saveiro e Polo.",
+            "url": "https://www.mila.com.br/volkswagen",
+        },
+        {"titulo": "Ofertas Polo", "descricao": "Polo 0km", "url": "https://www.mila.com.br/polo"},
+        {"titulo": "Seminovos", "descricao": "Garantia de fábrica.", "url": "https://www.mila.com.br/seminovos"},
+    ]
+
+
+SAMPLE_REPORT = """Página 1:
+- Relatório referente ao domínio: loja.com.br
+- Data de geração: 5 de abril de 2025
+
+Resumo da Busca Orgânica:
+- Palavras-chave orgânicas: 1.234
+- Tráfego estimado: 10.900 (aumento de 1%)
+- Custo do tráfego: R$13.200 (aumento de 3%)
+
+Resumo da Busca Paga:
+- Palavras-chave pagas: 2
+- Tráfego estimado: 34
+- Custo do tráfego pago: R$6 (estável)
+
+Backlinks:
+- Total: 164
+- Domínios de referência: 79
+"""
+
+
+def test_parse_report_reads_summary_sections():
+    record = parse_report(SAMPLE_REPORT)
+    assert record.dominio == "loja.com.br"
+    assert record.data_geracao == "2025-04-05"
+    assert (record.palavras_chave_organicas, record.trafego_organico, record.custo_trafego_organico) == (1234, 10900, 13200)
+    assert (record.palavras_chave_pagas, record.trafego_pago, record.custo_trafego_pago) == (2, 34, 6)
+    assert (record.backlinks, record.dominos_referencia) == (164, 79)
+
+
+def test_parse_report_text_and_lines_are_equivalent():
+    # O conversor lê o TXT linha a linha; o dashboard, o texto inteiro do JSON
+    for path in glob.glob(os.path.join(CORPUS, "**", "analise_detalhada*.txt"), recursive=True)[:20]:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        with open(path, encoding="utf-8") as f:
+            assert parse_report(f) == parse_report(text), path
+
+
+def test_parse_report_file_golden_record():
+    path = os.path.join(CORPUS, "grupo-lider", "volkswagen", "analise_detalhada_mila_por_pagina.json")
+    record = parse_report_file(path, CORPUS)
+    assert (record.grupo, record.marca, record.concessionaria, record.dominio) == ("lider", "volkswagen", "mila", "mila.com.br")
+    assert (record.trafego_organico, record.palavras_chave_organicas, record.backlinks, record.palavras_top3) == (10900, 714, 164, 104)
+    assert record.top_palavras[0] == {"palavra": "mila", "posicao": 1, "volume": 12100, "trafego": 27.39}
+    assert record.palavras_pagas[0] == {"palavra": "mila vw", "posicao": 1, "volume": 590, "cpc": 0.41, "trafego": 79.41}
+    assert [c["dominio"] for c in record.concorrentes][:2] == ["recreionet.com.br", "reauto.com.br"]
@@ -0,0 +1,63 @@
+import os
+
+from PyPDF2 import PdfWriter
+
+from seo_parser import SECAO_ORGANICA
+from seo_pdf import ingest_pdfs, pages_to_report, txt_path_for
+
+
+def _write_pdf(path, pages=1):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def _ingest(base_dir, tmp_path, force=False):
+    return ingest_pdfs(
+        str(base_dir), str(tmp_path / "state.json"), str(tmp_path / "pdf_text"), workers=1, force=force
+    )
+
+
+def test_pages_to_report_numbers_pages_and_separates_sections():
+    report = pages_to_report(["Página 7:\nTráfego orgânico: 10\nOrganic Search\n• termo 1", "fim"])
+    assert report.splitlines() == [
+        "Página 1:", "Tráfego orgânico: 10", "", f"{SECAO_ORGANICA}:", "- termo 1", "", "Página 2:", "fim",
+    ]
+
+
+def test_hand_transcribed_txt_is_not_overwritten(tmp_path):
+    folder = tmp_path / "base" / "grupo-lider" / "fiat"
+    folder.mkdir(parents=True)
+    pdf = folder / "loja.pdf"
+    _write_pdf(pdf)
+    txt = txt_path_for(str(pdf))
+    with open(txt, "w", encoding="utf-8") as f:
+        f.write("Página 1:\nTranscrição manual\n")
+
+    converted, _, skipped, errors = _ingest(tmp_path / "base", tmp_path)
+    assert (converted, skipped, errors) == (0, [str(pdf)], [])
+    with open(txt, encoding="utf-8") as f:
+        assert "Transcrição manual" in f.read()
+
+    converted, _, skipped, _ = _ingest(tmp_path / "base", tmp_path, force=True)
+    assert (converted, skipped) == (1, [])
+    with open(txt, encoding="utf-8") as f:
+        assert "Transcrição manual" not in f.read()
+
+
+def test_txt_written_from_pdf_is_updated_when_pdf_changes(tmp_path):
+    folder = tmp_path / "base" / "grupo-lider" / "fiat"
+    folder.mkdir(parents=True)
+    pdf = folder / "loja.pdf"
+    _write_pdf(pdf)
+    assert _ingest(tmp_path / "base", tmp_path)[0] == 1
+    assert _ingest(tmp_path / "base", tmp_path)[:2] == (0, 1)
+
+    _write_pdf(pdf, pages=2)
+    os.utime(pdf, (1, 1))
+    converted, _, skipped, _ = _ingest(tmp_path / "base", tmp_path)
+    assert (converted, skipped) == (1, [])
+    with open(txt_path_for(str(pdf)), encoding="utf-8") as f:
+        assert "Página 2:" in f.read()
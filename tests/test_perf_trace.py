@@ -0,0 +1,50 @@
+import json
+
+from perf_trace import RerunProfiler, section_percentiles
+
+
+def _log(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_disabled_profiler_records_nothing(tmp_path):
+    prof = RerunProfiler(False, str(tmp_path / "profile.jsonl"))
+    with prof.section("a"), prof.fragment("b"):
+        pass
+    assert prof.finish() is None and prof.sections == []
+    assert not (tmp_path / "profile.jsonl").exists()
+
+
+def test_sections_nest_and_report_cache_deltas(tmp_path):
+    stats = {"hits": 0, "misses": 0}
+    prof = RerunProfiler(True, str(tmp_path / "profile.jsonl"))
+    prof.watch_cache("dados", lambda: dict(stats))
+    with prof.section("pagina"):
+        with prof.section("tabela"):
+            stats["hits"] += 2
+    record = prof.finish(versao="v1")
+    assert [(s["secao"], s["nivel"]) for s in record["secoes"]] == [("tabela", 1), ("pagina", 0)]
+    assert record["caches"] == {"dados": {"hits": 2, "misses": 0}}
+    assert _log(tmp_path / "profile.jsonl")[0]["versao"] == "v1"
+    assert "pagina" in set(section_percentiles()["Seção"])
+
+
+def test_fragment_rerun_after_finish_is_logged_on_its_own(tmp_path):
+    stats = {"hits": 0, "misses": 0}
+    prof = RerunProfiler(True, str(tmp_path / "profile.jsonl"))
+    prof.watch_cache("figuras", lambda: dict(stats))
+    with prof.fragment("grafo"):
+        pass
+    prof.finish()
+
+    # Rerun só do fragmento: o profiler do script já foi fechado
+    stats["misses"] += 1
+    with prof.fragment("grafo"):
+        with prof.section("grafico:barra"):
+            stats["hits"] += 1
+    full, fragment = _log(tmp_path / "profile.jsonl")
+    assert [s["secao"] for s in full["secoes"]] == ["grafo"]
+    assert fragment["fragmento"] == "grafo"
+    assert [s["secao"] for s in fragment["secoes"]] == ["grafico:barra", "grafo"]
+    assert fragment["caches"] == {"figuras": {"hits": 1, "misses": 0}}
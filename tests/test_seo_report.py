@@ -0,0 +1,24 @@
+import os
+
+import pandas as pd
+
+from seo_report import compile_reports, group_slug, write_reports
+
+
+def test_group_slug():
+    assert group_slug(" Grupo- EuroAmericas ") == "grupo-euroamericas"
+    assert group_slug("  ") == "sem-grupo"
+
+
+def test_reports_per_focal_group(snapshot, tmp_path):
+    reports = compile_reports(snapshot, groups=["lider", "saga", "inexistente"], top_n=2)
+    assert sorted(reports) == ["lider", "saga"]
+    assert set(reports["lider"]) == {"oportunidades", "ranking_oportunidades", "top_concorrentes", "metricas", "palavras_chave"}
+    # O grupo focal muda quem é "Líder" nas marcas
+    assert reports["saga"]["metricas"]["Marca"].str.contains("Grupo Saga").any()
+    assert len(reports["lider"]["top_concorrentes"]) <= 2
+
+    paths = write_reports(reports, str(tmp_path / "out"))
+    assert len(paths) == 10 and all(os.path.exists(p) for p in paths)
+    metricas = pd.read_csv(tmp_path / "out" / "lider" / "metricas.csv")
+    assert list(metricas["Marca"]) == list(reports["lider"]["metricas"]["Marca"])
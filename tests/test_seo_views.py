@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from seo_views import (
+    OPPORTUNITY_THRESHOLD,
+    DashboardCube,
+    ShardCatalog,
+    dashboard_frame,
+    fact_rows,
+    filter_mask,
+    normalize_filters,
+)
+
+
+@pytest.fixture
+def dominios(snapshot):
+    return dashboard_frame(snapshot.tables["dominios"])
+
+
+def test_normalize_filters_is_order_insensitive():
+    assert normalize_filters("?", ["b", "a", "b"], 5.0) == ("Todos", ("a", "b"), 5)
+    assert normalize_filters("Só Concorrentes", None, 3) == ("Só Concorrentes", (), 3)
+
+
+def test_filter_mask_combines_mode_and_brands():
+    frame = pd.DataFrame({"is_lider": [True, False, True, False], "marca_display": ["a (L)", "a", "b (L)", "b"]})
+    assert list(filter_mask(frame, "Todos", ())) == [True] * 4
+    assert list(filter_mask(frame, "Só Grupo Líder", ())) == [True, False, True, False]
+    assert list(filter_mask(frame, "Só Concorrentes", ["a", "b (L)"])) == [False, True, False, False]
+
+
+def test_fact_rows_selects_and_orders_without_copying():
+    fact = pd.DataFrame({"domain_id": [2, 0, 2, 1], "valor": [1.0, 9.0, 5.0, 3.0]})
+    assert list(fact_rows(fact, [2])) == [0, 2]
+    assert list(fact_rows(fact, [0, 2], order_by="valor")) == [1, 2, 0]
+    assert list(fact_rows(fact, [])) == []
+
+
+def test_shard_catalog_matches_the_loaded_table(snapshot, dominios):
+    catalog = ShardCatalog(snapshot.manifest["shards"])
+    assert catalog.marcas == sorted(dominios["marca_display"].unique().tolist())
+
+    lider = dominios[dominios["is_lider"]]
+    kpis = catalog.lider_kpis()
+    assert kpis["trafego_organico"] == pytest.approx(float(lider["trafego_organico"].sum()))
+    assert kpis["share"] == pytest.approx(
+        float(lider["trafego_organico"].sum()) / float(dominios["trafego_organico"].sum()) * 100, rel=1e-5
+    )
+    total = dominios.groupby("marca_display", observed=True)["trafego_organico"].sum()
+    assert catalog.por_marca_total.to_dict() == pytest.approx(total.to_dict())
+
+
+def test_shard_catalog_groups_for_always_keeps_focal_groups(snapshot, dominios):
+    catalog = ShardCatalog(snapshot.manifest["shards"])
+    assert catalog.groups_for("Só Grupo Líder") == tuple(catalog.focal_groups)
+    assert catalog.groups_for("Todos") == tuple(catalog.groups)
+
+    marca = dominios.loc[~dominios["is_lider"], "marca_display"].iloc[0]
+    expected = set(dominios.loc[dominios["marca_display"] == marca, "grupo"].astype(str)) | set(catalog.focal_groups)
+    assert set(catalog.groups_for("Só Concorrentes", [marca])) == expected
+
+
+def test_dashboard_view_totals_and_memoization(dominios):
+    cube = DashboardCube(dominios)
+    marcas = sorted(dominios["marca_display"].unique().tolist())[:2]
+    view = cube.view("Todos", marcas, 3)
+    assert cube.view("Todos", marcas[::-1], 3) is view
+
+    expected = dominios[dominios["marca_display"].isin(marcas)]
+    assert len(view.frame) == len(expected)
+    assert view.totais["trafego_organico"] == pytest.approx(float(expected["trafego_organico"].astype(np.float64).sum()))
+    assert not view.top_concorrentes["is_lider"].any() and len(view.top_concorrentes) <= 3
+    assert set(view.por_marca["marca_display"]) == set(expected["marca_display"])
+
+
+def test_ranking_follows_precomputed_rank(dominios):
+    ranking = DashboardCube(dominios).ranking_oportunidades("Só Concorrentes", ())
+    assert (ranking["score_oportunidade"] > OPPORTUNITY_THRESHOLD).all()
+    assert not ranking["is_lider"].any()
+    ranks = dominios.loc[ranking.index, "rank_oportunidade"].to_numpy()
+    assert list(ranks) == sorted(ranks)
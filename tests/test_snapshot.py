@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+
+from seo_snapshot import open_snapshot, write_snapshot
+from seo_ingest import ingest_reports
+
+
+def test_shards_have_global_domain_ids(snapshot):
+    tables = snapshot.tables
+    assert list(tables["dominios"].index) == list(range(len(tables["dominios"])))
+    for grupo in snapshot.groups:
+        shard = snapshot.shard(grupo)
+        offset = snapshot.manifest["shards"][grupo]["offset"]
+        assert shard["dominios"].index[0] == offset
+        assert set(shard["palavras"]["domain_id"]) <= set(shard["dominios"].index)
+
+
+def test_table_before_load_has_unique_global_index(snapshot_dir, snapshot):
+    fresh = open_snapshot(snapshot_dir)
+    dominios = fresh.table("dominios")
+    assert dominios.index.is_unique
+    assert list(dominios.index) == list(snapshot.tables["dominios"].index)
+    concorrentes = fresh.table("concorrentes")
+    assert np.isin(concorrentes["domain_id"].to_numpy(), dominios.index.to_numpy()).all()
+
+
+def test_table_mixes_loaded_and_unloaded_shards(snapshot_dir, snapshot):
+    fresh = open_snapshot(snapshot_dir)
+    fresh.shard(fresh.groups[1])
+    dominios = fresh.table("dominios")
+    assert dominios.index.is_unique
+    assert len(dominios) == sum(meta["dominios"] for meta in fresh.manifest["shards"].values())
+
+
+def test_load_groups_keeps_manifest_order(snapshot):
+    groups = snapshot.groups
+    tables = snapshot.load([groups[2], groups[0]])
+    assert list(tables["dominios"]["grupo"].astype(str).unique()) == [groups[0], groups[2]]
+
+
+def test_previous_version_stays_readable(corpus, snapshot_dir, snapshot):
+    old = open_snapshot(snapshot_dir)
+    records, file_count, errors = ingest_reports(corpus, workers=1)
+    write_snapshot(records[:-1], file_count, "f" * 40, snapshot_dir, errors=errors)
+    assert open_snapshot(snapshot_dir).version == "f" * 16
+    # Sessões antigas ainda abrem os shards sob demanda
+    assert len(old.shard(old.groups[-1])["dominios"])
+    write_snapshot(records, file_count, "e" * 40, snapshot_dir, errors=errors)
+    assert sorted(os.listdir(snapshot_dir)) == ["CURRENT", "e" * 16, "f" * 16]
+
+
+def _is_mapped(values):
+    array = getattr(values.array, "_codes", None)
+    base = values.to_numpy() if array is None else array
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return True
+        base = getattr(base, "base", None)
+    return False
+
+
+def test_all_groups_and_single_shards_stay_memory_mapped(snapshot):
+    tables = snapshot.load()
+    for name in ("dominios", "palavras", "concorrentes"):
+        assert all(_is_mapped(tables[name][col]) for col in tables[name].columns), name
+    shard = snapshot.shard(snapshot.groups[1])
+    assert all(_is_mapped(shard["palavras"][col]) for col in shard["palavras"].columns)
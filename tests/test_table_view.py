@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from table_view import bar_limits, query_table, search_mask, sort_positions
+
+
+def _frame():
+    # Categorias na ordem de aparição (como as tabelas do snapshot), não alfabética
+    return pd.DataFrame(
+        {
+            "palavra": pd.Categorical(["strada", "argo", None, "pulse", "argo"], categories=["strada", "argo", "pulse"]),
+            "volume": [10, 30, 20, np.nan, 5],
+        }
+    )
+
+
+def test_categorical_sort_uses_labels():
+    df = _frame()
+    assert sort_positions(df, "palavra", ascending=True).tolist() == [1, 4, 3, 0, 2]
+    assert sort_positions(df, "palavra", ascending=False).tolist() == [0, 3, 1, 4, 2]
+
+
+def test_numeric_sort_puts_missing_last():
+    assert sort_positions(_frame(), "volume").tolist() == [1, 2, 0, 4, 3]
+
+
+def test_query_table_searches_sorts_and_pages():
+    df = _frame()
+    assert search_mask(df, "ST", ["palavra"]).tolist() == [True, False, False, False, False]
+    page = query_table(df, search="a", search_cols=["palavra"], sort_by="palavra", ascending=True, page=2, page_size=2)
+    assert (page.total, page.page, page.n_pages, page.start) == (3, 2, 2, 2)
+    assert page.rows["palavra"].tolist() == ["strada"]
+    assert query_table(df, page=99, page_size=2).page == 3
+
+
+def test_bar_limits_cover_the_whole_table():
+    low, high, _ = bar_limits(_frame(), ["volume"])["volume"]
+    assert (low, high) == (0, 30)
@@ -0,0 +1,58 @@
+import os
+
+import seo_watcher
+from parse_cache import ParseCache
+from seo_ingest import iter_report_files
+from seo_watcher import LiveDataset
+
+
+def _live(corpus, tmp_path):
+    return LiveDataset(
+        corpus,
+        str(tmp_path / "snapshot"),
+        workers=1,
+        history_dir=str(tmp_path / "historico"),
+        cache_path=str(tmp_path / "cache.json"),
+    )
+
+
+def _bump(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_refresh_without_changes_keeps_version(corpus, tmp_path):
+    live = _live(corpus, tmp_path)
+    version = live.version
+    assert live.refresh() == ([], [], [])
+    assert live.version == version and live.refreshes == 0
+
+
+def test_incremental_refresh_updates_snapshot_and_parse_cache(corpus, tmp_path):
+    live = _live(corpus, tmp_path)
+    files = sorted(iter_report_files(corpus))
+    os.remove(files[0])
+    assert live.refresh()[2] == [files[0]]
+    assert live.snapshot.file_count == len(files) - 1
+
+    # Segunda mudança: caminho incremental, que também precisa alimentar o cache em disco
+    with open(files[1], "a", encoding="utf-8") as f:
+        f.write("\n")
+    _bump(files[1])
+    version = live.version
+    assert live.refresh()[1] == [files[1]]
+    assert live.version != version and live.refreshes == 2
+
+    cache = ParseCache(str(tmp_path / "cache.json"))
+    metrics, stamp = cache.lookup(files[1])
+    assert stamp is None and metrics is not None
+    assert os.path.normpath(files[0]) not in cache.entries
+
+
+def test_unreadable_snapshot_keeps_previous(corpus, tmp_path, monkeypatch):
+    live = _live(corpus, tmp_path)
+    previous = live.snapshot
+    monkeypatch.setattr(seo_watcher, "open_snapshot", lambda snapshot_dir: None)
+    os.remove(sorted(iter_report_files(corpus))[0])
+    live.refresh()
+    assert live.snapshot is previous and live.refreshes == 0